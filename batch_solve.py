@@ -0,0 +1,175 @@
+"""
+Giải hàng loạt bàn cờ không cần giao diện (không import pygame)
+
+Đọc mỗi dòng JSON một bàn cờ từ file hoặc stdin, chia cho nhiều tiến trình
+BotSolver và ghi kết quả ra mỗi dòng JSON một bàn, đúng thứ tự đầu vào.
+
+Đầu vào (mỗi dòng):
+    {"id": "a1", "board": [[1, 2, 3], [4, 0, 6], [7, 5, 8]]}
+    {"board": [1, 2, 3, 4, 0, 6, 7, 5, 8]}
+Đầu ra (mỗi dòng):
+    {"id": "a1", "size": 3, "solved": true, "length": 2, "moves": [[2, 1], [2, 2]], "time": 0.0001}
+
+Ví dụ:
+    python batch_solve.py boards.jsonl --algorithm optimal --workers 8 > results.jsonl
+    cat boards.jsonl | python batch_solve.py - --algorithm bfs
+"""
+import argparse
+import contextlib
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from bot import BoardSnapshot, BotSolver
+from heuristics import HEURISTICS
+
+ALGORITHMS = ("bfs", "hill_climbing", "local_search", "anytime", "beam", "reduction", "optimal")
+
+# Cấu hình của tiến trình con (gán trong _init_worker)
+_worker_algorithm = None
+_worker_heuristic = None
+_worker_memory_limit_mb = None
+_worker_quiet = True
+
+
+def _parse_board(record):
+    """
+    Lấy bàn cờ 2D từ một bản ghi đầu vào
+
+    Raises:
+        ValueError: Nếu bàn cờ không hợp lệ
+    """
+    board = record.get("board")
+    if not isinstance(board, list) or not board:
+        raise ValueError("missing 'board'")
+
+    if not isinstance(board[0], list):
+        size = math.isqrt(len(board))
+        if size * size != len(board):
+            raise ValueError("flat board length is not a square")
+        board = [board[i * size:(i + 1) * size] for i in range(size)]
+
+    size = len(board)
+    tiles = [tile for row in board for tile in row]
+    if any(len(row) != size for row in board) or sorted(tiles) != list(range(size * size)):
+        raise ValueError(f"board must be a {size}x{size} permutation of 0..{size * size - 1}")
+
+    return board
+
+
+def _init_worker(algorithm, heuristic, memory_limit_mb, quiet):
+    global _worker_algorithm, _worker_heuristic, _worker_memory_limit_mb, _worker_quiet
+    _worker_algorithm = algorithm
+    _worker_heuristic = heuristic
+    _worker_memory_limit_mb = memory_limit_mb
+    _worker_quiet = quiet
+
+
+def _solve_line(line):
+    """Giải một dòng đầu vào, trả về dòng JSON kết quả"""
+    record = None
+    try:
+        record = json.loads(line)
+        board = _parse_board(record)
+    except (ValueError, AttributeError, TypeError) as e:
+        record_id = record.get("id") if isinstance(record, dict) else None
+        return json.dumps({"id": record_id, "error": str(e)})
+
+    result = {"id": record.get("id"), "size": len(board)}
+    solver = BotSolver(BoardSnapshot(board), _worker_heuristic, _worker_memory_limit_mb)
+
+    start_time = time.perf_counter()
+    if _worker_quiet:
+        # Bộ giải in thông báo ra stdout, không để lẫn vào đầu ra JSONL
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            moves = solver.solve(_worker_algorithm)
+    else:
+        with contextlib.redirect_stdout(sys.stderr):
+            moves = solver.solve(_worker_algorithm)
+    elapsed = time.perf_counter() - start_time
+
+    result["solved"] = _is_solution(board, moves)
+    result["length"] = len(moves)
+    result["moves"] = [list(move) for move in moves]
+    result["time"] = round(elapsed, 6)
+    if solver.stats is not None:
+        result["stats"] = solver.stats.to_dict()
+    return json.dumps(result)
+
+
+def _is_solution(board, moves):
+    """Kiểm tra dãy nước đi có đưa bàn cờ về đích không"""
+    size = len(board)
+    tiles = [tile for row in board for tile in row]
+    blank = tiles.index(0)
+    for row, col in moves:
+        cell = row * size + col
+        if abs(row - blank // size) + abs(col - blank % size) != 1:
+            return False
+        tiles[blank], tiles[cell] = tiles[cell], 0
+        blank = cell
+    return tiles == list(range(1, size * size)) + [0]
+
+
+def _read_lines(source):
+    for line in source:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve sliding puzzles in batch (JSONL in, JSONL out)")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file with one board per line ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output JSONL file ('-' for stdout)")
+    parser.add_argument("-a", "--algorithm", choices=ALGORITHMS, default="optimal")
+    parser.add_argument("--heuristic", choices=HEURISTICS, default=None,
+                        help="heuristic for the search (default: pattern database for 4x4 when available)")
+    parser.add_argument("--memory-limit-mb", type=float, default=None,
+                        help="memory budget of the search in each worker (default: unlimited)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: number of CPUs)")
+    parser.add_argument("--chunksize", type=int, default=4, help="boards sent to a worker at a time")
+    parser.add_argument("-v", "--verbose", action="store_true", help="forward solver messages to stderr")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input, 'r')
+    output = sys.stdout if args.output == "-" else open(args.output, 'w')
+
+    try:
+        lines = _read_lines(source)
+        init_args = (args.algorithm, args.heuristic, args.memory_limit_mb, not args.verbose)
+
+        if args.workers <= 1:
+            _init_worker(*init_args)
+            results = map(_solve_line, lines)
+            pool = None
+        else:
+            pool = multiprocessing.Pool(args.workers, initializer=_init_worker, initargs=init_args)
+            # imap giữ đúng thứ tự đầu vào và trả kết quả ngay khi có
+            results = pool.imap(_solve_line, lines, chunksize=args.chunksize)
+
+        try:
+            for result in results:
+                output.write(result + "\n")
+                output.flush()
+        except (BrokenPipeError, KeyboardInterrupt):
+            # Phía đọc đã đóng (ví dụ "| head") hoặc người dùng dừng: bỏ các bàn còn lại
+            if pool is not None:
+                pool.terminate()
+                pool = None
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
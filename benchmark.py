@@ -0,0 +1,293 @@
+"""
+Đo hiệu năng các bộ giải trên một bộ bàn cờ cố định (không import pygame)
+
+Bộ bàn cờ được sinh tất định từ seed nên mọi lần chạy đo trên cùng dữ liệu:
+- maps_3x3: các map 3x3 giải được trong maps.py
+- maps_4x4: các map 4x4 giải được trong maps.py
+- hard_4x4: 20 bàn 4x4 ngẫu nhiên đều (lời giải tối ưu thường 52-56 bước; bước
+  đi ngẫu nhiên dù dài chỉ cho bàn khoảng 40-50 bước)
+- large: vài bàn 5x5 tới 10x10 trộn ngẫu nhiên
+
+Mỗi nhóm (bộ bàn cờ, thuật toán, heuristic) chạy trong một tiến trình riêng để đo bộ nhớ
+đỉnh (RSS) không bị ảnh hưởng bởi lần đo trước. Báo cáo JSON gồm thời gian,
+số nút mỗi giây, độ dài lời giải và bộ nhớ; khi có --baseline, các chỉ số tệ
+hơn baseline quá ngưỡng được báo là regression (mã thoát 1).
+
+Ví dụ:
+    python benchmark.py -o baseline.json
+    python benchmark.py --sets maps_4x4,hard_4x4 --modes optimal --baseline baseline.json
+    python benchmark.py --sets hard_4x4 --modes optimal --heuristics manhattan,linear_conflict,walking_distance,pdb
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import time
+from batch_solve import ALGORITHMS
+from bot import BoardSnapshot, BotSolver
+from heuristics import HEURISTICS
+from maps import get_maps
+from scramble import is_solvable, random_board
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCHMARK_SEED = 2024
+HARD_4X4_COUNT = 20
+LARGE_SIZES = (5, 6, 8, 10)
+LARGE_PER_SIZE = 2
+DEFAULT_TIME_LIMIT = 2.0  # Cho "local_search" và "anytime" (giây mỗi bàn)
+DEFAULT_THRESHOLD = 0.15
+
+SETS = ("maps_3x3", "maps_4x4", "hard_4x4", "large")
+
+# Chỉ số so với baseline: (tên, True nếu giá trị lớn hơn là tốt hơn)
+COMPARED_METRICS = (
+    ("wall_time", False),
+    ("nodes_per_second", True),
+    ("mean_length", False),
+    ("peak_rss_mb", False),
+)
+
+_context = multiprocessing.get_context("spawn")
+
+
+def _to_board(tiles, size):
+    return [tiles[row * size:(row + 1) * size] for row in range(size)]
+
+
+def _solvable_maps(size):
+    """Các map giải được trong maps.py (map không giải được chỉ đo được thời gian thất bại)"""
+    maps = []
+    for map_data in get_maps(size):
+        board = map_data["board"]
+        if is_solvable([tile for row in board for tile in row], size):
+            maps.append((map_data["name"], board))
+        else:
+            print(f"Skipping unsolvable map {map_data['name']!r}", file=sys.stderr)
+    return maps
+
+
+def build_corpus(seed=BENCHMARK_SEED):
+    """
+    Sinh bộ bàn cờ chuẩn
+
+    Returns:
+        dict: Tên bộ -> danh sách (id, bàn cờ 2D)
+    """
+    rng = random.Random(seed)
+    corpus = {
+        "maps_3x3": _solvable_maps(3),
+        "maps_4x4": _solvable_maps(4),
+        "hard_4x4": [(f"hard-{index}", _to_board(random_board(4, rng), 4)) for index in range(HARD_4X4_COUNT)],
+        "large": [],
+    }
+    for size in LARGE_SIZES:
+        for index in range(LARGE_PER_SIZE):
+            corpus["large"].append((f"{size}x{size}-{index}", _to_board(random_board(size, rng), size)))
+    return corpus
+
+
+def _peak_rss_mb():
+    """Bộ nhớ đỉnh (RSS) của tiến trình hiện tại, None nếu hệ thống không hỗ trợ"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux trả về KB, macOS trả về byte
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_group(connection, boards, algorithm, heuristic, time_limit):
+    """Hàm chạy trong tiến trình con: giải mọi bàn của một bộ bằng một thuật toán và một heuristic"""
+    instances = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for board_id, board in boards:
+            solver = BotSolver(BoardSnapshot(board), heuristic)
+            start_time = time.perf_counter()
+            moves = solver.solve(algorithm, time_limit)
+            elapsed = time.perf_counter() - start_time
+            stats = solver.stats
+            instances.append({
+                "id": board_id,
+                "length": len(moves),
+                "time": round(elapsed, 6),
+                "nodes": stats.nodes_expanded if stats is not None else 0,
+                "peak_visited": stats.peak_visited if stats is not None else 0,
+                "termination": stats.termination if stats is not None else None,
+                "heuristic": stats.heuristic if stats is not None else None,
+            })
+    connection.send((instances, _peak_rss_mb()))
+    connection.close()
+
+
+def _summarize(instances, peak_rss_mb):
+    """Gộp kết quả từng bàn thành chỉ số của cả bộ"""
+    wall_time = sum(instance["time"] for instance in instances)
+    nodes = sum(instance["nodes"] for instance in instances)
+    solved = [instance for instance in instances if instance["termination"] == "solved"]
+    return {
+        "boards": len(instances),
+        "solved": len(solved),
+        "wall_time": round(wall_time, 4),
+        "nodes": nodes,
+        "nodes_per_second": round(nodes / wall_time, 1) if wall_time > 0 else 0.0,
+        "mean_length": round(sum(instance["length"] for instance in solved) / len(solved), 2) if solved else None,
+        "peak_visited": max((instance["peak_visited"] for instance in instances), default=0),
+        "peak_rss_mb": None if peak_rss_mb is None else round(peak_rss_mb, 1),
+        "instances": instances,
+    }
+
+
+def run_benchmark(sets=SETS, modes=ALGORITHMS, seed=BENCHMARK_SEED, time_limit=DEFAULT_TIME_LIMIT,
+                  limit=None, log=None, heuristics=(None,)):
+    """
+    Chạy benchmark
+
+    Args:
+        sets: Tên các bộ bàn cờ
+        modes: Tên các thuật toán (xem BotSolver.solve)
+        seed: Seed sinh bộ bàn cờ
+        time_limit: Thời gian tối đa mỗi bàn cho "local_search" và "anytime"
+        limit: Số bàn tối đa mỗi bộ (None để chạy hết)
+        log: Hàm nhận từng dòng tiến độ (ví dụ print), hoặc None
+        heuristics: Tên các heuristic (xem heuristics.HEURISTICS); None là heuristic
+            mặc định của bộ giải. Nhóm có heuristic chỉ định mang khóa "bộ/thuật toán@heuristic"
+
+    Returns:
+        dict: Báo cáo (xem đầu file)
+    """
+    corpus = build_corpus(seed)
+    report = {
+        "meta": {
+            "seed": seed,
+            "time_limit": time_limit,
+            "limit": limit,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": round(time.time(), 3),
+        },
+        "results": {},
+    }
+
+    for set_name in sets:
+        boards = corpus[set_name][:limit]
+        for mode in modes:
+            for heuristic in heuristics:
+                group = f"{set_name}/{mode}" if heuristic is None else f"{set_name}/{mode}@{heuristic}"
+                receiver, sender = _context.Pipe(duplex=False)
+                # Không đặt daemon: tìm kiếm cục bộ cần tạo thêm tiến trình con
+                process = _context.Process(target=_run_group, args=(sender, boards, mode, heuristic, time_limit))
+                process.start()
+                sender.close()
+                try:
+                    instances, peak_rss_mb = receiver.recv()
+                except EOFError:
+                    raise RuntimeError(f"benchmark worker for {group} exited without a result")
+                finally:
+                    receiver.close()
+                    process.join()
+
+                summary = _summarize(instances, peak_rss_mb)
+                report["results"][group] = summary
+                if log is not None:
+                    log(f"{group}: {summary['solved']}/{summary['boards']} solved, "
+                        f"{summary['nodes']:,} nodes, {summary['wall_time']:.2f}s, "
+                        f"{summary['nodes_per_second']:,.0f} nodes/s, mean length {summary['mean_length']}, "
+                        f"peak RSS {summary['peak_rss_mb']} MB")
+    return report
+
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    So sánh báo cáo với baseline
+
+    Chỉ so các nhóm có ở cả hai báo cáo. Một chỉ số bị coi là regression khi
+    tệ hơn baseline quá threshold (tỉ lệ, ví dụ 0.15 là 15%). Số bàn giải được
+    giảm luôn là regression, chỉ số có ở baseline nhưng bằng 0 hoặc không còn
+    đo được cũng vậy.
+
+    Returns:
+        list: Các regression, mỗi phần tử (nhóm, chỉ số, giá trị baseline, giá trị mới)
+    """
+    regressions = []
+    for group, result in report["results"].items():
+        base = baseline.get("results", {}).get(group)
+        if base is None:
+            continue
+        if result["solved"] < base["solved"]:
+            regressions.append((group, "solved", base["solved"], result["solved"]))
+        for metric, higher_is_better in COMPARED_METRICS:
+            old, new = base.get(metric), result.get(metric)
+            if not old:
+                continue
+            if not new:
+                regressions.append((group, metric, old, new))
+                continue
+            change = (new - old) / old
+            if (change < -threshold) if higher_is_better else (change > threshold):
+                regressions.append((group, metric, old, new))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the puzzle solvers on a fixed, seeded board corpus")
+    parser.add_argument("-o", "--output", default=None, help="write the JSON report to this file")
+    parser.add_argument("--baseline", default=None, help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed relative slowdown before a metric counts as a regression (default: 0.15)")
+    parser.add_argument("--sets", default=",".join(SETS), help=f"comma-separated board sets ({', '.join(SETS)})")
+    parser.add_argument("--modes", default=",".join(ALGORITHMS),
+                        help=f"comma-separated solver modes ({', '.join(ALGORITHMS)})")
+    parser.add_argument("--heuristics", default=None,
+                        help=f"comma-separated heuristics to compare ({', '.join(HEURISTICS)}); "
+                             f"default: the solver's own choice")
+    parser.add_argument("--seed", type=int, default=BENCHMARK_SEED)
+    parser.add_argument("--time-limit", type=float, default=DEFAULT_TIME_LIMIT,
+                        help="per-board time limit for local_search and anytime (seconds)")
+    parser.add_argument("--limit", type=int, default=None, help="run at most this many boards per set")
+    args = parser.parse_args(argv)
+
+    sets = [name for name in args.sets.split(",") if name]
+    modes = [name for name in args.modes.split(",") if name]
+    for name in sets:
+        if name not in SETS:
+            parser.error(f"unknown set '{name}'")
+    for name in modes:
+        if name not in ALGORITHMS:
+            parser.error(f"unknown mode '{name}'")
+    heuristics = [None]
+    if args.heuristics is not None:
+        heuristics = [name for name in args.heuristics.split(",") if name]
+        for name in heuristics:
+            if name not in HEURISTICS:
+                parser.error(f"unknown heuristic '{name}'")
+
+    log = lambda line: print(line, file=sys.stderr)
+    report = run_benchmark(sets, modes, args.seed, args.time_limit, args.limit, log, heuristics)
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    if args.baseline is not None:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for group, metric, old, new in regressions:
+            print(f"REGRESSION {group} {metric}: {old} -> {new}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline} (threshold {args.threshold:.0%})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,25 @@
 import heapq
 import time
+from distance_table import solve_with_table
+from constants import (ANYTIME_TIME_LIMIT, ANYTIME_WEIGHTS, BEAM_WIDTH, IDA_TRANSPOSITION_MB,
+                       LOCAL_SEARCH_TIME_LIMIT, LOCAL_SEARCH_WORKERS, MAX_OPTIMAL_SIZE, SOLVER_MEMORY_LIMIT_MB, SOLVER_STATS_FILE)
+from heuristics import get_heuristic
+from local_search import solve_local_search
+from reduction import solve_reduction
+import solver_stats
+from solver_stats import SolverStats, append_stats
+from tables import move_table
+from transposition import BoundedTranspositionTable
+import vector_search
+
+# Số nút mở rộng giữa hai lần báo tiến độ (lũy thừa của 2 để kiểm tra bằng phép &)
+PROGRESS_INTERVAL = 4096
+
+# Bộ nhớ ước tính cho mỗi trạng thái đã sinh (đo bằng tracemalloc trên bàn 4x4):
+# A* giữ g_score, came_from, closed và một mục trong heap; Best First Search
+# giữ came_from và một mục trong heap
+A_STAR_NODE_BYTES = 330
+BEST_FIRST_NODE_BYTES = 210
 
 def _convert_path_to_moves(path):
     """Chuyển đổi path thành danh sách các vị trí di chuyển"""
@@ -7,11 +27,163 @@ def _convert_path_to_moves(path):
     return path
 
 
+def tile_bits(size):
+    """Số bit dùng cho mỗi ô khi mã hóa trạng thái (4 bit cho 3x3 và 4x4)"""
+    return max(4, (size * size - 1).bit_length())
+
+
+def pack_state(tiles, size):
+    """
+    Mã hóa trạng thái thành một số nguyên
+
+    Ô tại vị trí i chiếm các bit [i * bits, (i + 1) * bits), nên bàn 4x4 vừa
+    trong 64 bit. Ô trống có giá trị 0.
+
+    Args:
+        tiles: Danh sách 1D các ô
+        size: Kích thước bàn cờ
+
+    Returns:
+        int: Trạng thái đã mã hóa
+    """
+    bits = tile_bits(size)
+    state = 0
+    for index, tile in enumerate(tiles):
+        state |= tile << (index * bits)
+    return state
+
+
+def unpack_state(state, size):
+    """Giải mã số nguyên trạng thái thành danh sách 1D các ô"""
+    bits = tile_bits(size)
+    mask = (1 << bits) - 1
+    return [(state >> (index * bits)) & mask for index in range(size * size)]
+
+
+class BoardSnapshot:
+    """Bản sao bàn cờ cho BotSolver khi không có Game (tiến trình giải, công cụ dòng lệnh)"""
+
+    def __init__(self, board):
+        self.size = len(board)
+        self.board = [list(row) for row in board]
+
+
 class BotSolver:
-    def __init__(self, game):
+    def __init__(self, game, heuristic=None, memory_limit_mb=SOLVER_MEMORY_LIMIT_MB):
         self.game = game
         self.size = game.size
         self.solution_state = self._generate_solution_state()
+        self._update_encoding()
+
+        # Heuristic dùng chung cho mọi thuật toán ("manhattan", "pdb" hoặc None để tự chọn)
+        self.heuristic_name = heuristic
+        self.heuristic = get_heuristic(heuristic, self.size)
+
+        # Hàm nhận số nút đã mở rộng trong lúc giải (ví dụ để hiển thị tiến độ)
+        self.progress_callback = None
+        # Hàm nhận mỗi lời giải ngắn hơn tìm được trong lúc giải (chế độ anytime)
+        self.solution_callback = None
+
+        # Ngân sách bộ nhớ (MB) cho các thuật toán lưu trạng thái, None là không giới hạn.
+        # Khi vượt ngân sách: A* chuyển sang IDA*, IDA* dùng bảng chuyển vị cố định,
+        # weighted A* và Best First Search dừng sớm
+        self.memory_limit_mb = memory_limit_mb
+
+        # Thống kê của lượt giải gần nhất (SolverStats) và file JSONL để ghi lại (None để tắt)
+        self.stats = None
+        self.stats_file = SOLVER_STATS_FILE
+
+    def solve(self, algorithm, time_limit=None):
+        """
+        Giải puzzle bằng thuật toán theo tên
+
+        Args:
+            algorithm: "bfs", "hill_climbing", "local_search", "anytime", "beam", "reduction" hoặc "optimal"
+            time_limit: Thời gian tối đa (giây) cho "local_search" và "anytime",
+                None để dùng giá trị mặc định
+
+        Returns:
+            list: Danh sách vị trí (row, col) các ô cần di chuyển; thống kê của
+            lượt giải nằm trong self.stats
+        """
+        self.stats = None
+        if algorithm == "hill_climbing":
+            moves = self.solve_hill_climbing()
+        elif algorithm == "local_search":
+            if time_limit is None:
+                moves = self.solve_local_search()
+            else:
+                moves = self.solve_local_search(time_limit)
+        elif algorithm == "anytime":
+            if time_limit is None:
+                moves = self.solve_anytime()
+            else:
+                moves = self.solve_anytime(time_limit)
+        elif algorithm == "beam":
+            moves = self.solve_beam()
+        elif algorithm == "reduction":
+            moves = self.solve_reduction()
+        elif algorithm == "optimal":
+            moves = self.solve_optimal()
+        else:  # BFS
+            moves = self.solve_best_first_search()
+
+        if self.stats_file is not None and self.stats is not None:
+            append_stats(self.stats_file, self.stats)
+        return moves
+
+    def solve_with_stats(self, algorithm, time_limit=None):
+        """
+        Giống solve() nhưng trả về cả thống kê
+
+        Returns:
+            tuple: (danh sách nước đi, SolverStats)
+        """
+        moves = self.solve(algorithm, time_limit)
+        return moves, self.stats
+
+    def _begin_stats(self, algorithm):
+        """Tạo thống kê cho lượt giải mới (thay thống kê của lượt trước)"""
+        self.stats = SolverStats(algorithm, self.size, getattr(self.heuristic, "name", None))
+        return self.stats
+
+    def _record_search(self, stats, expanded, generated, frontier, visited):
+        """Ghi số nút của một lượt tìm kiếm (mỗi nút sinh ra tốn một lần gọi heuristic, cộng nút gốc)"""
+        stats.nodes_expanded = expanded
+        stats.nodes_generated = generated
+        stats.heuristic_calls = generated + 1
+        stats.observe(frontier, visited)
+
+    def _finish_stats(self, stats, termination, moves):
+        """Kết thúc thống kê, in tóm tắt và trả về moves"""
+        stats.finish(termination, moves)
+        print(stats.summary())
+        return moves
+
+    def _report_progress(self, nodes):
+        """Báo số nút đã mở rộng cho progress_callback (nếu có)"""
+        if self.progress_callback is not None:
+            self.progress_callback(nodes)
+
+    def _node_budget(self, node_bytes):
+        """Số trạng thái tối đa được lưu theo ngân sách bộ nhớ, None nếu không giới hạn"""
+        if self.memory_limit_mb is None:
+            return None
+        return max(1, int(self.memory_limit_mb * 1024 * 1024) // node_bytes)
+
+    def _sync_size(self):
+        """Cập nhật trạng thái đích và heuristic khi kích thước bàn cờ thay đổi"""
+        if self.size != self.game.size:
+            self.size = self.game.size
+            self.solution_state = self._generate_solution_state()
+            self._update_encoding()
+            self.heuristic = get_heuristic(self.heuristic_name, self.size)
+
+    def _update_encoding(self):
+        """Tính các tham số mã hóa trạng thái theo kích thước bàn cờ"""
+        self.bits = tile_bits(self.size)
+        self.mask = (1 << self.bits) - 1
+        self.goal_state = pack_state(self.solution_state, self.size)
 
     def _generate_solution_state(self):
         """Tạo trạng thái đích cho puzzle"""
@@ -24,177 +196,618 @@ class BotSolver:
                     solution.append(i * self.size + j + 1)
         return solution
 
+    def _start_state(self):
+        """
+        Lấy trạng thái bắt đầu từ bàn cờ của game
+
+        Returns:
+            tuple: (danh sách 1D các ô, trạng thái đã mã hóa, vị trí ô trống)
+        """
+        # Chuyển đổi bàn cờ từ 2D sang mảng 1D
+        tiles = [tile for row in self.game.board for tile in row]
+        return tiles, pack_state(tiles, self.size), tiles.index(0)
+
     def solve_best_first_search(self):
         """Giải puzzle bằng thuật toán Best First Search"""
         print("Starting Best First Search solver...")
-        start_time = time.time()
+        self._sync_size()
+        stats = self._begin_stats("best_first")
 
-        # Chuyển đổi bàn cờ từ 2D sang mảng 1D
-        start_state = []
-        for row in self.game.board:
-            for tile in row:
-                start_state.append(tile)
+        size, bits, mask = self.size, self.bits, self.mask
+        moves = move_table(size)
+        heuristic = self.heuristic
+        tiles, start_state, start_empty = self._start_state()
 
         # Priority queue cho Best First Search (sử dụng heapq)
-        # (heuristic, state, path)
-        start_heuristic = self._manhattan_distance(start_state)
-        open_set = [(start_heuristic, start_state, [])]
+        # (heuristic, state, vị trí ô trống, khóa heuristic)
+        start_heuristic, start_key = heuristic.start(tiles)
+        open_set = [(start_heuristic, start_state, start_empty, start_key)]
         heapq.heapify(open_set)
 
-        # Đánh dấu các trạng thái đã thăm
-        visited = {tuple(start_state)}
+        # Các trạng thái đã thăm, kèm vị trí ô trống của trạng thái cha
+        # (đủ để dựng lại đường đi khi tìm thấy đích, không cần lưu path ở mỗi nút)
+        came_from = {start_state: -1}
 
-        max_iterations = 10000  # Giới hạn số lần lặp
+        # Giới hạn số lần lặp; khi có ngân sách bộ nhớ thì giới hạn theo số trạng thái đã lưu
+        node_budget = self._node_budget(BEST_FIRST_NODE_BYTES)
+        max_iterations = 10000 if node_budget is None else float("inf")
         iterations = 0
+        generated = 0
+        termination = solver_stats.EXHAUSTED
 
-        while open_set and iterations < max_iterations:
+        while open_set:
+            if iterations >= max_iterations:
+                termination = solver_stats.ITERATION_LIMIT
+                break
             iterations += 1
 
             # Lấy trạng thái có heuristic nhỏ nhất
-            _, state, path = heapq.heappop(open_set)
+            h, state, empty_index, key = heapq.heappop(open_set)
+            if iterations % PROGRESS_INTERVAL == 0:
+                self._report_progress(iterations)
+                stats.observe(len(open_set), len(came_from))
+                if node_budget is not None and len(came_from) > node_budget:
+                    termination = solver_stats.MEMORY_LIMIT
+                    break
 
             # Kiểm tra nếu đã tìm được giải pháp
             if self._is_goal_state(state):
-                print(
-                    f"Best First Search found solution in {iterations} iterations and {time.time() - start_time:.2f} seconds")
-                print(f"Solution length: {len(path)} steps")
-                return _convert_path_to_moves(path)
-
-            # Tạo các trạng thái tiếp theo
-            empty_index = state.index(0)
-            empty_row, empty_col = empty_index // self.size, empty_index % self.size
-
-            # Xét 4 hướng di chuyển: lên, xuống, trái, phải
-            directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-
-            for dr, dc in directions:
-                new_row, new_col = empty_row + dr, empty_col + dc
-
-                # Kiểm tra nếu vị trí mới nằm trong bàn cờ
-                if 0 <= new_row < self.size and 0 <= new_col < self.size:
-                    # Tạo trạng thái mới
-                    new_state = state.copy()
-
-                    # Tính chỉ số trong mảng 1D
-                    new_index = new_row * self.size + new_col
-
-                    # Hoán đổi ô trống với ô mới
-                    new_state[empty_index], new_state[new_index] = new_state[new_index], new_state[empty_index]
-
-                    # Lưu vị trí ô di chuyển (row, col)
-                    move_pos = (new_row, new_col)
-
-                    # Nếu trạng thái mới chưa được thăm
-                    if tuple(new_state) not in visited:
-                        visited.add(tuple(new_state))
-                        # Tính giá trị heuristic mới
-                        new_heuristic = self._manhattan_distance(new_state)
-                        # Thêm vào priority queue
-                        heapq.heappush(open_set, (new_heuristic, new_state, path + [move_pos]))
-
-        print(f"Best First Search failed to find solution after {iterations} iterations")
+                path = self._reconstruct_path(came_from, state, empty_index)
+                self._record_search(stats, iterations, generated, len(open_set), len(came_from))
+                return self._finish_stats(stats, solver_stats.SOLVED, _convert_path_to_moves(path))
+
+            # Tạo các trạng thái tiếp theo (bỏ nước đi quay về trạng thái cha)
+            empty_shift = empty_index * bits
+            for new_index in moves[empty_index][came_from[state]]:
+                new_shift = new_index * bits
+
+                # Hoán đổi ô trống với ô mới bằng phép toán bit
+                tile = (state >> new_shift) & mask
+                new_state = state - (tile << new_shift) + (tile << empty_shift)
+
+                # Nếu trạng thái mới chưa được thăm
+                if new_state not in came_from:
+                    came_from[new_state] = empty_index
+                    generated += 1
+                    # Tính giá trị heuristic mới
+                    new_heuristic, new_key = heuristic.move(h, key, tile, new_index, empty_index)
+                    # Thêm vào priority queue
+                    heapq.heappush(open_set, (new_heuristic, new_state, new_index, new_key))
+
+        self._record_search(stats, iterations, generated, len(open_set), len(came_from))
         # Nếu không tìm được giải pháp, trả về danh sách rỗng
-        return []
+        return self._finish_stats(stats, termination, [])
 
     def solve_hill_climbing(self):
         """Giải puzzle bằng thuật toán Hill Climbing"""
         print("Starting Hill Climbing solver...")
-        start_time = time.time()
+        self._sync_size()
+        stats = self._begin_stats("hill_climbing")
 
-        # Chuyển đổi bàn cờ từ 2D sang mảng 1D
-        start_state = []
-        for row in self.game.board:
-            for tile in row:
-                start_state.append(tile)
-
-        current_state = start_state
-        current_cost = self._manhattan_distance(current_state)
+        size, bits, mask = self.size, self.bits, self.mask
+        moves = move_table(size)
+        heuristic = self.heuristic
+        tiles, current_state, empty_index = self._start_state()
+        current_cost, current_key = heuristic.start(tiles)
 
         path = []  # Lưu các vị trí di chuyển
-        visited = {tuple(current_state)}
+        visited = {current_state}
+        previous_index = -1  # Vị trí ô trống trước nước vừa đi
 
         max_iterations = 1000  # Giới hạn số lần lặp
         iterations = 0
+        generated = 0
 
         while iterations < max_iterations:
             iterations += 1
 
             if self._is_goal_state(current_state):
-                print(
-                    f"Hill Climbing found solution in {iterations} iterations and {time.time() - start_time:.2f} seconds")
-                print(f"Solution length: {len(path)} steps")
-                return path
-
-            # Tìm trạng thái kế tiếp tốt nhất
-            empty_index = current_state.index(0)
-            empty_row, empty_col = empty_index // self.size, empty_index % self.size
+                self._record_search(stats, iterations, generated, 1, len(visited))
+                return self._finish_stats(stats, solver_stats.SOLVED, path)
 
-            # Xét 4 hướng di chuyển: lên, xuống, trái, phải
-            directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+            # Tìm trạng thái kế tiếp tốt nhất (bỏ nước đi quay ngược)
+            empty_shift = empty_index * bits
 
             best_state = None
             best_cost = current_cost
-            best_move = None
-
-            for dr, dc in directions:
-                new_row, new_col = empty_row + dr, empty_col + dc
-
-                # Kiểm tra nếu vị trí mới nằm trong bàn cờ
-                if 0 <= new_row < self.size and 0 <= new_col < self.size:
-                    # Tạo trạng thái mới
-                    new_state = current_state.copy()
-
-                    # Tính chỉ số trong mảng 1D
-                    new_index = new_row * self.size + new_col
-
-                    # Hoán đổi ô trống với ô mới
-                    new_state[empty_index], new_state[new_index] = new_state[new_index], new_state[empty_index]
-
-                    # Nếu trạng thái mới chưa được thăm
-                    if tuple(new_state) not in visited:
-                        new_cost = self._manhattan_distance(new_state)
-                        if new_cost < best_cost:
-                            best_cost = new_cost
-                            best_state = new_state
-                            best_move = (new_row, new_col)
+            best_key = current_key
+            best_index = None
+
+            for new_index in moves[empty_index][previous_index]:
+                new_shift = new_index * bits
+
+                # Hoán đổi ô trống với ô mới bằng phép toán bit
+                tile = (current_state >> new_shift) & mask
+                new_state = current_state - (tile << new_shift) + (tile << empty_shift)
+
+                # Nếu trạng thái mới chưa được thăm
+                if new_state not in visited:
+                    generated += 1
+                    new_cost, new_key = heuristic.move(current_cost, current_key, tile, new_index, empty_index)
+                    if new_cost < best_cost:
+                        best_cost = new_cost
+                        best_key = new_key
+                        best_state = new_state
+                        best_index = new_index
 
             # Nếu không tìm được trạng thái tốt hơn
             if best_state is None:
-                print(f"Hill Climbing stuck at local minimum after {iterations} iterations")
+                self._record_search(stats, iterations, generated, 1, len(visited))
+                # Đường đi dở dang không phải lời giải
+                self._finish_stats(stats, solver_stats.LOCAL_MINIMUM, [])
                 return path
 
             # Cập nhật trạng thái hiện tại
             current_state = best_state
             current_cost = best_cost
-            visited.add(tuple(current_state))
-            path.append(best_move)
-
-        print(f"Hill Climbing did not find solution after {iterations} iterations")
+            current_key = best_key
+            previous_index = empty_index
+            empty_index = best_index
+            visited.add(current_state)
+            path.append((best_index // size, best_index % size))
+
+        self._record_search(stats, iterations, generated, 1, len(visited))
+        self._finish_stats(stats, solver_stats.ITERATION_LIMIT, [])
         return path
 
-    def _is_goal_state(self, state):
-        """Kiểm tra xem trạng thái hiện tại có phải là trạng thái đích không"""
-        for i in range(len(state)):
-            if state[i] != self.solution_state[i]:
-                return False
-        return True
-
-    def _manhattan_distance(self, state):
-        """Tính khoảng cách Manhattan giữa trạng thái hiện tại và trạng thái đích"""
-        distance = 0
-
-        for i in range(len(state)):
-            if state[i] == 0:  # Bỏ qua ô trống
+    def solve_local_search(self, time_limit=LOCAL_SEARCH_TIME_LIMIT, workers=LOCAL_SEARCH_WORKERS):
+        """
+        Giải puzzle bằng tìm kiếm cục bộ đa khởi đầu (leo đồi ngẫu nhiên,
+        mô phỏng luyện kim, tabu) chạy song song, trả về lời giải ngắn nhất
+
+        Args:
+            time_limit: Hạn chót chung (giây)
+            workers: Số tiến trình con (1 để chạy trong tiến trình hiện tại)
+        """
+        print("Starting local search solver...")
+        self._sync_size()
+        stats = self._begin_stats("local_search")
+
+        tiles = [tile for row in self.game.board for tile in row]
+        cells, steps = solve_local_search(tiles, self.size, self.heuristic_name, time_limit, workers)
+        # Mỗi bước của các lần thử (mọi tiến trình) mở rộng một trạng thái
+        stats.nodes_expanded = steps
+        if cells is None:
+            return self._finish_stats(stats, solver_stats.TIME_LIMIT, [])
+
+        moves = [(cell // self.size, cell % self.size) for cell in cells]
+        return self._finish_stats(stats, solver_stats.SOLVED, moves)
+
+    def solve_anytime(self, time_limit=ANYTIME_TIME_LIMIT):
+        """
+        Giải puzzle bằng weighted A* với trọng số giảm dần (anytime)
+
+        Lần chạy đầu với trọng số lớn cho lời giải rất nhanh; mỗi lần chạy sau
+        dùng trọng số nhỏ hơn và bỏ các nút có g + h không ngắn hơn lời giải tốt
+        nhất hiện có. Mỗi lời giải ngắn hơn được gửi cho solution_callback. Nếu
+        lần chạy với trọng số 1 kết thúc trước hạn thì lời giải là tối ưu.
+
+        Args:
+            time_limit: Thời gian tối đa (giây)
+
+        Returns:
+            list: Lời giải tốt nhất tìm được trước hạn
+        """
+        print("Starting anytime solver...")
+        self._sync_size()
+        stats = self._begin_stats("anytime")
+        start_time = time.time()
+        deadline = start_time + time_limit
+
+        best = None
+        termination = solver_stats.SOLVED
+        for weight in ANYTIME_WEIGHTS:
+            bound = len(best) if best is not None else None
+            path, termination = self._weighted_a_star(weight, deadline, bound, stats)
+
+            if path is not None:
+                best = path
+                stats.record_solution()
+                print(f"Anytime (w={weight}) found solution of {len(best)} steps "
+                      f"after {time.time() - start_time:.2f} seconds")
+                if self.solution_callback is not None:
+                    self.solution_callback(best)
+
+            if termination != solver_stats.SOLVED:
+                break
+
+        # Lần chạy cuối (trọng số 1) kết thúc trước hạn: lời giải là tối ưu;
+        # dừng vì hết giờ/bộ nhớ nhưng đã có lời giải: trả về lời giải tốt nhất
+        if best is None and termination == solver_stats.SOLVED:
+            termination = solver_stats.EXHAUSTED
+        return self._finish_stats(stats, termination, best or [])
+
+    def solve_weighted_a_star(self, weight, time_limit):
+        """
+        Một lần weighted A* có giới hạn thời gian (ví dụ để gợi ý nước đi)
+
+        Args:
+            weight: Trọng số của heuristic (lớn hơn 1 thì nhanh hơn nhưng không tối ưu)
+            time_limit: Thời gian tối đa (giây); chỉ được kiểm tra mỗi PROGRESS_INTERVAL nút
+
+        Returns:
+            list: Danh sách vị trí (row, col) các ô cần di chuyển, rỗng nếu không tìm
+            được lời giải trong hạn
+        """
+        print(f"Starting weighted A* (w={weight}) solver...")
+        self._sync_size()
+        stats = self._begin_stats("weighted_a_star")
+
+        path, termination = self._weighted_a_star(weight, time.time() + time_limit, None, stats)
+        if path is None:
+            if termination == solver_stats.SOLVED:
+                termination = solver_stats.EXHAUSTED
+            return self._finish_stats(stats, termination, [])
+        return self._finish_stats(stats, solver_stats.SOLVED, path)
+
+    def _weighted_a_star(self, weight, deadline, bound, stats):
+        """
+        Một lần chạy weighted A* (f = g + weight * h) cho solve_anytime
+
+        Args:
+            weight: Trọng số của heuristic
+            deadline: Thời điểm phải dừng (time.time())
+            bound: Độ dài lời giải tốt nhất hiện có (chỉ tìm lời giải ngắn hơn), hoặc None
+            stats: Thống kê của cả lượt anytime (số nút được cộng dồn qua các lần chạy)
+
+        Returns:
+            tuple: (lời giải hoặc None, lý do dừng); SOLVED nghĩa là lần chạy đã
+            kết thúc trước hạn và trong ngân sách bộ nhớ (kể cả khi không còn lời
+            giải ngắn hơn)
+        """
+        size, bits, mask = self.size, self.bits, self.mask
+        moves = move_table(size)
+        heuristic = self.heuristic
+        tiles, start_state, start_empty = self._start_state()
+        node_budget = self._node_budget(A_STAR_NODE_BYTES)
+
+        start_heuristic, start_key = heuristic.start(tiles)
+        open_set = [(weight * start_heuristic, 0, start_heuristic, start_state, start_empty, start_key)]
+        g_score = {start_state: 0}
+        came_from = {start_state: -1}
+        closed = set()
+        nodes = stats.nodes_expanded
+        generated = 0
+
+        def record():
+            stats.nodes_expanded = nodes
+            stats.nodes_generated += generated
+            stats.heuristic_calls += generated + 1
+            stats.observe(len(open_set), len(g_score))
+
+        while open_set:
+            _, _, h, state, empty_index, key = heapq.heappop(open_set)
+            if state in closed:
                 continue
+            closed.add(state)
+            nodes += 1
+            if nodes % PROGRESS_INTERVAL == 0:
+                self._report_progress(nodes)
+                stats.observe(len(open_set), len(g_score))
+                if time.time() >= deadline:
+                    record()
+                    return None, solver_stats.TIME_LIMIT
+                if node_budget is not None and len(g_score) > node_budget:
+                    record()
+                    return None, solver_stats.MEMORY_LIMIT
 
-            # Vị trí hiện tại
-            curr_row, curr_col = i // self.size, i % self.size
+            if self._is_goal_state(state):
+                record()
+                return self._reconstruct_path(came_from, state, empty_index), solver_stats.SOLVED
+
+            g = g_score[state]
+            empty_shift = empty_index * bits
+
+            # Bỏ nước đi quay về trạng thái cha
+            for new_index in moves[empty_index][came_from[state]]:
+                new_shift = new_index * bits
+                tile = (state >> new_shift) & mask
+                new_state = state - (tile << new_shift) + (tile << empty_shift)
+
+                new_g = g + 1
+                if new_state in closed or new_g >= g_score.get(new_state, new_g + 1):
+                    continue
+
+                new_heuristic, new_key = heuristic.move(h, key, tile, new_index, empty_index)
+                generated += 1
+                # Heuristic chấp nhận được: nút này không thể cho lời giải ngắn hơn
+                if bound is not None and new_g + new_heuristic >= bound:
+                    continue
+
+                g_score[new_state] = new_g
+                came_from[new_state] = empty_index
+                # Khi f bằng nhau ưu tiên nút sâu hơn (g lớn) để tới đích sớm
+                heapq.heappush(open_set, (new_g + weight * new_heuristic, -new_g, new_heuristic,
+                                          new_state, new_index, new_key))
+
+        record()
+        return None, solver_stats.SOLVED
+
+    def solve_optimal(self):
+        """
+        Giải puzzle tối ưu (ít bước nhất): bảng khoảng cách cho 3x3, IDA* cho 4x4
+
+        Bàn lớn hơn MAX_OPTIMAL_SIZE không thể tìm lời giải tối ưu trong thời gian
+        chấp nhận được nên dùng bộ giải rút gọn (không tối ưu).
+        """
+        self._sync_size()
+        if self.size > MAX_OPTIMAL_SIZE:
+            print(f"Optimal search is not feasible for {self.size}x{self.size}, using reduction solver")
+            return self.solve_reduction()
+        if self.size == 3:
+            return self.solve_distance_table()
+        if self.size < 3:
+            return self.solve_a_star()
+        return self.solve_ida_star()
+
+    def solve_beam(self, width=BEAM_WIDTH):
+        """
+        Giải puzzle bằng beam search theo khối (vector_search, cần NumPy)
+
+        Mỗi tầng giữ width trạng thái có heuristic nhỏ nhất; không đảm bảo tối ưu.
+        Nếu chưa cài NumPy thì dùng solve_best_first_search.
+        """
+        if not vector_search.is_available():
+            print("NumPy is not installed, falling back to best-first search")
+            return self.solve_best_first_search()
+
+        print("Starting beam search solver...")
+        self._sync_size()
+        stats = self._begin_stats("beam")
+
+        tiles = [tile for row in self.game.board for tile in row]
+        cells = vector_search.beam_search(tiles, self.size, width, self.heuristic_name,
+                                          progress=self._report_progress, stats=stats)
+        if cells is None:
+            return self._finish_stats(stats, solver_stats.EXHAUSTED, [])
+
+        moves = [(cell // self.size, cell % self.size) for cell in cells]
+        return self._finish_stats(stats, solver_stats.SOLVED, moves)
+
+    def solve_reduction(self):
+        """Giải puzzle bằng cách giải từng hàng/cột về lõi 3x3 (nhanh cho bàn lớn, không tối ưu)"""
+        print("Starting reduction solver...")
+        self._sync_size()
+
+        if self.size < 3:
+            return self.solve_a_star()
+
+        stats = self._begin_stats("reduction")
+        tiles = [tile for row in self.game.board for tile in row]
+        cells, slides = solve_reduction(tiles, self.size)
+        # Mỗi nước trượt đi qua một trạng thái
+        stats.nodes_expanded = slides
+        if cells is None:
+            return self._finish_stats(stats, solver_stats.UNSOLVABLE, [])
+
+        moves = [(cell // self.size, cell % self.size) for cell in cells]
+        return self._finish_stats(stats, solver_stats.SOLVED, moves)
+
+    def solve_distance_table(self):
+        """Giải puzzle 3x3 tối ưu bằng cách đi theo bảng khoảng cách chính xác"""
+        print("Starting distance table solver...")
+        stats = self._begin_stats("distance_table")
+
+        tiles = [tile for row in self.game.board for tile in row]
+        moves = solve_with_table(tiles)
+        if moves is None:
+            return self._finish_stats(stats, solver_stats.UNSOLVABLE, [])
+
+        # Mỗi bước tra bảng khoảng cách của các trạng thái kề
+        stats.nodes_expanded = len(moves)
+        return self._finish_stats(stats, solver_stats.SOLVED, moves)
+
+    def solve_a_star(self):
+        """
+        Giải puzzle bằng thuật toán A* (f = g + h)
+
+        Khi số trạng thái đã lưu vượt ngân sách bộ nhớ, giải phóng các bảng và
+        chuyển sang IDA* (cũng cho lời giải tối ưu nhưng gần như không tốn bộ nhớ).
+        """
+        print("Starting A* solver...")
+        self._sync_size()
+        stats = self._begin_stats("a_star")
+
+        size, bits, mask = self.size, self.bits, self.mask
+        moves = move_table(size)
+        heuristic = self.heuristic
+        tiles, start_state, start_empty = self._start_state()
+        node_budget = self._node_budget(A_STAR_NODE_BYTES)
+
+        # Priority queue: (f, h, thứ tự chèn, state, vị trí ô trống, khóa heuristic)
+        # Thứ tự chèn giúp so sánh ổn định khi f và h bằng nhau
+        start_heuristic, start_key = heuristic.start(tiles)
+        open_set = [(start_heuristic, start_heuristic, 0, start_state, start_empty, start_key)]
+        counter = 1
+
+        # Chi phí tốt nhất đã biết và vị trí ô trống của nút cha mỗi trạng thái
+        g_score = {start_state: 0}
+        came_from = {start_state: -1}
+        closed = set()
+
+        iterations = 0
 
-            # Vị trí đích (trong solution_state, số 1 ở vị trí 0, số 2 ở vị trí 1, ...)
-            target_pos = state[i] - 1
-            target_row, target_col = target_pos // self.size, target_pos % self.size
+        while open_set:
+            _, h, _, state, empty_index, key = heapq.heappop(open_set)
+            if state in closed:
+                continue
+            closed.add(state)
+            iterations += 1
+            if iterations % PROGRESS_INTERVAL == 0:
+                self._report_progress(iterations)
+                stats.observe(len(open_set), len(g_score))
+                if node_budget is not None and len(g_score) > node_budget:
+                    self._record_search(stats, iterations, counter - 1, len(open_set), len(g_score))
+                    self._finish_stats(stats, solver_stats.MEMORY_LIMIT, [])
+                    print("Switching to IDA*")
+                    # Giải phóng bộ nhớ trước khi chạy IDA* (thống kê mới thay cho thống kê của A*)
+                    open_set = g_score = came_from = closed = None
+                    return self.solve_ida_star()
 
-            # Cộng khoảng cách Manhattan
-            distance += abs(curr_row - target_row) + abs(curr_col - target_col)
+            if self._is_goal_state(state):
+                path = self._reconstruct_path(came_from, state, empty_index)
+                self._record_search(stats, iterations, counter - 1, len(open_set), len(g_score))
+                return self._finish_stats(stats, solver_stats.SOLVED, path)
+
+            g = g_score[state]
+            empty_shift = empty_index * bits
+
+            # Bỏ nước đi quay về trạng thái cha
+            for new_index in moves[empty_index][came_from[state]]:
+                new_shift = new_index * bits
+                tile = (state >> new_shift) & mask
+                new_state = state - (tile << new_shift) + (tile << empty_shift)
+
+                new_g = g + 1
+                if new_state in closed or new_g >= g_score.get(new_state, new_g + 1):
+                    continue
+
+                g_score[new_state] = new_g
+                came_from[new_state] = empty_index
+                new_heuristic, new_key = heuristic.move(h, key, tile, new_index, empty_index)
+                heapq.heappush(open_set, (new_g + new_heuristic, new_heuristic, counter, new_state, new_index, new_key))
+                counter += 1
+
+        self._record_search(stats, iterations, counter - 1, len(open_set), len(g_score))
+        return self._finish_stats(stats, solver_stats.EXHAUSTED, [])
+
+    def solve_ida_star(self):
+        """
+        Giải puzzle bằng thuật toán IDA* (Iterative Deepening A*)
+
+        Tìm kiếm theo chiều sâu với ngưỡng f = g + h tăng dần, dùng ít bộ nhớ
+        nên phù hợp với bàn 4x4. Có hai kỹ thuật cắt tỉa:
+        - Không sinh nước đi quay ngược lại nước vừa đi
+        - Bảng chuyển vị (transposition table): bỏ qua trạng thái đã gặp
+          trong lần lặp hiện tại với chi phí g nhỏ hơn hoặc bằng
+
+        Bảng chuyển vị có kích thước cố định (BoundedTranspositionTable) theo
+        memory_limit_mb, hoặc IDA_TRANSPOSITION_MB khi không đặt ngân sách, nên bộ
+        nhớ không tăng theo số trạng thái đã duyệt.
+        """
+        print("Starting IDA* solver...")
+        self._sync_size()
+        stats = self._begin_stats("ida_star")
+
+        size, bits, mask = self.size, self.bits, self.mask
+        tiles, start_state, empty_index = self._start_state()
+
+        # Nước đi của ô trống theo (vị trí hiện tại, vị trí trước đó)
+        moves = move_table(size)
+
+        heuristic = self.heuristic
+        move_heuristic = heuristic.move
+        path = []  # Các vị trí ô trống lần lượt đi tới
+        table_mb = self.memory_limit_mb if self.memory_limit_mb is not None else IDA_TRANSPOSITION_MB
+        transposition = BoundedTranspositionTable(int(table_mb * 1024 * 1024), size * size * bits)
+        probe = transposition.probe
+        if self.memory_limit_mb is not None:
+            print(f"IDA* transposition table limited to {transposition.capacity} entries")
+        nodes = 0
+        generated = 0
+        max_depth = 0  # Độ sâu đệ quy lớn nhất đã tới
+
+        def search(state, g, h, key, bound, empty, previous):
+            """Trả về -1 nếu tìm được lời giải, ngược lại trả về f nhỏ nhất vượt ngưỡng"""
+            nonlocal nodes, generated, max_depth
+            nodes += 1
+            if g > max_depth:
+                max_depth = g
+            if nodes % PROGRESS_INTERVAL == 0:
+                self._report_progress(nodes)
+
+            if h == 0:
+                return -1
+
+            if probe(state, g):
+                return float("inf")
+
+            # Không đi ngược lại nước vừa đi; mỗi nước còn lại tính heuristic một lần
+            targets = moves[empty][previous]
+            generated += len(targets)
+            minimum = float("inf")
+            empty_shift = empty * bits
+            for target in targets:
+                target_shift = target * bits
+                tile = (state >> target_shift) & mask
+
+                # Cập nhật heuristic theo ô vừa di chuyển (ô đi từ target sang empty)
+                new_h, new_key = move_heuristic(h, key, tile, target, empty)
+
+                f = g + 1 + new_h
+                if f > bound:
+                    if f < minimum:
+                        minimum = f
+                    continue
+
+                path.append(target)
+
+                new_state = state - (tile << target_shift) + (tile << empty_shift)
+                result = search(new_state, g + 1, new_h, new_key, bound, target, empty)
+                if result == -1:
+                    return -1
+                if result < minimum:
+                    minimum = result
+
+                path.pop()
+
+            return minimum
+
+        start_heuristic, start_key = heuristic.start(tiles)
+        bound = start_heuristic
+        iterations = 0
 
-        return distance
\ No newline at end of file
+        while True:
+            iterations += 1
+            transposition.new_iteration()
+            result = search(start_state, 0, start_heuristic, start_key, bound, empty_index, -1)
+
+            # Tập biên của IDA* là ngăn xếp đệ quy; tập đã thăm là các ô đã ghi của bảng chuyển vị
+            self._record_search(stats, nodes, generated, max_depth, transposition.used)
+
+            if result == -1:
+                moves = [(index // size, index % size) for index in path]
+                return self._finish_stats(stats, solver_stats.SOLVED, moves)
+
+            if result == float("inf"):
+                return self._finish_stats(stats, solver_stats.EXHAUSTED, [])
+
+            bound = result
+
+    def _reconstruct_path(self, came_from, state, empty_index):
+        """
+        Dựng lại danh sách nước đi từ bảng nút cha
+
+        Mỗi trạng thái chỉ lưu vị trí ô trống của trạng thái cha. Đi ngược từ
+        đích: nước đi là vị trí ô trống hiện tại, trạng thái cha có được bằng
+        cách trượt ô ở vị trí ô trống cũ trở lại.
+
+        Args:
+            came_from: Bảng trạng thái -> vị trí ô trống của trạng thái cha (-1 nếu là gốc)
+            state: Trạng thái đích (đã mã hóa)
+            empty_index: Vị trí ô trống của trạng thái đích
+
+        Returns:
+            list: Danh sách vị trí (row, col) các ô được di chuyển
+        """
+        size, bits, mask = self.size, self.bits, self.mask
+        path = []
+
+        parent_empty = came_from[state]
+        while parent_empty != -1:
+            path.append((empty_index // size, empty_index % size))
+
+            # Trượt ô trở lại vị trí cũ để có trạng thái cha
+            parent_shift = parent_empty * bits
+            tile = (state >> parent_shift) & mask
+            state = state - (tile << parent_shift) + (tile << (empty_index * bits))
+
+            empty_index = parent_empty
+            parent_empty = came_from[state]
+
+        path.reverse()
+        return path
+
+    def _is_goal_state(self, state):
+        """Kiểm tra xem trạng thái (đã mã hóa) có phải là trạng thái đích không"""
+        return state == self.goal_state
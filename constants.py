@@ -8,12 +8,26 @@ TEXT_COLOR = (255, 255, 255)  # Trắng
 BUTTON_COLOR = (80, 180, 80)  # Xanh lá
 BUTTON_HOVER_COLOR = (100, 200, 100)  # Xanh lá nhạt
 SOLVED_COLOR = (255, 215, 0)  # Vàng
+HINT_COLOR = (230, 120, 40)  # Cam (ô được gợi ý)
 
 # Cấu hình game
 ANIMATION_DURATION = 0.2  # Thời gian animation (giây)
 BOT_MOVE_DELAY = 0.5  # Thời gian delay giữa các bước của bot (giây)
 MAX_HIGH_SCORES = 10  # Số lượng điểm cao tối đa được lưu cho mỗi loại bàn
 MAX_HIGH_SCORES_PER_MAP = 5  # Số lượng điểm cao tối đa được lưu cho mỗi map
+SCORES_REFRESH_INTERVAL = 1.0  # Khoảng thời gian tối thiểu giữa hai lần kiểm tra file điểm bị sửa (giây)
+SCORES_COMPACT_EVERY = 50  # Số dòng journal điểm trước khi gộp vào scores.json
+SOLUTION_CACHE_SIZE = 1024  # Số lời giải giữ trong bộ nhớ đệm LRU
+SOLUTION_CACHE_REFRESH_INTERVAL = 1.0  # Khoảng thời gian tối thiểu giữa hai lần kiểm tra file lời giải bị sửa (giây)
+LOCAL_SEARCH_TIME_LIMIT = 5.0  # Hạn chót chung của tìm kiếm cục bộ song song (giây)
+LOCAL_SEARCH_WORKERS = 3  # Số tiến trình tìm kiếm cục bộ (mỗi chiến lược một tiến trình)
+ANYTIME_TIME_LIMIT = 10.0  # Thời gian tối đa của bộ giải anytime (giây)
+ANYTIME_WEIGHTS = (5.0, 3.0, 2.0, 1.5, 1.25, 1.0)  # Trọng số heuristic giảm dần của weighted A*
+BEAM_WIDTH = 2048  # Số trạng thái giữ lại mỗi tầng của beam search (cần NumPy)
+SOLVER_MEMORY_LIMIT_MB = None  # Ngân sách bộ nhớ của bộ giải (MB), None là không giới hạn
+IDA_TRANSPOSITION_MB = 32  # Kích thước bảng chuyển vị của IDA* khi không đặt ngân sách bộ nhớ (MB)
+HINT_TIME_LIMIT = 0.02  # Thời gian tìm kiếm tối đa khi gợi ý nước đi (giây)
+HINT_WEIGHT = 2.0  # Trọng số heuristic của weighted A* khi gợi ý nước đi
 
 #Kich thuoc man hinh
 WIDTH, HEIGHT = 1000, 700  # Tăng kích thước từ 800x600 lên 1000x700
@@ -23,6 +37,11 @@ FPS = 60
 MIN_MOVES_3X3 = 20  # Số bước tối thiểu lý thuyết cho bàn 3x3
 MIN_MOVES_4X4 = 50  # Số bước tối thiểu lý thuyết cho bàn 4x4
 
+# Kích thước bàn cờ
+MIN_BOARD_SIZE = 2
+MAX_BOARD_SIZE = 10  # Lớn nhất chọn được trên giao diện
+MAX_OPTIMAL_SIZE = 4  # Bàn lớn hơn không tìm được lời giải tối ưu, dùng bộ giải rút gọn
+
 # Cấu hình UI
 BOARD_SIZE = 400  # Kích thước tối đa của bàn chơi
 TILE_MARGIN = 4  # Khoảng cách giữa các ô
@@ -36,4 +55,10 @@ DROPDOWN_SPACING = 60  # Khoảng cách giữa các dropdown
 # Đường dẫn file
 DATA_DIRECTORY = "data"
 LEVELS_FILE = "data/levels.json"
-SCORES_FILE = "data/scores.json"
\ No newline at end of file
+SCORES_FILE = "data/scores.json"
+SCORES_BACKEND = "json"  # "json" (scores.json, top 10/5) hoặc "sqlite" (mọi lượt chơi, xem score_db.py)
+SCORES_DB_FILE = "data/scores.db"
+PATTERN_DB_FILE = "data/pdb_4x4.bin"
+DISTANCE_TABLE_FILE = "data/distance_3x3.bin"
+SOLUTION_CACHE_FILE = "data/solutions"  # File dbm (phần mở rộng tùy hệ thống)
+SOLVER_STATS_FILE = None  # File JSONL ghi thống kê mỗi lượt giải, ví dụ "data/solver_stats.jsonl" (None để tắt)
@@ -0,0 +1,239 @@
+"""
+Bảng khoảng cách chính xác cho toàn bộ không gian trạng thái 3x3
+
+Bàn 3x3 chỉ có 9!/2 = 181.440 trạng thái giải được, nên có thể lưu số bước
+tối thiểu của mọi trạng thái trong một mảng byte (khoảng 180 KB). Bảng được
+tạo một lần bằng BFS ngược từ trạng thái đích, lưu ở data/ và chỉ nạp khi cần.
+
+Chỉ số của một trạng thái:
+    vị trí ô trống * 20160 + hạng(hoán vị 8 ô số theo thứ tự đọc) // 2
+Trạng thái giải được của bàn 3x3 luôn là hoán vị chẵn của 8 ô số, và hai hoán
+vị chỉ khác nhau ở hai phần tử cuối có hạng 2k và 2k + 1 với tính chẵn lẻ ngược
+nhau, nên chia đôi hạng cho ra đúng một chỉ số cho mỗi trạng thái.
+
+Tạo file trước bằng lệnh:
+    python distance_table.py
+"""
+import os
+import time
+from collections import deque
+from constants import DATA_DIRECTORY, DISTANCE_TABLE_FILE
+from tables import neighbor_table
+
+SIZE = 3
+CELLS = SIZE * SIZE
+_EVEN_PERMUTATIONS = 20160  # 8! / 2
+TABLE_SIZE = CELLS * _EVEN_PERMUTATIONS  # 181440
+_UNKNOWN = 255
+
+_FACTORIALS = (5040, 720, 120, 24, 6, 2, 1, 1)
+
+# Bảng đã nạp trong tiến trình hiện tại
+_table = None
+# Chỉ số các trạng thái theo số bước tối thiểu (tạo khi cần)
+_by_distance = {}
+
+
+_NEIGHBORS = neighbor_table(SIZE)
+
+
+def state_index(tiles):
+    """
+    Tính chỉ số của trạng thái 3x3 trong bảng
+
+    Args:
+        tiles: Danh sách 1D 9 ô (0 là ô trống)
+
+    Returns:
+        int: Chỉ số trong bảng, hoặc None nếu trạng thái không giải được
+    """
+    blank = tiles.index(0)
+    numbers = [tile for tile in tiles if tile != 0]
+
+    rank = 0
+    parity = 0
+    for i in range(7):
+        tile = numbers[i]
+        smaller = 0
+        for j in range(i + 1, 8):
+            if numbers[j] < tile:
+                smaller += 1
+        rank += smaller * _FACTORIALS[i]
+        parity += smaller
+
+    # Số nghịch thế lẻ: không giải được
+    if parity % 2 == 1:
+        return None
+
+    return blank * _EVEN_PERMUTATIONS + rank // 2
+
+
+def index_state(index):
+    """
+    Trạng thái 3x3 ứng với một chỉ số của bảng (ngược lại với state_index)
+
+    Args:
+        index: Chỉ số trong bảng (0 đến TABLE_SIZE - 1)
+
+    Returns:
+        list: Danh sách 1D 9 ô
+    """
+    blank, half = divmod(index, _EVEN_PERMUTATIONS)
+
+    # Hai hạng 2k và 2k + 1 có tính chẵn lẻ ngược nhau: lấy hạng cho hoán vị chẵn
+    for rank in (2 * half, 2 * half + 1):
+        remaining = list(range(1, CELLS))
+        numbers = []
+        parity = 0
+        for factorial in _FACTORIALS:
+            smaller, rank = divmod(rank, factorial)
+            numbers.append(remaining.pop(smaller))
+            parity += smaller
+        if parity % 2 == 0:
+            break
+
+    numbers.insert(blank, 0)
+    return numbers
+
+
+def states_at_distance(distance):
+    """
+    Chỉ số của mọi trạng thái 3x3 có đúng số bước tối thiểu cho trước
+
+    Returns:
+        list: Các chỉ số trong bảng (rỗng nếu không có trạng thái nào)
+    """
+    if distance not in _by_distance:
+        table = load_distance_table()
+        _by_distance[distance] = [index for index, value in enumerate(table) if value == distance]
+    return _by_distance[distance]
+
+
+def build_distance_table():
+    """
+    Tính số bước tối thiểu của mọi trạng thái 3x3 bằng BFS ngược từ đích
+
+    Returns:
+        bytearray: Bảng khoảng cách theo state_index
+    """
+    table = bytearray([_UNKNOWN]) * TABLE_SIZE
+
+    goal = tuple(list(range(1, CELLS)) + [0])
+    table[state_index(goal)] = 0
+    queue = deque([(goal, CELLS - 1)])
+
+    while queue:
+        state, blank = queue.popleft()
+        distance = table[state_index(state)] + 1
+
+        for cell in _NEIGHBORS[blank]:
+            child = list(state)
+            child[blank], child[cell] = child[cell], 0
+            index = state_index(child)
+            if table[index] == _UNKNOWN:
+                table[index] = distance
+                queue.append((tuple(child), cell))
+
+    return table
+
+
+def save_distance_table(table, path=DISTANCE_TABLE_FILE):
+    """Ghi bảng ra file (ghi file tạm rồi đổi tên)"""
+    os.makedirs(os.path.dirname(path) or DATA_DIRECTORY, exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(table)
+    os.replace(temp_path, path)
+
+
+def load_distance_table(path=DISTANCE_TABLE_FILE):
+    """
+    Nạp bảng khoảng cách (chỉ một lần mỗi tiến trình)
+
+    Nếu chưa có file hoặc file hỏng thì tạo lại bảng (vài giây) và lưu vào data/.
+
+    Returns:
+        bytes: Bảng khoảng cách theo state_index
+    """
+    global _table
+    if _table is not None:
+        return _table
+
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        data = b""
+
+    if len(data) != TABLE_SIZE:
+        print("Building 3x3 distance table...")
+        data = bytes(build_distance_table())
+        try:
+            save_distance_table(data, path)
+        except OSError:
+            # Không ghi được file thì vẫn dùng bảng trong bộ nhớ
+            pass
+
+    _table = data
+    return _table
+
+
+def get_distance(tiles):
+    """
+    Số bước tối thiểu để giải một bàn 3x3
+
+    Args:
+        tiles: Danh sách 1D 9 ô hoặc bàn cờ 2D
+
+    Returns:
+        int: Số bước tối thiểu, hoặc None nếu bàn cờ không giải được
+    """
+    if tiles and isinstance(tiles[0], list):
+        tiles = [tile for row in tiles for tile in row]
+
+    index = state_index(tiles)
+    if index is None:
+        return None
+    return load_distance_table()[index]
+
+
+def solve_with_table(tiles):
+    """
+    Tìm lời giải tối ưu bằng cách đi theo bảng khoảng cách
+
+    Ở mỗi bước chọn ô kề làm khoảng cách giảm đúng 1.
+
+    Args:
+        tiles: Danh sách 1D 9 ô
+
+    Returns:
+        list: Danh sách vị trí (row, col) các ô cần di chuyển, hoặc None nếu
+        bàn cờ không giải được
+    """
+    table = load_distance_table()
+    state = list(tiles)
+    index = state_index(state)
+    if index is None:
+        return None
+
+    distance = table[index]
+    blank = state.index(0)
+    moves = []
+
+    while distance > 0:
+        for cell in _NEIGHBORS[blank]:
+            state[blank], state[cell] = state[cell], 0
+            if table[state_index(state)] == distance - 1:
+                moves.append((cell // SIZE, cell % SIZE))
+                blank = cell
+                distance -= 1
+                break
+            state[cell], state[blank] = state[blank], 0
+
+    return moves
+
+
+if __name__ == "__main__":
+    start_time = time.time()
+    save_distance_table(build_distance_table())
+    print(f"Distance table written to {DISTANCE_TABLE_FILE} in {time.time() - start_time:.1f} seconds")
@@ -0,0 +1,168 @@
+"""
+Khóa file giữa nhiều tiến trình và ghi file nguyên tử
+
+Dùng khi nhiều bản game cùng chạy trên một thư mục data/ (ví dụ các máy kiosk
+dùng chung ổ mạng):
+- FileLock: khóa độc quyền trên file "<đường dẫn>.lock" (fcntl.lockf trên
+  POSIX, hoạt động cả trên NFS; msvcrt.locking trên Windows), cộng thêm một
+  threading.Lock cho mỗi đường dẫn vì khóa fcntl không chặn các luồng trong
+  cùng tiến trình
+- write_temp/replace_file: ghi file tạm (có fsync) cạnh file đích rồi đổi tên
+- update_json: đọc-sửa-ghi kiểu lạc quan; đọc, gộp và ghi file tạm đều làm
+  ngoài khóa, trong khóa chỉ kiểm tra file chưa bị đổi rồi đổi tên (vài micro
+  giây), nên nhiều tiến trình ghi cùng lúc không phải xếp hàng chờ nhau đọc/ghi;
+  chỉ khi bị tranh chấp liên tục mới gộp trong khóa
+"""
+import json
+import os
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Số lần update_json gộp ngoài khóa trước khi chuyển sang gộp trong khóa
+MAX_OPTIMISTIC_ATTEMPTS = 3
+
+# Khóa luồng cho mỗi file khóa (dùng chung trong tiến trình)
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+
+class FileLock:
+    """
+    Khóa độc quyền giữa các tiến trình (và các luồng) cho một file
+
+    Dùng:
+        with FileLock(path):
+            ...
+    """
+
+    def __init__(self, path):
+        self.lock_file = path + ".lock"
+        with _thread_locks_guard:
+            self._thread_lock = _thread_locks.setdefault(os.path.abspath(self.lock_file), threading.Lock())
+        self._fd = None
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        try:
+            fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                if fcntl is not None:
+                    fcntl.lockf(fd, fcntl.LOCK_EX)
+                else:
+                    # Khóa byte đầu tiên (được phép khóa quá cuối file); LK_LOCK tự thử lại trong 10 giây
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            except BaseException:
+                os.close(fd)
+                raise
+            self._fd = fd
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+    def release(self):
+        fd, self._fd = self._fd, None
+        try:
+            if fcntl is not None:
+                fcntl.lockf(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+            self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.release()
+
+
+def file_id(path):
+    """(inode, mtime, kích thước) của file, None nếu chưa có; đổi tên file mới vào sẽ đổi inode"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def write_temp(path, data):
+    """
+    Ghi data vào một file tạm cạnh path (tên riêng cho mỗi lần gọi) và fsync
+
+    Returns:
+        str: Đường dẫn file tạm
+    """
+    directory, name = os.path.split(path)
+    fd, temp_path = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory or ".")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return temp_path
+
+
+def replace_file(path, data):
+    """Ghi file tạm rồi đổi tên, để file không bao giờ bị ghi dở"""
+    os.replace(write_temp(path, data), path)
+
+
+def update_json(path, update, default=None, indent=2):
+    """
+    Đọc-sửa-ghi một file JSON an toàn khi nhiều tiến trình cùng ghi
+
+    update nhận dữ liệu mới nhất trên đĩa và trả về dữ liệu mới (None nếu không
+    cần ghi). Nếu file bị tiến trình khác thay trong lúc gộp thì đọc lại và gọi
+    update lần nữa, nên update phải gộp được vào bất kỳ phiên bản nào của file.
+    Sau MAX_OPTIMISTIC_ATTEMPTS lần bị thay giữa chừng thì gộp ngay trong khóa để
+    chắc chắn ghi được.
+
+    Args:
+        path: Đường dẫn file JSON
+        update: Hàm dữ liệu cũ -> dữ liệu mới (hoặc None)
+        default: Hàm trả về dữ liệu khi file chưa có hoặc không đọc được
+        indent: Thụt lề khi ghi JSON
+
+    Returns:
+        Dữ liệu đã ghi, hoặc None nếu update không đổi gì
+    """
+    for _ in range(MAX_OPTIMISTIC_ATTEMPTS):
+        before = file_id(path)
+        data = update(_read_json(path, default))
+        if data is None:
+            return None
+        temp_path = write_temp(path, json.dumps(data, indent=indent))
+
+        with FileLock(path):
+            if file_id(path) == before:
+                os.replace(temp_path, path)
+                return data
+        # Tiến trình khác đã ghi file sau khi đọc: gộp lại vào phiên bản mới
+        os.remove(temp_path)
+
+    with FileLock(path):
+        data = update(_read_json(path, default))
+        if data is not None:
+            replace_file(path, json.dumps(data, indent=indent))
+        return data
+
+
+def _read_json(path, default):
+    """Đọc file JSON, hoặc default() nếu file chưa có hoặc không đọc được"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default() if default is not None else {}
@@ -1,9 +1,15 @@
-import random
 import time
 from bot import BotSolver
-from utils import is_solvable, get_solution_state
+from distance_table import get_distance
+from hint import HintProvider
+from solver_worker import SolverJob
+from solution_cache import get_solution_cache
+from local_search import remove_loops
+from scramble import random_board
+from utils import calculate_score, get_solution_state
 from levels import LevelManager
-from constants import ANIMATION_DURATION, BOT_MOVE_DELAY
+from score import get_score_manager
+from constants import ANIMATION_DURATION, BOT_MOVE_DELAY, MIN_BOARD_SIZE
 
 
 class Game:
@@ -34,6 +40,14 @@ class Game:
         self.bot_move_delay = BOT_MOVE_DELAY  # seconds
         self.bot_total_moves = 0
         self.bot_algorithm = None  # Thêm thuộc tính để lưu thuật toán bot
+        self.solver_job = None  # Lượt giải đang chạy nền (None nếu không có)
+        self.last_solver_stats = None  # SolverStats của lượt giải gần nhất
+        self.bot_trail = []  # Các ô trống bot đã đi tới từ bàn cờ lúc bắt đầu giải
+        self.solution_cache = get_solution_cache()
+
+        # Gợi ý nước đi
+        self.hint_provider = HintProvider(self.bot_solver.heuristic_name, self.solution_cache)
+        self.hint_move = None  # Ô đang được gợi ý (row, col), None nếu không có
 
         # Lịch sử nước đi
         self.move_history = []
@@ -41,16 +55,25 @@ class Game:
         # Level manager
         self.level_manager = LevelManager()
 
+        # Điểm cao (dùng chung với giao diện, ghi file trong luồng nền)
+        self.score_manager = get_score_manager()
+
         # Thông tin map hiện tại
         self.current_map = None  # None = map ngẫu nhiên
+        self.optimal_moves = None  # Số bước tối thiểu của bàn vừa bắt đầu (None nếu chưa biết)
 
         # Khởi tạo bàn cờ mới
         self.new_game(size)
 
     def new_game(self, size=None):
         if size is not None:
+            if size < MIN_BOARD_SIZE:
+                raise ValueError(f"board size must be at least {MIN_BOARD_SIZE}")
             self.size = size
 
+        # Hủy lượt giải đang chạy của bàn cũ
+        self.cancel_bot()
+
         # Khởi tạo bàn cờ theo thứ tự
         self.board = self._create_solved_board()
 
@@ -67,11 +90,18 @@ class Game:
         self.bot_moves = []
         self.bot_current_move = 0
         self.bot_total_moves = 0
+        self.bot_trail = []
         self.move_history = []
+        self.hint_move = None
+        self.hint_provider.reset()
         self.current_map = None  # Map ngẫu nhiên
+        self.optimal_moves = self._compute_optimal_moves()
 
     def load_level(self, level_data):
         """Tải map từ dữ liệu level"""
+        # Hủy lượt giải đang chạy của bàn cũ
+        self.cancel_bot()
+
         self.size = len(level_data["board"])
         self.board = level_data["board"]
         self.empty_pos = tuple(level_data["empty_pos"])
@@ -87,10 +117,29 @@ class Game:
         self.bot_moves = []
         self.bot_current_move = 0
         self.bot_total_moves = 0
+        self.bot_trail = []
         self.move_history = []
+        self.hint_move = None
+        self.hint_provider.reset()
+        self.optimal_moves = self._compute_optimal_moves()
+
+    def projected_rank(self):
+        """
+        Hạng trên bảng điểm cao nếu người chơi giải xong ngay bây giờ (hiển thị trong lúc chơi)
+
+        Returns:
+            int: Hạng (1 là cao nhất), hoặc None nếu không vào bảng hoặc không có người chơi đang giải
+        """
+        if not self.game_active or self.is_solved or self.bot_total_moves > 0 or self.moves == 0:
+            return None
+        score = calculate_score(self.moves, self.elapsed_time, self.size, self.optimal_moves)
+        return self.score_manager.rank(self.size, score, self.current_map)
 
-        # Khởi tạo lại bot solver với kích thước mới
-        self.bot_solver = BotSolver(self)
+    def _compute_optimal_moves(self):
+        """Số bước tối thiểu thật của bàn cờ hiện tại (chỉ tra được cho bàn 3x3)"""
+        if self.size != 3:
+            return None
+        return get_distance(self.board)
 
     def _create_solved_board(self):
         """Tạo bàn cờ đã được giải (theo thứ tự 1,2,3,...,0)"""
@@ -111,55 +160,11 @@ class Game:
         return board
 
     def _shuffle_board(self):
-        """Trộn bàn cờ và đảm bảo nó có thể giải được"""
-        # Làm phẳng bàn cờ
-        global empty_col, empty_row
-        flat_board = [tile for row in self.board for tile in row]
-
-        # Trộn cho đến khi tìm được một trạng thái có thể giải
-        valid_board = False
-        max_attempts = 100
-        attempts = 0
-
-        while not valid_board and attempts < max_attempts:
-            random.shuffle(flat_board)
-
-            # Tìm vị trí ô trống mới
-            empty_index = flat_board.index(0)
-            empty_row = empty_index // self.size
-            empty_col = empty_index % self.size
-
-            # Kiểm tra trạng thái có thể giải được
-            if is_solvable(flat_board, self.size, empty_row):
-                valid_board = True
-
-            attempts += 1
-
-        # Nếu không tìm được trạng thái hợp lệ, tạo một trạng thái đơn giản
-        if not valid_board:
-            self.board = self._create_solved_board()
-            # Di chuyển ô trống vài lần để tạo puzzle đơn giản
-            for _ in range(20):
-                row, col = self.empty_pos
-                directions = []
-
-                if row > 0: directions.append((-1, 0))  # lên
-                if row < self.size - 1: directions.append((1, 0))  # xuống
-                if col > 0: directions.append((0, -1))  # trái
-                if col < self.size - 1: directions.append((0, 1))  # phải
-
-                dr, dc = random.choice(directions)
-                self._swap_tiles((row, col), (row + dr, col + dc))
-            return
-
-        # Cập nhật bàn cờ với danh sách đã trộn
-        self.board = []
-        for i in range(self.size):
-            row_start = i * self.size
-            self.board.append(flat_board[row_start:row_start + self.size])
-
-        # Cập nhật vị trí ô trống
-        self.empty_pos = (empty_row, empty_col)
+        """Trộn bàn cờ: hoán vị ngẫu nhiên, sửa tính chẵn lẻ trực tiếp nên luôn giải được"""
+        tiles = random_board(self.size)
+        self.board = [tiles[row * self.size:(row + 1) * self.size] for row in range(self.size)]
+        empty_index = tiles.index(0)
+        self.empty_pos = (empty_index // self.size, empty_index % self.size)
 
     def get_tile_at_position(self, mouse_pos, tile_size, board_x, board_y):
         """Lấy ô tại vị trí chuột"""
@@ -178,7 +183,8 @@ class Game:
 
     def can_move(self, pos):
         """Kiểm tra xem ô tại vị trí pos có thể di chuyển không"""
-        if self.is_animating:
+        # Bot vẫn đi được khi bộ giải anytime đang tìm lời giải ngắn hơn
+        if self.is_animating or (self.is_bot_thinking() and not self.bot_active):
             return False
 
         row, col = pos
@@ -203,6 +209,7 @@ class Game:
 
         # Cập nhật bàn cờ ngay lập tức (logic)
         self._swap_tiles(pos, self.empty_pos)
+        self.hint_move = None
 
         # Cập nhật số bước và lịch sử
         if not self.bot_active:
@@ -245,17 +252,40 @@ class Game:
                 if not self.is_solved:
                     self.check_solved()
 
+        # Nhận kết quả từ tiến trình giải (không chặn)
+        if self.solver_job is not None:
+            job = self.solver_job
+            moves = job.poll()
+            if moves is not None:
+                self.solver_job = None
+                if job.stats is not None:
+                    self.last_solver_stats = job.stats
+                self.solution_cache.put(job.board, job.algorithm, moves)
+                if job.algorithm == "optimal":
+                    self.hint_provider.remember(job.board, moves)
+                self._offer_plan(job, moves)
+            else:
+                # Bộ giải anytime gửi lời giải tạm thời trước khi kết thúc
+                solution = job.take_solution()
+                if solution is not None:
+                    self._offer_plan(job, solution)
+
         # Xử lý bot tự động
         if self.bot_active and not self.is_animating and self.bot_moves:
             if current_time - self.bot_move_timer >= self.bot_move_delay:
                 if self.bot_current_move < len(self.bot_moves):
                     next_move = self.bot_moves[self.bot_current_move]
                     self.move_tile(next_move)
+                    self.bot_trail.append(next_move[0] * self.size + next_move[1])
                     self.bot_current_move += 1
                     self.bot_move_timer = current_time
                 else:
                     self.bot_active = False
 
+        # Bàn cờ đã giải xong: không cần chờ bộ giải anytime cải thiện thêm
+        if self.is_solved and self.solver_job is not None:
+            self.cancel_bot()
+
     def check_solved(self):
         solution = get_solution_state(self.size)
         current = [tile for row in self.board for tile in row]
@@ -264,10 +294,7 @@ class Game:
             self.is_solved = True
             self.game_active = False
 
-            # Lưu điểm số
-            from score import ScoreManager
-            score_manager = ScoreManager()
-
+            # Lưu điểm số (ghi file trong luồng nền, không chặn khung hình)
             # Xác định người/bot giải
             solver = "player"
             total_moves = self.moves
@@ -278,20 +305,29 @@ class Game:
                 solver = self.bot_algorithm if self.bot_algorithm else "bot"
 
             # Lưu điểm với thông tin người/bot giải
-            score_manager.save_score(
+            self.score_manager.save_score(
                 self.size,
                 total_moves,
                 self.elapsed_time,
                 self.current_map,
-                solver
+                solver,
+                self.optimal_moves
             )
 
             return True
         return False
 
-    def start_bot(self, algorithm="bfs"):
-        """Kích hoạt bot giải puzzle"""
-        if self.is_solved or self.bot_active:
+    def start_bot(self, algorithm="bfs", time_budget=None):
+        """
+        Kích hoạt bot giải puzzle (việc tìm kiếm chạy trong tiến trình riêng)
+
+        Args:
+            algorithm: Tên thuật toán (xem BotSolver.solve)
+            time_budget: Thời gian tối đa (giây) cho "local_search" và "anytime",
+                None để dùng giá trị mặc định. Với "anytime", bot bắt đầu đi ngay khi
+                có lời giải đầu tiên và chuyển sang lời giải ngắn hơn khi nhận được.
+        """
+        if self.is_solved or self.bot_active or self.is_bot_thinking():
             return
 
         # Reset số bước của bot
@@ -300,15 +336,95 @@ class Game:
         # Lưu thuật toán hiện tại của bot
         self.bot_algorithm = algorithm
 
-        # Tìm các bước giải bằng thuật toán được chọn
-        if algorithm == "hill_climbing":
-            self.bot_moves = self.bot_solver.solve_hill_climbing()
-        else:  # BFS
-            self.bot_moves = self.bot_solver.solve_best_first_search()
+        # Bàn cờ này đã được giải trước đó: dùng lại lời giải
+        moves = self.solution_cache.get(self.board, algorithm)
+        if moves is not None:
+            if algorithm == "optimal":
+                self.hint_provider.remember(self.board, moves)
+            self._start_bot_moves(moves)
+            return
+
+        # Tìm các bước giải bằng thuật toán được chọn, kết quả được nhận trong update()
+        self.bot_moves = []
+        self.bot_trail = []
+        self.solver_job = SolverJob(self.board, algorithm, self.bot_solver.heuristic_name, time_budget,
+                                    self.bot_solver.memory_limit_mb)
+        self.solver_job.start()
+
+    def hint(self):
+        """
+        Gợi ý nước đi tiếp theo cho người chơi (xem hint.HintProvider)
+
+        Nếu người chơi vẫn đi theo một lời giải đã tính thì gợi ý là nước tiếp
+        theo của lời giải đó; nếu không thì tra bảng khoảng cách (3x3), bộ nhớ đệm
+        lời giải hoặc tìm kiếm có giới hạn thời gian.
+
+        Returns:
+            tuple: Vị trí (row, col) của ô nên di chuyển, hoặc None nếu không có gợi ý
+        """
+        if self.is_solved or self.bot_active or self.is_bot_thinking():
+            self.hint_move = None
+        else:
+            self.hint_move = self.hint_provider.hint(self.board)
+        return self.hint_move
 
-        self.bot_active = True
+    def _start_bot_moves(self, moves):
+        """Bắt đầu cho bot đi theo danh sách nước đi"""
+        self.bot_moves = moves
+        self.bot_active = bool(moves)
         self.bot_current_move = 0
         self.bot_move_timer = time.time()
+        self.bot_trail = []
+
+    def _offer_plan(self, job, moves):
+        """
+        Nhận lời giải từ lượt giải: bắt đầu đi nếu bot chưa đi, hoặc đổi sang
+        lời giải mới nếu (tính từ trạng thái hiện tại) nó ngắn hơn phần còn lại
+
+        Đường đi mới = lùi lại các nước bot đã đi rồi theo lời giải mới, sau đó
+        cắt bỏ vòng lặp; nếu trạng thái hiện tại nằm trên lời giải mới thì chỉ
+        còn phần phía sau của lời giải đó.
+        """
+        if self.is_solved or not moves:
+            return
+        if not self.bot_active and not self.bot_trail:
+            self._start_bot_moves(moves)
+            return
+
+        size = self.size
+        start_blank = [tile for row in job.board for tile in row].index(0)
+        # Vị trí ô trống trước mỗi nước bot đã đi, theo thứ tự ngược
+        undo = ([start_blank] + self.bot_trail[:-1])[::-1]
+        cells = undo + [row * size + col for row, col in moves]
+        current = [tile for row in self.board for tile in row]
+        cells = remove_loops(current, size, cells)
+
+        remaining = len(self.bot_moves) - self.bot_current_move
+        if len(cells) < remaining:
+            self.bot_moves = [(cell // size, cell % size) for cell in cells]
+            self.bot_current_move = 0
+            self.bot_active = True
+
+    def cancel_bot(self):
+        """Hủy lượt giải đang chạy nền (nếu có)"""
+        if self.solver_job is not None:
+            self.solver_job.cancel()
+            self.solver_job = None
+
+    def is_bot_thinking(self):
+        """Bot đang tìm lời giải (chưa bắt đầu di chuyển)"""
+        return self.solver_job is not None
+
+    def get_solver_progress(self):
+        """
+        Lấy tiến độ của lượt giải đang chạy
+
+        Returns:
+            tuple: (số nút đã mở rộng, thời gian đã chạy), hoặc None nếu không có lượt giải nào
+        """
+        if self.solver_job is None:
+            return None
+        return self.solver_job.nodes, self.solver_job.elapsed
 
     def get_animation_progress(self):
         """Lấy tiến độ animation hiện tại (0 đến 1)"""
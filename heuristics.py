@@ -0,0 +1,159 @@
+"""
+Các hàm heuristic cho bộ giải
+
+Mỗi heuristic là một lớp có cùng giao diện để mọi thuật toán trong bot.py có
+thể dùng thay thế cho nhau:
+- estimate(tiles): tính giá trị cho một trạng thái (mảng 1D)
+- start(tiles): trả về (giá trị, khóa) để cập nhật tăng dần
+- move(h, key, tile, src, dst): giá trị và khóa mới khi ô tile trượt từ src sang dst
+"""
+from pattern_db import PatternDatabaseHeuristic, load_pattern_database
+from tables import manhattan_table
+from walking_distance import MAX_SIZE as WALKING_DISTANCE_MAX_SIZE, WalkingDistanceHeuristic
+
+HEURISTICS = ("manhattan", "linear_conflict", "walking_distance", "pdb")
+
+
+class ManhattanHeuristic:
+    """Tổng khoảng cách Manhattan của các ô tới vị trí đích"""
+
+    name = "manhattan"
+
+    def __init__(self, size):
+        self.size = size
+        self.table = manhattan_table(size)
+
+    def estimate(self, tiles):
+        """Tính khoảng cách Manhattan giữa trạng thái hiện tại và trạng thái đích"""
+        table = self.table
+        return sum(table[tile][index] for index, tile in enumerate(tiles))
+
+    def start(self, tiles):
+        return self.estimate(tiles), 0
+
+    def move(self, h, key, tile, src, dst):
+        # Chỉ khoảng cách của ô vừa di chuyển thay đổi
+        distances = self.table[tile]
+        return h - distances[src] + distances[dst], key
+
+
+def _longest_increasing(sequence):
+    """Độ dài dãy con tăng dài nhất (dãy rất ngắn, quy hoạch động O(k^2))"""
+    lengths = []
+    for i, value in enumerate(sequence):
+        lengths.append(1 + max((lengths[j] for j in range(i) if sequence[j] < value), default=0))
+    return max(lengths, default=0)
+
+
+class LinearConflictHeuristic:
+    """
+    Khoảng cách Manhattan cộng xung đột tuyến tính
+
+    Các ô đang nằm trên hàng đích của mình nhưng sai thứ tự thì ít nhất một ô
+    phải rời hàng rồi quay lại (thêm 2 bước). Mỗi hàng cộng 2 * (số ô thuộc
+    hàng - độ dài dãy con tăng dài nhất theo cột đích), tương tự với cột; vẫn
+    chấp nhận được.
+
+    Khóa là trạng thái mã hóa (cùng cách mã hóa với bot.pack_state) để tính lại
+    hàng/cột bị ảnh hưởng khi một ô di chuyển.
+    """
+
+    name = "linear_conflict"
+
+    def __init__(self, size):
+        self.size = size
+        self.table = manhattan_table(size)
+        self.bits = max(4, (size * size - 1).bit_length())
+        self.mask = (1 << self.bits) - 1
+        self.goal_rows = [-1] + [(tile - 1) // size for tile in range(1, size * size)]
+        self.goal_cols = [-1] + [(tile - 1) % size for tile in range(1, size * size)]
+        # Vị trí bit các ô của mỗi hàng (trái sang phải) và mỗi cột (trên xuống dưới)
+        self.row_shifts = [[(row * size + col) * self.bits for col in range(size)] for row in range(size)]
+        self.col_shifts = [[(row * size + col) * self.bits for row in range(size)] for col in range(size)]
+        # Số xung đột theo dãy vị trí đích của các ô thuộc một hàng/cột
+        self._conflicts = {}
+
+    def _line_conflicts(self, key, shifts, line, goal_lines, goal_offsets):
+        """Số bước phải cộng thêm cho một hàng (hoặc cột) của trạng thái key"""
+        mask = self.mask
+        sequence = []
+        for shift in shifts:
+            tile = (key >> shift) & mask
+            if tile and goal_lines[tile] == line:
+                sequence.append(goal_offsets[tile])
+        sequence = tuple(sequence)
+
+        conflicts = self._conflicts.get(sequence)
+        if conflicts is None:
+            conflicts = 2 * (len(sequence) - _longest_increasing(sequence))
+            self._conflicts[sequence] = conflicts
+        return conflicts
+
+    def start(self, tiles):
+        key = 0
+        for index, tile in enumerate(tiles):
+            key |= tile << (index * self.bits)
+
+        h = sum(self.table[tile][index] for index, tile in enumerate(tiles))
+        for line in range(self.size):
+            h += self._line_conflicts(key, self.row_shifts[line], line, self.goal_rows, self.goal_cols)
+            h += self._line_conflicts(key, self.col_shifts[line], line, self.goal_cols, self.goal_rows)
+        return h, key
+
+    def estimate(self, tiles):
+        """Tính giá trị heuristic của một trạng thái"""
+        return self.start(tiles)[0]
+
+    def move(self, h, key, tile, src, dst):
+        distances = self.table[tile]
+        h += distances[dst] - distances[src]
+        new_key = key + (tile << (dst * self.bits)) - (tile << (src * self.bits))
+
+        # Nước đi ngang chỉ đổi thành phần của hai cột, nước đi dọc chỉ đổi hai hàng;
+        # và chỉ khi một trong hai là cột (hàng) đích của ô vừa đi
+        size = self.size
+        if src - dst == size or dst - src == size:
+            goal_row = self.goal_rows[tile]
+            if goal_row == src // size or goal_row == dst // size:
+                shifts = self.row_shifts[goal_row]
+                h += (self._line_conflicts(new_key, shifts, goal_row, self.goal_rows, self.goal_cols)
+                      - self._line_conflicts(key, shifts, goal_row, self.goal_rows, self.goal_cols))
+        else:
+            goal_col = self.goal_cols[tile]
+            if goal_col == src % size or goal_col == dst % size:
+                shifts = self.col_shifts[goal_col]
+                h += (self._line_conflicts(new_key, shifts, goal_col, self.goal_cols, self.goal_rows)
+                      - self._line_conflicts(key, shifts, goal_col, self.goal_cols, self.goal_rows))
+        return h, new_key
+
+
+def get_heuristic(name, size):
+    """
+    Tạo heuristic theo tên
+
+    Args:
+        name: Tên heuristic (xem HEURISTICS) hoặc None để tự chọn
+        size: Kích thước bàn cờ
+
+    Returns:
+        object: Heuristic phù hợp. Nếu không dùng được pattern database (không phải
+        bàn 4x4 hoặc chưa tạo file) thì dùng khoảng cách Manhattan; walking distance
+        trên bàn lớn hơn 4x4 được thay bằng linear conflict.
+    """
+    if name == "linear_conflict":
+        return LinearConflictHeuristic(size)
+    if name == "walking_distance":
+        if size <= WALKING_DISTANCE_MAX_SIZE:
+            return WalkingDistanceHeuristic(size)
+        print(f"Walking distance supports boards up to {WALKING_DISTANCE_MAX_SIZE}x{WALKING_DISTANCE_MAX_SIZE}, "
+              f"using linear conflict.")
+        return LinearConflictHeuristic(size)
+
+    if name in (None, "pdb") and size == 4:
+        data = load_pattern_database()
+        if data is not None:
+            return PatternDatabaseHeuristic(data, size)
+        if name == "pdb":
+            print("Pattern database not found, run 'python pattern_db.py' to build it. Using Manhattan distance.")
+
+    return ManhattanHeuristic(size)
@@ -0,0 +1,128 @@
+"""
+Gợi ý nước đi tiếp theo cho người chơi (không import pygame)
+
+Các nguồn được thử lần lượt, dừng ở nguồn đầu tiên có kết quả:
+1. Kế hoạch đã biết: trạng thái hiện tại nằm trên một lời giải đã tính trước
+   (lời giải tối ưu của bot hoặc lời giải của lần gợi ý trước), tra dict O(1)
+2. Bàn 3x3: bảng khoảng cách chính xác (nước đi tối ưu)
+3. Bộ nhớ đệm lời giải (lời giải "optimal" đã lưu của bàn này)
+4. Tìm kiếm có giới hạn: weighted A* trong HINT_TIME_LIMIT giây cho bàn tới
+   MAX_OPTIMAL_SIZE, bộ giải rút gọn cho bàn lớn hơn
+5. Hết hạn mà chưa có lời giải: nước đi làm heuristic nhỏ nhất
+
+Lời giải tìm được ở bước 2-4 được ghi thành kế hoạch, nên khi người chơi đi
+theo gợi ý thì các lần gợi ý sau chỉ còn là một lần tra dict.
+"""
+from bot import BoardSnapshot, BotSolver, pack_state
+from constants import HINT_TIME_LIMIT, HINT_WEIGHT, MAX_OPTIMAL_SIZE
+from distance_table import solve_with_table
+from solution_cache import get_solution_cache
+from tables import neighbor_table
+
+
+class HintProvider:
+    """Tìm nước đi gợi ý cho một bàn cờ, nhớ các kế hoạch đã tính"""
+
+    def __init__(self, heuristic=None, cache=None):
+        """
+        Args:
+            heuristic: Tên heuristic cho tìm kiếm có giới hạn (xem heuristics.HEURISTICS)
+            cache: SolutionCache để tra lời giải đã lưu (None để dùng bộ nhớ đệm dùng chung)
+        """
+        self.cache = cache if cache is not None else get_solution_cache()
+        self._snapshot = BoardSnapshot([[0]])
+        self._solver = BotSolver(self._snapshot, heuristic)
+        # Trạng thái đã mã hóa -> vị trí ô cần di chuyển tiếp theo trên kế hoạch
+        self._plan = {}
+        self._plan_size = None
+        # Nguồn của gợi ý gần nhất ("plan", "distance_table", "cache", "search", "greedy")
+        self.source = None
+
+    def reset(self):
+        """Quên các kế hoạch đã nhớ (khi bắt đầu bàn mới)"""
+        self._plan = {}
+        self._plan_size = None
+
+    def remember(self, board, moves):
+        """
+        Ghi một lời giải thành kế hoạch: mỗi trạng thái trên đường đi ứng với nước đi tiếp theo
+
+        Args:
+            board: Bàn cờ lúc bắt đầu lời giải (list 2D)
+            moves: Danh sách vị trí (row, col) các ô cần di chuyển
+        """
+        size = len(board)
+        if size != self._plan_size:
+            self._plan = {}
+            self._plan_size = size
+
+        tiles = [tile for row in board for tile in row]
+        blank = tiles.index(0)
+        for row, col in moves:
+            cell = row * size + col
+            self._plan[pack_state(tiles, size)] = cell
+            tiles[blank], tiles[cell] = tiles[cell], 0
+            blank = cell
+
+    def hint(self, board):
+        """
+        Nước đi gợi ý cho bàn cờ
+
+        Args:
+            board: Bàn cờ hiện tại (list 2D)
+
+        Returns:
+            tuple: Vị trí (row, col) của ô nên di chuyển, hoặc None nếu bàn cờ đã giải
+            (hoặc không giải được)
+        """
+        size = len(board)
+        tiles = [tile for row in board for tile in row]
+        if tiles == list(range(1, size * size)) + [0]:
+            self.source = None
+            return None
+
+        if size == self._plan_size:
+            cell = self._plan.get(pack_state(tiles, size))
+            if cell is not None:
+                self.source = "plan"
+                return cell // size, cell % size
+
+        moves = None
+        if size == 3:
+            moves = solve_with_table(tiles)
+            if moves is None:
+                self.source = None
+                return None
+            self.source = "distance_table"
+        if not moves:
+            moves = self.cache.get(board, "optimal")
+            self.source = "cache"
+        if not moves:
+            moves = self._search(board)
+            self.source = "search"
+        if moves:
+            self.remember(board, moves)
+            return moves[0]
+
+        self.source = "greedy"
+        return self._greedy(tiles, size)
+
+    def _search(self, board):
+        """Tìm kiếm có giới hạn (weighted A* cho bàn nhỏ, bộ giải rút gọn cho bàn lớn)"""
+        self._snapshot.size = len(board)
+        self._snapshot.board = board
+        if self._snapshot.size > MAX_OPTIMAL_SIZE:
+            return self._solver.solve_reduction()
+        return self._solver.solve_weighted_a_star(HINT_WEIGHT, HINT_TIME_LIMIT)
+
+    def _greedy(self, tiles, size):
+        """Nước đi làm heuristic nhỏ nhất (khi tìm kiếm hết hạn)"""
+        heuristic = self._solver.heuristic
+        h, key = heuristic.start(tiles)
+        blank = tiles.index(0)
+        best = None
+        for cell in neighbor_table(size)[blank]:
+            new_h = heuristic.move(h, key, tiles[cell], cell, blank)[0]
+            if best is None or new_h < best[0]:
+                best = (new_h, cell)
+        return best[1] // size, best[1] % size
@@ -0,0 +1,166 @@
+"""
+Bảng xếp hạng top-k bằng heap nhỏ nhất có giới hạn
+
+Mỗi bảng giữ tối đa k điểm trong một heap mà gốc là điểm sẽ bị loại đầu
+tiên, nên:
+- thêm một điểm là O(log k) thay vì sắp xếp lại cả danh sách
+- "điểm này có vào bảng không?" là một phép so sánh với gốc (O(1)), đủ rẻ để
+  giao diện hỏi mỗi khung hình trong lúc chơi
+
+Thứ tự giống cách cũ (thêm vào cuối rồi sắp xếp ổn định giảm dần): điểm bằng
+nhau thì điểm cũ đứng trước, và một điểm mới bằng điểm thấp nhất của bảng đã
+đầy thì không vào bảng.
+"""
+import heapq
+from constants import MAX_HIGH_SCORES, MAX_HIGH_SCORES_PER_MAP
+
+
+class Leaderboard:
+    """Giữ capacity điểm cao nhất (mỗi điểm là một dict có khóa "score")"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        # (điểm, -thứ tự thêm, dict điểm): gốc heap là điểm thấp nhất, mới nhất
+        self._heap = []
+        self._order = 0
+        # Danh sách đã sắp xếp, tạo lại khi bảng thay đổi
+        self._sorted = None
+
+    def __len__(self):
+        return len(self._heap)
+
+    def would_place(self, score):
+        """Điểm này có vào bảng nếu được thêm bây giờ không (O(1))"""
+        return len(self._heap) < self.capacity or score > self._heap[0][0]
+
+    def rank(self, score):
+        """
+        Hạng mà điểm này sẽ có nếu được thêm bây giờ
+
+        Returns:
+            int: Hạng (1 là cao nhất), hoặc None nếu không vào bảng
+        """
+        if not self.would_place(score):
+            return None
+        # Điểm bằng nhau thì điểm cũ đứng trước
+        return 1 + sum(1 for item in self._heap if item[0] >= score)
+
+    def push(self, entry):
+        """
+        Thêm một điểm (O(log k))
+
+        Returns:
+            bool: True nếu điểm vào bảng
+        """
+        score = entry["score"]
+        if not self.would_place(score):
+            return False
+        self._order += 1
+        item = (score, -self._order, entry)
+        if len(self._heap) < self.capacity:
+            heapq.heappush(self._heap, item)
+        else:
+            heapq.heapreplace(self._heap, item)
+        self._sorted = None
+        return True
+
+    def entries(self):
+        """Các điểm trong bảng, cao trước (giữ lại giữa các lần gọi cho tới khi bảng thay đổi)"""
+        if self._sorted is None:
+            self._sorted = [entry for _, _, entry in sorted(self._heap, reverse=True)]
+        return self._sorted
+
+
+class LeaderboardSet:
+    """
+    Các bảng xếp hạng theo (kích thước, map, người giải)
+
+    map None là bàn ngẫu nhiên (MAX_HIGH_SCORES điểm), còn lại là map có tên
+    (MAX_HIGH_SCORES_PER_MAP điểm). solver None là bảng chung của mọi người/bot giải.
+    """
+
+    def __init__(self, random_capacity=MAX_HIGH_SCORES, map_capacity=MAX_HIGH_SCORES_PER_MAP):
+        self.random_capacity = random_capacity
+        self.map_capacity = map_capacity
+        self._boards = {}
+        self._sizes = set()
+
+    def get(self, size, map_name=None, solver=None):
+        """Bảng xếp hạng, hoặc None nếu chưa có điểm nào"""
+        return self._boards.get((size, map_name, solver))
+
+    def board(self, size, map_name=None, solver=None):
+        """Bảng xếp hạng (tạo bảng rỗng nếu chưa có)"""
+        key = (size, map_name, solver)
+        board = self._boards.get(key)
+        if board is None:
+            board = Leaderboard(self.random_capacity if map_name is None else self.map_capacity)
+            self._boards[key] = board
+            self._sizes.add(size)
+        return board
+
+    def would_place(self, size, score, map_name=None, solver=None):
+        """Điểm này có vào bảng chung (solver None) hoặc bảng của solver không"""
+        board = self.get(size, map_name, solver)
+        return board is None or board.would_place(score)
+
+    def add(self, size, entry, map_name=None):
+        """
+        Thêm một điểm vào bảng chung và bảng của người giải (entry["solver"])
+
+        Returns:
+            bool: True nếu điểm vào ít nhất một bảng
+        """
+        placed = self.board(size, map_name).push(entry)
+        solver = entry.get("solver", "player")
+        return self.board(size, map_name, solver).push(entry) or placed
+
+    def to_dict(self):
+        """Dạng lưu trong scores.json ("random", "maps" và "solvers" cho mỗi kích thước)"""
+        data = {}
+        for size in sorted(self._sizes):
+            data[f"{size}x{size}"] = {"random": [], "maps": {}, "solvers": {}}
+        for (size, map_name, solver), board in self._boards.items():
+            group = data[f"{size}x{size}"]
+            if solver is not None:
+                group = group["solvers"].setdefault(solver, {"random": [], "maps": {}})
+            if map_name is None:
+                group["random"] = board.entries()
+            else:
+                group["maps"][map_name] = board.entries()
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Tạo từ dữ liệu scores.json
+
+        File cũ chưa có "solvers" thì bảng của từng người giải được dựng từ các
+        điểm của bảng chung.
+        """
+        boards = cls()
+        for key, group in data.items():
+            if not isinstance(group, dict):
+                continue
+            size = int(key.split("x")[0])
+            boards._sizes.add(size)
+            boards._load_group(size, group, None)
+            solvers = group.get("solvers")
+            if solvers is None:
+                for entry in group.get("random", []):
+                    boards.board(size, None, entry.get("solver", "player")).push(entry)
+                for map_name, entries in group.get("maps", {}).items():
+                    for entry in entries:
+                        boards.board(size, map_name, entry.get("solver", "player")).push(entry)
+            else:
+                for solver, solver_group in solvers.items():
+                    boards._load_group(size, solver_group, solver)
+        return boards
+
+    def _load_group(self, size, group, solver):
+        """Nạp một nhóm {"random": [...], "maps": {...}} (đã sắp xếp cao trước)"""
+        for entry in group.get("random", []):
+            self.board(size, None, solver).push(entry)
+        for map_name, entries in group.get("maps", {}).items():
+            for entry in entries:
+                self.board(size, map_name, solver).push(entry)
@@ -1,10 +1,18 @@
 import json
 import os
+from file_lock import FileLock, replace_file, update_json
 from utils import is_solvable
 from maps import MAPS_3X3, MAPS_4X4
 from constants import LEVELS_FILE
 
 
+def _default_levels():
+    return {
+        "3x3": list(MAPS_3X3),
+        "4x4": list(MAPS_4X4)
+    }
+
+
 class LevelManager:
     def __init__(self):
         self.levels_file = LEVELS_FILE
@@ -13,20 +21,18 @@ class LevelManager:
         os.makedirs("data", exist_ok=True)
 
         # Tạo file levels.json với các map mặc định nếu chưa tồn tại
+        # (trong khóa, để không ghi đè file mà bản game khác vừa tạo và thêm map)
         if not os.path.exists(self.levels_file):
-            default_levels = {
-                "3x3": MAPS_3X3,
-                "4x4": MAPS_4X4
-            }
-            with open(self.levels_file, 'w') as f:
-                json.dump(default_levels, f, indent=2)
+            with FileLock(self.levels_file):
+                if not os.path.exists(self.levels_file):
+                    replace_file(self.levels_file, json.dumps(_default_levels(), indent=2))
 
     def get_all_levels(self, size):
         """
         Lấy tất cả các map cho kích thước bàn cờ
 
         Args:
-            size: Kích thước bàn cờ (3 hoặc 4)
+            size: Kích thước bàn cờ (n cho bàn n x n)
 
         Returns:
             list: Danh sách các map
@@ -43,7 +49,7 @@ class LevelManager:
         Lấy map theo tên
 
         Args:
-            size: Kích thước bàn cờ (3 hoặc 4)
+            size: Kích thước bàn cờ (n cho bàn n x n)
             name: Tên map
 
         Returns:
@@ -62,7 +68,7 @@ class LevelManager:
         Thêm map mới
 
         Args:
-            size: Kích thước bàn cờ (3 hoặc 4)
+            size: Kích thước bàn cờ (n cho bàn n x n)
             board: Trạng thái bàn cờ (list 2D)
             empty_pos: Vị trí ô trống [row, col]
             name: Tên map
@@ -75,28 +81,28 @@ class LevelManager:
         if not is_solvable(flat_board, size, empty_pos[0]):
             return False
 
-        levels = self._load_levels()
         key = f"{size}x{size}"
-
-        if key not in levels:
-            levels[key] = []
-
-        # Kiểm tra xem tên đã tồn tại chưa
-        for level in levels[key]:
-            if level["name"] == name:
-                return False
-
-        # Thêm map mới
         new_level = {
             "name": name,
             "board": board,
             "empty_pos": empty_pos
         }
 
-        levels[key].append(new_level)
-        self._save_levels(levels)
+        def merge(levels):
+            """Thêm map vào bản mới nhất trên đĩa (có thể đã có map của bản game khác)"""
+            if key not in levels:
+                levels[key] = []
+
+            # Kiểm tra xem tên đã tồn tại chưa
+            for level in levels[key]:
+                if level["name"] == name:
+                    return None
+
+            levels[key].append(new_level)
+            return levels
 
-        return True
+        # Gộp vào file mới nhất rồi ghi nguyên tử, nên nhiều bản game cùng thêm map không làm mất map nào
+        return update_json(self.levels_file, merge, _default_levels) is not None
 
     def _load_levels(self):
         """Đọc dữ liệu map từ file"""
@@ -104,13 +110,5 @@ class LevelManager:
             with open(self.levels_file, 'r') as f:
                 return json.load(f)
         except (json.JSONDecodeError, FileNotFoundError):
-            # Nếu file không tồn tại hoặc không đọc được, tạo mới
-            return {
-                "3x3": MAPS_3X3,
-                "4x4": MAPS_4X4
-            }
-
-    def _save_levels(self, levels):
-        """Lưu dữ liệu map vào file"""
-        with open(self.levels_file, 'w') as f:
-            json.dump(levels, f, indent=2)
\ No newline at end of file
+            # Nếu file không tồn tại hoặc không đọc được, dùng các map mặc định
+            return _default_levels()
@@ -0,0 +1,346 @@
+"""
+Tìm kiếm cục bộ đa khởi đầu chạy song song
+
+Thay cho Hill Climbing một lần (dừng ở cực tiểu địa phương đầu tiên), mỗi tiến
+trình con chạy lặp lại một trong ba chiến lược với hạt giống ngẫu nhiên riêng:
+- "restart": leo đồi ngẫu nhiên (chọn ngẫu nhiên giữa các nước tốt nhất, đôi khi
+  đi một nước ngẫu nhiên), bắt đầu lại khi đường đi quá dài
+- "annealing": mô phỏng luyện kim (nhận nước xấu hơn với xác suất exp(-delta/T))
+- "tabu": chọn nước tốt nhất không nằm trong danh sách tabu các trạng thái gần đây
+
+Mọi tiến trình dùng chung một hạn chót. Khi có lời giải đầu tiên, các tiến trình
+còn được thêm một khoảng thời gian ngắn để tìm lời giải ngắn hơn, sau đó lời giải
+ngắn nhất được trả về. Lời giải luôn được cắt bỏ các vòng lặp (trạng thái lặp lại).
+"""
+import math
+import multiprocessing
+import queue
+import random
+import time
+from heuristics import get_heuristic
+from tables import move_table
+
+STRATEGIES = ("restart", "annealing", "tabu")
+
+# Số bước tối đa của một lần thử trước khi bắt đầu lại từ trạng thái ban đầu
+MAX_ATTEMPT_STEPS = 20000
+# Số bước giữa hai lần kiểm tra hạn chót / yêu cầu dừng
+_CHECK_INTERVAL = 1024
+# Thời gian chờ thêm sau lời giải đầu tiên để các tiến trình khác cải thiện (giây)
+IMPROVE_GRACE = 0.25
+# Thời gian chờ tối đa của một lần đọc kết quả trước khi kiểm tra các tiến trình con còn chạy
+_POLL_INTERVAL = 0.05
+# Tổng thời gian chờ các tiến trình con tự dừng (giây)
+_JOIN_TIMEOUT = 0.1
+
+_RESTART_NOISE = 0.1  # Xác suất đi một nước ngẫu nhiên khi leo đồi
+_ANNEALING_START_TEMPERATURE = 2.0
+_ANNEALING_COOLING = 0.9995
+_ANNEALING_MIN_TEMPERATURE = 0.05
+_TABU_TENURE = 64  # Số trạng thái gần nhất bị cấm quay lại
+
+_context = multiprocessing.get_context("spawn")
+
+
+def remove_loops(tiles, size, cells):
+    """
+    Cắt bỏ các đoạn đường đi quay lại trạng thái đã gặp
+
+    Args:
+        tiles: Trạng thái ban đầu (danh sách 1D)
+        size: Kích thước bàn cờ
+        cells: Dãy vị trí ô trống lần lượt đi tới
+
+    Returns:
+        list: Dãy vị trí ô trống không còn trạng thái lặp lại
+    """
+    state = list(tiles)
+    blank = state.index(0)
+    history = [tuple(state)]  # history[i]: trạng thái sau i nước của result
+    seen = {history[0]: 0}
+    result = []
+
+    for cell in cells:
+        state[blank], state[cell] = state[cell], 0
+        blank = cell
+        key = tuple(state)
+        cut = seen.get(key)
+        if cut is None:
+            result.append(cell)
+            history.append(key)
+            seen[key] = len(result)
+        else:
+            # Quay về trạng thái đã gặp: bỏ cả đoạn vòng lặp
+            for dropped in history[cut + 1:]:
+                del seen[dropped]
+            del history[cut + 1:]
+            del result[cut:]
+
+    return result
+
+
+class _Walker:
+    """Một lần thử tìm kiếm cục bộ từ trạng thái ban đầu"""
+
+    def __init__(self, tiles, size, heuristic, moves, rng):
+        self.tiles = list(tiles)
+        self.size = size
+        self.heuristic = heuristic
+        self.moves = moves
+        self.rng = rng
+        self.steps = 0  # Tổng số bước đã đi qua mọi lần thử
+
+    def run(self, strategy, should_stop):
+        """
+        Chạy một lần thử
+
+        Returns:
+            list: Dãy vị trí ô trống nếu tới đích, None nếu hết bước hoặc phải dừng
+        """
+        rng = self.rng
+        move = self.heuristic.move
+        state = list(self.tiles)
+        blank = state.index(0)
+        h, key = self.heuristic.start(state)
+        previous = -1
+        path = []
+
+        temperature = _ANNEALING_START_TEMPERATURE
+        tabu_order = []
+        tabu = set()
+        best_h = h
+
+        for step in range(MAX_ATTEMPT_STEPS):
+            if h == 0:
+                self.steps += step
+                return path
+            if step % _CHECK_INTERVAL == 0 and should_stop():
+                self.steps += step
+                return None
+
+            # Sinh các nước đi (không quay lại nước vừa đi)
+            candidates = []
+            for cell in self.moves[blank][previous]:
+                tile = state[cell]
+                new_h, new_key = move(h, key, tile, cell, blank)
+                candidates.append((new_h, cell, tile, new_key))
+
+            if strategy == "annealing":
+                choice = rng.choice(candidates)
+                delta = choice[0] - h
+                if delta > 0 and rng.random() >= math.exp(-delta / temperature):
+                    continue
+                temperature *= _ANNEALING_COOLING
+                if temperature < _ANNEALING_MIN_TEMPERATURE:
+                    temperature = _ANNEALING_START_TEMPERATURE  # Hâm nóng lại
+            elif strategy == "tabu":
+                allowed = []
+                for candidate in candidates:
+                    cell, tile = candidate[1], candidate[2]
+                    state[blank], state[cell] = tile, 0
+                    child = tuple(state)
+                    state[cell], state[blank] = tile, 0
+                    # Tiêu chí khát vọng: vẫn nhận trạng thái tabu nếu tốt hơn mọi trạng thái đã gặp
+                    if child not in tabu or candidate[0] < best_h:
+                        allowed.append(candidate)
+                pool = allowed or candidates
+                lowest = min(candidate[0] for candidate in pool)
+                choice = rng.choice([candidate for candidate in pool if candidate[0] == lowest])
+            else:  # restart
+                if rng.random() < _RESTART_NOISE:
+                    choice = rng.choice(candidates)
+                else:
+                    lowest = min(candidate[0] for candidate in candidates)
+                    choice = rng.choice([candidate for candidate in candidates if candidate[0] == lowest])
+
+            h, cell, tile, key = choice
+            state[blank], state[cell] = tile, 0
+            previous, blank = blank, cell
+            path.append(cell)
+            if h < best_h:
+                best_h = h
+
+            if strategy == "tabu":
+                current = tuple(state)
+                tabu_order.append(current)
+                tabu.add(current)
+                if len(tabu_order) > _TABU_TENURE:
+                    tabu.discard(tabu_order.pop(0))
+
+        self.steps += MAX_ATTEMPT_STEPS
+        return None
+
+
+def run_strategy(tiles, size, heuristic_name, strategy, seed, deadline, should_stop=None):
+    """
+    Chạy một chiến lược lặp lại cho tới khi tìm được lời giải hoặc hết giờ
+
+    Args:
+        tiles: Trạng thái ban đầu (danh sách 1D)
+        size: Kích thước bàn cờ
+        heuristic_name: Tên heuristic (xem heuristics.get_heuristic)
+        strategy: "restart", "annealing" hoặc "tabu"
+        seed: Hạt giống ngẫu nhiên
+        deadline: Thời điểm phải dừng (time.time())
+        should_stop: Hàm trả về True khi cần dừng sớm
+
+    Returns:
+        tuple: (dãy vị trí ô trống của lời giải đã cắt vòng lặp hoặc None, số bước đã đi)
+    """
+    walker = _Walker(tiles, size, get_heuristic(heuristic_name, size), move_table(size), random.Random(seed))
+
+    def stop():
+        return time.time() >= deadline or (should_stop is not None and should_stop())
+
+    while not stop():
+        cells = walker.run(strategy, stop)
+        if cells is not None:
+            return remove_loops(tiles, size, cells), walker.steps
+    return None, walker.steps
+
+
+def _worker(tiles, size, heuristic_name, strategy, seed, deadline, stop_event, results):
+    """
+    Tiến trình con: gửi mọi lời giải tìm được dưới dạng (cells, None), khi dừng
+    (vì có yêu cầu hoặc hết giờ) gửi (None, tổng số bước đã đi)
+    """
+    parent = multiprocessing.parent_process()
+
+    def should_stop():
+        return stop_event.is_set() or (parent is not None and not parent.is_alive())
+
+    best_length = None
+    total_steps = 0
+    while not should_stop() and time.time() < deadline:
+        cells, steps = run_strategy(tiles, size, heuristic_name, strategy, seed, deadline, should_stop)
+        total_steps += steps
+        seed += 1000003  # Lần thử tiếp theo dùng hạt giống khác
+        if cells is not None and (best_length is None or len(cells) < best_length):
+            best_length = len(cells)
+            results.put((cells, None))
+    results.put((None, total_steps))  # Báo tiến trình đã kết thúc
+
+
+def _can_start_processes():
+    """Tiến trình daemon (ví dụ trong multiprocessing.Pool) không được tạo tiến trình con"""
+    return not multiprocessing.current_process().daemon
+
+
+def solve_local_search(tiles, size, heuristic_name=None, time_limit=5.0, workers=1, seed=None):
+    """
+    Tìm kiếm cục bộ đa khởi đầu
+
+    Lần thử đầu tiên là leo đồi tham lam giống solve_hill_climbing nên bàn dễ vẫn
+    được giải nhanh như trước. Sau đó các chiến lược chạy song song trên nhiều
+    tiến trình (hoặc lần lượt trong tiến trình hiện tại nếu chỉ có 1 worker).
+
+    Args:
+        tiles: Trạng thái ban đầu (danh sách 1D)
+        size: Kích thước bàn cờ
+        heuristic_name: Tên heuristic
+        time_limit: Hạn chót chung (giây)
+        workers: Số tiến trình con
+        seed: Hạt giống ngẫu nhiên (None để chọn ngẫu nhiên)
+
+    Returns:
+        tuple: (dãy vị trí ô trống của lời giải ngắn nhất tìm được hoặc None,
+        tổng số bước đã đi của lần thử nhanh và mọi chiến lược)
+    """
+    start_time = time.time()
+    deadline = start_time + time_limit
+    if seed is None:
+        seed = random.randrange(1 << 30)
+
+    # Thử nhanh: leo đồi ngẫu nhiên một lần
+    walker = _Walker(tiles, size, get_heuristic(heuristic_name, size), move_table(size), random.Random(seed))
+    cells = walker.run("restart", lambda: time.time() >= deadline)
+    best = remove_loops(tiles, size, cells) if cells is not None else None
+
+    if workers <= 1 or not _can_start_processes():
+        best, steps = _solve_sequential(tiles, size, heuristic_name, seed, deadline, best)
+    else:
+        best, steps = _solve_parallel(tiles, size, heuristic_name, seed, deadline, workers, best)
+    return best, walker.steps + steps
+
+
+def _solve_sequential(tiles, size, heuristic_name, seed, deadline, best):
+    """Chạy lần lượt các chiến lược trong tiến trình hiện tại, mỗi lượt một khoảng thời gian ngắn"""
+    round_index = 0
+    total_steps = 0
+    stop_at = None
+    while time.time() < deadline and (stop_at is None or time.time() < stop_at):
+        strategy = STRATEGIES[round_index % len(STRATEGIES)]
+        slice_deadline = min(deadline, time.time() + IMPROVE_GRACE)
+        if stop_at is not None:
+            slice_deadline = min(slice_deadline, stop_at)
+        cells, steps = run_strategy(tiles, size, heuristic_name, strategy, seed + round_index, slice_deadline)
+        total_steps += steps
+        if cells is not None:
+            if best is None or len(cells) < len(best):
+                best = cells
+        if best is not None and stop_at is None:
+            stop_at = time.time() + IMPROVE_GRACE
+        round_index += 1
+    return best, total_steps
+
+
+def _solve_parallel(tiles, size, heuristic_name, seed, deadline, workers, best):
+    """Chạy các chiến lược trên nhiều tiến trình, trả về (lời giải ngắn nhất, tổng số bước)"""
+    stop_event = _context.Event()
+    results = _context.Queue()
+    processes = []
+    for i in range(workers):
+        strategy = STRATEGIES[i % len(STRATEGIES)]
+        process = _context.Process(
+            target=_worker,
+            args=(list(tiles), size, heuristic_name, strategy, seed + i + 1, deadline, stop_event, results),
+            daemon=True
+        )
+        process.start()
+        processes.append(process)
+
+    # Khoảng chờ cải thiện tính từ lời giải đầu tiên: của lần leo đồi nhanh nếu đã có,
+    # không thì của các tiến trình con (khởi động tiến trình "spawn" mất một lúc)
+    stop_at = time.time() + IMPROVE_GRACE if best is not None else None
+    running = workers
+    total_steps = 0
+    try:
+        while running > 0:
+            now = time.time()
+            limit = deadline if stop_at is None else min(deadline, stop_at)
+            if now >= limit:
+                break
+            try:
+                cells, steps = results.get(timeout=min(limit - now, _POLL_INTERVAL))
+            except queue.Empty:
+                # Tiến trình con bị lỗi không gửi None: dừng khi không còn tiến trình nào chạy
+                if not any(process.is_alive() for process in processes):
+                    break
+                continue
+            if cells is None:
+                running -= 1
+                total_steps += steps
+                continue
+            if best is None or len(cells) < len(best):
+                best = cells
+            if stop_at is None:
+                stop_at = time.time() + IMPROVE_GRACE
+    finally:
+        stop_event.set()
+        # Chờ chung tối đa _JOIN_TIMEOUT giây, tiến trình chưa dừng (ví dụ còn đang khởi động) thì kết thúc luôn
+        join_deadline = time.time() + _JOIN_TIMEOUT
+        for process in processes:
+            process.join(timeout=max(0.0, join_deadline - time.time()))
+            if process.is_alive():
+                process.terminate()
+
+    # Số bước của các tiến trình đã dừng sau khi hết khoảng chờ (lời giải gửi muộn thì bỏ qua)
+    while True:
+        try:
+            cells, steps = results.get_nowait()
+        except queue.Empty:
+            break
+        if cells is None:
+            total_steps += steps
+
+    return best, total_steps
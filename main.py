@@ -1,10 +1,13 @@
-import pygame
 import sys
 from game import Game
-from ui import UI
 from constants import WIDTH, HEIGHT, FPS
 
 def main():
+    # pygame chỉ được import ở đây: với "spawn", tiến trình giải (solver_worker) import lại
+    # module này dưới tên __mp_main__ và không cần pygame
+    import pygame
+    from ui import UI
+
     # Khởi tạo pygame
     pygame.init()
     pygame.mixer.init()
@@ -41,6 +44,11 @@ def main():
         pygame.display.flip()
         clock.tick(FPS)
 
+    # Dừng tiến trình giải nếu bot vẫn đang tìm kiếm
+    game.cancel_bot()
+    game.solution_cache.close()
+    game.score_manager.close()
+
     pygame.quit()
     sys.exit()
 
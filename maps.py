@@ -90,7 +90,7 @@ def get_maps(size):
     Lấy danh sách các map cho kích thước bàn cờ
 
     Args:
-        size: Kích thước bàn cờ (3 hoặc 4)
+        size: Kích thước bàn cờ (n cho bàn n x n)
 
     Returns:
         list: Danh sách các map
@@ -108,7 +108,7 @@ def get_map_by_name(size, name):
     Lấy map theo tên
 
     Args:
-        size: Kích thước bàn cờ (3 hoặc 4)
+        size: Kích thước bàn cờ (n cho bàn n x n)
         name: Tên map
 
     Returns:
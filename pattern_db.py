@@ -0,0 +1,227 @@
+"""
+Pattern database (PDB) cộng tính cho bàn 4x4
+
+Các ô số được chia thành 3 nhóm rời nhau, mỗi nhóm 5 ô (phân hoạch 5-5-5).
+Với mỗi nhóm, bảng lưu số bước tối thiểu để đưa 5 ô đó về đúng chỗ, chỉ tính
+những nước đi di chuyển ô thuộc nhóm. Vì các nhóm không chung ô nào nên có thể
+cộng giá trị của 3 bảng mà vẫn không vượt quá số bước thật (heuristic chấp nhận
+được), mạnh hơn nhiều so với khoảng cách Manhattan.
+
+Chỉ số của một nhóm là vị trí của các ô trong nhóm, mỗi vị trí 4 bit
+(ô thứ i của nhóm nằm ở bit 4*i), nên mỗi bảng có 16^5 byte = 1 MB và tra cứu
+không cần tính hạng hoán vị.
+
+Tạo file một lần bằng lệnh:
+    python pattern_db.py
+File được ánh xạ bộ nhớ (mmap) khi bộ giải khởi động: không cần phân tích cú
+pháp và các tiến trình cùng đọc file sẽ dùng chung các trang bộ nhớ.
+"""
+import mmap
+import os
+import time
+from collections import deque
+from constants import DATA_DIRECTORY, PATTERN_DB_FILE
+from tables import neighbor_table
+
+# Phân hoạch 5-5-5 cho bàn 4x4
+PATTERNS_4X4 = (
+    (1, 5, 6, 9, 13),
+    (2, 3, 4, 7, 8),
+    (10, 11, 12, 14, 15),
+)
+
+BOARD_SIZE_4X4 = 4
+_MAGIC = b"PDB1"
+_HEADER_SIZE = 32
+_GROUP_BITS = 20  # 5 ô x 4 bit
+_GROUP_MASK = (1 << _GROUP_BITS) - 1
+_TABLE_SIZE = 1 << _GROUP_BITS
+
+# Bảng đã ánh xạ trong tiến trình hiện tại (dùng chung cho mọi bộ giải)
+_loaded = None
+
+
+def _build_group(pattern, size=BOARD_SIZE_4X4):
+    """
+    Tính bảng khoảng cách cho một nhóm ô bằng BFS 0-1 ngược từ trạng thái đích
+
+    Trạng thái BFS gồm vị trí các ô trong nhóm và vị trí ô trống. Di chuyển một
+    ô ngoài nhóm có chi phí 0, di chuyển ô trong nhóm có chi phí 1. Kết quả là
+    giá trị nhỏ nhất theo mọi vị trí ô trống.
+
+    Args:
+        pattern: Các ô thuộc nhóm
+        size: Kích thước bàn cờ
+
+    Returns:
+        bytearray: Bảng 16^k byte, chỉ số là vị trí các ô (4 bit mỗi ô)
+    """
+    k = len(pattern)
+    blank_shift = 4 * k
+    neighbors = neighbor_table(size)
+    unknown = 255
+
+    # Khoảng cách của trạng thái (vị trí các ô, vị trí ô trống)
+    distance = bytearray([unknown]) * (1 << (blank_shift + 4))
+    table = bytearray([unknown]) * (1 << blank_shift)
+
+    start = (size * size - 1) << blank_shift
+    for i, tile in enumerate(pattern):
+        start |= (tile - 1) << (4 * i)
+
+    distance[start] = 0
+    queue = deque([start])
+    mask = (1 << blank_shift) - 1
+    shifts = [4 * i for i in range(k)]
+
+    while queue:
+        state = queue.popleft()
+        d = distance[state]
+        tiles_key = state & mask
+        if d < table[tiles_key]:
+            table[tiles_key] = d
+
+        blank = state >> blank_shift
+        positions = [(tiles_key >> shift) & 15 for shift in shifts]
+
+        for cell in neighbors[blank]:
+            if cell in positions:
+                # Ô trong nhóm trượt vào ô trống: tốn 1 bước
+                shift = shifts[positions.index(cell)]
+                child = (cell << blank_shift) | (tiles_key - (cell << shift) + (blank << shift))
+                if distance[child] == unknown:
+                    distance[child] = d + 1
+                    queue.append(child)
+            else:
+                # Ô ngoài nhóm: không tính bước, xét trước (BFS 0-1)
+                child = (cell << blank_shift) | tiles_key
+                if distance[child] == unknown or distance[child] > d:
+                    distance[child] = d
+                    queue.appendleft(child)
+
+    return table
+
+
+def build_pattern_database(path=PATTERN_DB_FILE):
+    """
+    Tạo file pattern database cho bàn 4x4
+
+    Args:
+        path: Đường dẫn file kết quả
+
+    Returns:
+        str: Đường dẫn file đã ghi
+    """
+    directory = os.path.dirname(path) or DATA_DIRECTORY
+    os.makedirs(directory, exist_ok=True)
+
+    header = bytearray(_HEADER_SIZE)
+    header[:4] = _MAGIC
+    header[4] = len(PATTERNS_4X4)
+    offset = 5
+    for pattern in PATTERNS_4X4:
+        header[offset:offset + len(pattern)] = bytes(pattern)
+        offset += len(pattern)
+
+    # Ghi ra file tạm rồi đổi tên để tiến trình khác không đọc phải file dở dang
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(header)
+        for pattern in PATTERNS_4X4:
+            start_time = time.time()
+            f.write(_build_group(pattern))
+            print(f"Pattern {pattern} built in {time.time() - start_time:.1f} seconds")
+    os.replace(temp_path, path)
+
+    return path
+
+
+def load_pattern_database(path=PATTERN_DB_FILE):
+    """
+    Ánh xạ file pattern database vào bộ nhớ (chỉ thực hiện một lần mỗi tiến trình)
+
+    Returns:
+        mmap.mmap: Dữ liệu bảng, hoặc None nếu chưa có file hợp lệ
+    """
+    global _loaded
+    if _loaded is not None:
+        return _loaded
+
+    expected_size = _HEADER_SIZE + len(PATTERNS_4X4) * _TABLE_SIZE
+    try:
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError, OSError):
+        return None
+
+    if len(data) != expected_size or data[:4] != _MAGIC:
+        data.close()
+        return None
+
+    _loaded = data
+    return _loaded
+
+
+class PatternDatabaseHeuristic:
+    """Heuristic pattern database cộng tính 5-5-5 cho bàn 4x4"""
+
+    name = "pdb"
+
+    def __init__(self, data, size=BOARD_SIZE_4X4):
+        if size != BOARD_SIZE_4X4:
+            raise ValueError("Pattern database chỉ hỗ trợ bàn 4x4")
+
+        self.size = size
+        self.data = data
+        self.offsets = [_HEADER_SIZE + g * _TABLE_SIZE for g in range(len(PATTERNS_4X4))]
+
+        # Vị trí bit của mỗi ô trong khóa tổng hợp (khóa của các nhóm nối tiếp nhau)
+        self.shifts = [0] * (size * size)
+        self.groups = [0] * (size * size)
+        for g, pattern in enumerate(PATTERNS_4X4):
+            for i, tile in enumerate(pattern):
+                self.shifts[tile] = g * _GROUP_BITS + 4 * i
+                self.groups[tile] = g
+
+    def start(self, tiles):
+        """
+        Tính heuristic đầy đủ cho một trạng thái
+
+        Returns:
+            tuple: (giá trị heuristic, khóa tổng hợp vị trí các ô)
+        """
+        key = 0
+        for index, tile in enumerate(tiles):
+            if tile != 0:
+                key |= index << self.shifts[tile]
+        return self._value(key), key
+
+    def estimate(self, tiles):
+        """Tính giá trị heuristic của một trạng thái"""
+        return self.start(tiles)[0]
+
+    def move(self, h, key, tile, src, dst):
+        """Cập nhật heuristic khi ô tile trượt từ src sang dst (chỉ tra lại nhóm của ô đó)"""
+        shift = self.shifts[tile]
+        group_shift = self.groups[tile] * _GROUP_BITS
+        offset = self.offsets[self.groups[tile]]
+        new_key = key + ((dst - src) << shift)
+        h += (self.data[offset + ((new_key >> group_shift) & _GROUP_MASK)]
+              - self.data[offset + ((key >> group_shift) & _GROUP_MASK)])
+        return h, new_key
+
+    def group_tables(self):
+        """Bảng của từng nhóm (memoryview, theo thứ tự PATTERNS_4X4) cho tra cứu theo khối"""
+        view = memoryview(self.data)
+        return [view[offset:offset + _TABLE_SIZE] for offset in self.offsets]
+
+    def _value(self, key):
+        data = self.data
+        h = 0
+        for g, offset in enumerate(self.offsets):
+            h += data[offset + ((key >> (g * _GROUP_BITS)) & _GROUP_MASK)]
+        return h
+
+
+if __name__ == "__main__":
+    print(f"Building pattern database: {build_pattern_database()}")
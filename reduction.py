@@ -0,0 +1,181 @@
+"""
+Bộ giải rút gọn cho bàn cờ lớn (5x5 trở lên)
+
+Giải lần lượt hàng trên cùng rồi cột bên trái của vùng chưa giải, khóa các ô
+đã đúng chỗ, cho tới khi chỉ còn lõi 3x3 ở góc dưới phải. Lõi được giải tối ưu
+bằng bảng khoảng cách 3x3. Lời giải không tối ưu nhưng thời gian chạy chỉ tỉ lệ
+với số ô (bàn 10x10 mất vài chục mili giây).
+
+Hai ô cuối của một hàng (tương tự với cột) không thể đặt lần lượt, nên dùng
+cách quen thuộc: đưa ô của vị trí kế cuối vào góc, ô của vị trí cuối xuống ngay
+dưới góc, rồi xoay hai ô vào chỗ bằng hai nước đi.
+"""
+from collections import deque
+from distance_table import solve_with_table
+from local_search import remove_loops
+from tables import neighbor_table
+
+CORE_SIZE = 3
+
+
+class _ReductionBoard:
+    """Bàn cờ đang giải: vị trí từng ô, các ô đã khóa và dãy vị trí ô trống đã đi"""
+
+    def __init__(self, tiles, size):
+        self.size = size
+        self.tiles = list(tiles)
+        self.blank = self.tiles.index(0)
+        self.position = [0] * (size * size)
+        for index, tile in enumerate(self.tiles):
+            self.position[tile] = index
+        self.locked = [False] * (size * size)
+        self.cells = []
+
+        self.neighbors = neighbor_table(size)
+
+    def slide(self, cell):
+        """Đẩy ô ở vị trí cell (kề ô trống) vào ô trống"""
+        tile = self.tiles[cell]
+        self.tiles[self.blank] = tile
+        self.position[tile] = self.blank
+        self.tiles[cell] = 0
+        self.position[0] = cell
+        self.blank = cell
+        self.cells.append(cell)
+
+    def find_path(self, start, goal, blocked=-1):
+        """
+        Đường đi ngắn nhất qua các ô chưa khóa (BFS)
+
+        Returns:
+            list: Các ô từ sau start tới goal, hoặc None nếu không có đường
+        """
+        if start == goal:
+            return []
+        parent = {start: -1}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            for neighbor in self.neighbors[cell]:
+                if neighbor in parent or self.locked[neighbor] or neighbor == blocked:
+                    continue
+                parent[neighbor] = cell
+                if neighbor == goal:
+                    path = []
+                    while neighbor != start:
+                        path.append(neighbor)
+                        neighbor = parent[neighbor]
+                    return path[::-1]
+                queue.append(neighbor)
+        return None
+
+    def move_blank(self, target, avoid=-1):
+        """Đưa ô trống tới target mà không đi qua ô avoid"""
+        path = self.find_path(self.blank, target, avoid)
+        if path is None:
+            raise RuntimeError("blank cannot reach its target")
+        for cell in path:
+            self.slide(cell)
+
+    def move_tile(self, tile, target):
+        """Đưa một ô số tới target theo đường ngắn nhất, mỗi bước đưa ô trống tới trước nó"""
+        path = self.find_path(self.position[tile], target)
+        if path is None:
+            raise RuntimeError("tile cannot reach its target")
+        for cell in path:
+            self.move_blank(cell, self.position[tile])
+            self.slide(self.position[tile])
+
+    def place(self, tile, target):
+        """Đưa ô về target rồi khóa lại"""
+        self.move_tile(tile, target)
+        self.locked[target] = True
+
+    def place_pair(self, first, second, slot, corner, below, park):
+        """
+        Đặt hai ô cuối của một hàng hoặc cột
+
+        Args:
+            first: Ô số có đích là slot (vị trí kế cuối)
+            second: Ô số có đích là corner (vị trí cuối)
+            slot, corner: Hai vị trí cuối của hàng/cột
+            below: Vị trí kề corner, phía trong vùng chưa giải
+            park: Vị trí tạm cho second, đủ xa để không kẹt ô trống ở slot
+        """
+        if self.position[first] == slot and self.position[second] == corner:
+            self.locked[slot] = self.locked[corner] = True
+            return
+
+        # Cất second ra xa để không bị kẹt ở slot khi first đã khóa ở góc
+        self.place(second, park)
+        self.place(first, corner)
+        self.locked[park] = False
+        self.place(second, below)
+
+        # Xoay: ô trống ở slot, first sang slot, second lên góc
+        self.locked[below] = False
+        self.move_blank(slot, below)
+        self.slide(corner)
+        self.slide(below)
+        self.locked[slot] = self.locked[corner] = True
+
+
+def solve_reduction(tiles, size):
+    """
+    Giải bàn cờ bằng cách rút gọn từng hàng/cột về lõi 3x3
+
+    Args:
+        tiles: Trạng thái ban đầu (danh sách 1D)
+        size: Kích thước bàn cờ (từ 3 trở lên)
+
+    Returns:
+        tuple: (dãy vị trí ô trống của lời giải đã cắt vòng lặp, hoặc None nếu
+        bàn cờ không giải được; số nước đã trượt trước khi cắt vòng lặp)
+    """
+    board = _ReductionBoard(tiles, size)
+    top = left = 0
+
+    def cell(row, col):
+        return row * size + col
+
+    def goal_tile(row, col):
+        return row * size + col + 1
+
+    while size - top > CORE_SIZE or size - left > CORE_SIZE:
+        if size - top >= size - left:
+            # Hàng trên cùng của vùng chưa giải
+            row = top
+            for col in range(left, size - 2):
+                board.place(goal_tile(row, col), cell(row, col))
+            board.place_pair(goal_tile(row, size - 2), goal_tile(row, size - 1),
+                             cell(row, size - 2), cell(row, size - 1),
+                             cell(row + 1, size - 1), cell(row + 2, size - 2))
+            top += 1
+        else:
+            # Cột bên trái của vùng chưa giải
+            col = left
+            for row in range(top, size - 2):
+                board.place(goal_tile(row, col), cell(row, col))
+            board.place_pair(goal_tile(size - 2, col), goal_tile(size - 1, col),
+                             cell(size - 2, col), cell(size - 1, col),
+                             cell(size - 1, col + 1), cell(size - 2, col + 2))
+            left += 1
+
+    # Lõi 3x3: đánh số lại theo vị trí đích trong lõi rồi tra bảng khoảng cách
+    offset = size - CORE_SIZE
+    core = []
+    for row in range(offset, size):
+        for col in range(offset, size):
+            tile = board.tiles[cell(row, col)]
+            if tile != 0:
+                goal_row, goal_col = (tile - 1) // size, (tile - 1) % size
+                tile = (goal_row - offset) * CORE_SIZE + (goal_col - offset) + 1
+            core.append(tile)
+
+    core_moves = solve_with_table(core)
+    if core_moves is None:
+        return None, len(board.cells)
+    for row, col in core_moves:
+        board.slide(cell(row + offset, col + offset))
+
+    return remove_loops(tiles, size, board.cells), len(board.cells)
@@ -1,7 +1,54 @@
+"""
+Lưu và đọc điểm cao
+
+ScoreManager giữ một bản sao điểm trong bộ nhớ: file chỉ được đọc lần đầu và
+khi file bị sửa từ bên ngoài (mtime thay đổi, kiểm tra tối đa mỗi
+SCORES_REFRESH_INTERVAL giây), nên giao diện có thể gọi get_high_scores mỗi
+khung hình.
+
+Điểm được giữ trong leaderboard.LeaderboardSet: mỗi (kích thước, map, người
+giải) là một heap top-k, thêm điểm O(log k). Điểm không vào bảng nào bị bỏ
+ngay, không ghi ra đĩa; would_place/rank cho giao diện biết hạng dự kiến
+trong lúc chơi.
+
+Dữ liệu trên đĩa gồm hai phần:
+- scores.json: bản chụp, chỉ được thay bằng cách ghi file tạm rồi đổi tên
+  (không bao giờ bị ghi dở), kèm số thứ tự "_journal_seq" của điểm cuối đã gộp
+- scores.json.journal: mỗi điểm mới là một dòng JSON ghi nối vào cuối (O(1)
+  mỗi lượt, có fsync), mang số thứ tự tăng dần. Số thứ tự cũng được giữ trong
+  điểm ("seq") khi gộp vào bản chụp, để nhận ra từng lượt chơi (score_db.import_json)
+Khi đọc, các dòng journal có số thứ tự lớn hơn bản chụp được áp dụng lại lên
+bản chụp; dòng cuối bị ghi dở (mất điện giữa chừng) bị bỏ qua. Khi journal đủ
+SCORES_COMPACT_EVERY dòng (và khi close()), journal được gộp vào bản chụp mới
+rồi xóa trắng; nếu dừng giữa hai bước thì số thứ tự giúp không áp dụng trùng.
+
+Nhiều bản game có thể dùng chung thư mục data/ (file_lock.FileLock trên
+"scores.json.lock"):
+- ghi journal: trong khóa chỉ đọc số thứ tự cuối ở đuôi journal rồi ghi nối
+  (vài micro giây); mã hóa JSON làm trước, fsync làm sau khi nhả khóa
+- gộp journal: đọc bản chụp và journal trên đĩa (gồm điểm của mọi bản game),
+  ghi file tạm ngoài khóa; trong khóa chỉ đổi tên nếu chưa ai gộp trước
+- đọc: journal thêm dòng thì chỉ đọc phần mới, bản chụp bị thay thì đọc lại hết
+
+Ghi theo kiểu write-behind: save_score cập nhật bản sao rồi trả về ngay, một
+luồng nền ghi journal. Gọi flush() hoặc close() để chờ ghi xong.
+"""
+import atexit
 import json
 import os
+import threading
+import time
+from file_lock import FileLock, file_id, replace_file, write_temp
+from leaderboard import LeaderboardSet
 from utils import calculate_score, format_time
-from constants import DATA_DIRECTORY, SCORES_FILE, MAX_HIGH_SCORES, MAX_HIGH_SCORES_PER_MAP
+from constants import DATA_DIRECTORY, SCORES_BACKEND, SCORES_COMPACT_EVERY, SCORES_FILE, SCORES_REFRESH_INTERVAL
+
+# ScoreManager dùng chung trong tiến trình
+_shared_manager = None
+# Số byte cuối journal được đọc để lấy số thứ tự mới nhất khi ghi
+JOURNAL_TAIL_BYTES = 4096
+# Số lần thử gộp journal khi bản game khác thay bản chụp giữa chừng
+MAX_COMPACT_ATTEMPTS = 3
 
 def _get_current_date():
     """Lấy ngày giờ hiện tại dưới dạng chuỗi"""
@@ -9,50 +56,72 @@ def _get_current_date():
     return datetime.now().strftime("%Y-%m-%d %H:%M")
 
 
+def _default_scores():
+    return {
+        "3x3": {"random": [], "maps": {}},
+        "4x4": {"random": [], "maps": {}}
+    }
+
+
 class ScoreManager:
-    def __init__(self):
-        self.scores_file = SCORES_FILE
+    def __init__(self, scores_file=SCORES_FILE, write_behind=True):
+        """
+        Args:
+            scores_file: Đường dẫn file điểm (journal nằm cạnh, thêm đuôi ".journal")
+            write_behind: True để ghi file trong luồng nền, False để ghi ngay trong save_score
+        """
+        self.scores_file = scores_file
+        self.journal_file = scores_file + ".journal"
+        self.write_behind = write_behind
+
+        # Bản sao trong bộ nhớ (LeaderboardSet), file_id của các file lúc đọc và lần kiểm tra gần nhất
+        self._scores = None
+        self._mtime = None
+        self._checked_at = 0.0
+        # Vị trí đã đọc: file_id của bản chụp, số byte và số thứ tự mới nhất đã đọc của journal
+        self._snapshot_id = None
+        self._offset = 0
+        self._seq = 0
+        # Số thứ tự đã gộp vào bản chụp, số thứ tự cuối do tiến trình này ghi, và các
+        # số thứ tự của tiến trình này đã có trong bộ nhớ nhưng chưa đọc lại từ journal
+        self._compacted_seq = 0
+        self._written_seq = 0
+        self._applied = set()
+        # Trạng thái ghi nền (được bảo vệ bởi _condition)
+        self._condition = threading.Condition()
+        self._pending = []  # Các điểm chưa ghi ra journal: (dòng JSON chưa có số thứ tự, dict điểm)
+        self._compact_requested = False
+        self._writing = False
+        self._closed = False
+        self._writer = None
 
         # Tạo thư mục data nếu chưa tồn tại
-        os.makedirs(DATA_DIRECTORY, exist_ok=True)
+        os.makedirs(os.path.dirname(self.scores_file) or DATA_DIRECTORY, exist_ok=True)
 
         # Tạo file scores.json với cấu trúc mặc định nếu chưa tồn tại
+        # (trong khóa, để không ghi đè bản chụp mà bản game khác vừa tạo và gộp điểm)
         if not os.path.exists(self.scores_file):
-            default_scores = {
-                "3x3": {
-                    "random": [],  # Điểm cho map ngẫu nhiên
-                    "maps": {}  # Điểm cho các map cụ thể
-                },
-                "4x4": {
-                    "random": [],  # Điểm cho map ngẫu nhiên
-                    "maps": {}  # Điểm cho các map cụ thể
-                }
-            }
-            with open(self.scores_file, 'w') as f:
-                json.dump(default_scores, f)
-
-    def save_score(self, size, moves, time_elapsed, map_name=None, solver="player"):
+            with FileLock(self.scores_file):
+                if not os.path.exists(self.scores_file):
+                    replace_file(self.scores_file, json.dumps(_default_scores()))
+
+    def save_score(self, size, moves, time_elapsed, map_name=None, solver="player", min_moves=None):
         """
         Lưu điểm số mới
 
         Args:
-            size: Kích thước bàn cờ (3 hoặc 4)
+            size: Kích thước bàn cờ (n cho bàn n x n)
             moves: Số bước đi
             time_elapsed: Thời gian hoàn thành (giây)
             map_name: Tên map cụ thể (None nếu là map ngẫu nhiên)
-            solver: Người giải puzzle ("player", "bfs", hoặc "hill_climbing")
+            solver: Người giải puzzle ("player", "bfs", "hill_climbing", "local_search", "anytime" hoặc "optimal")
+            min_moves: Số bước tối thiểu thật của bàn đã chơi (None nếu chưa biết)
 
         Returns:
             dict: Thông tin điểm số vừa lưu
         """
         # Tính điểm
-        score = calculate_score(moves, time_elapsed, size)
-
-        # Đọc dữ liệu điểm hiện tại
-        scores = self._load_scores()
-
-        # Thêm điểm mới
-        key = f"{size}x{size}"
+        score = calculate_score(moves, time_elapsed, size, min_moves)
 
         new_score = {
             "moves": moves,
@@ -63,89 +132,63 @@ class ScoreManager:
             "solver": solver  # Thêm thông tin người/bot giải
         }
 
-        # Đảm bảo key tồn tại và có cấu trúc đúng
-        if key not in scores:
-            scores[key] = {
-                "random": [],
-                "maps": {}
-            }
-        # Đảm bảo cấu trúc dữ liệu là đúng
-        elif not isinstance(scores[key], dict):
-            scores[key] = {
-                "random": [],
-                "maps": {}
-            }
-        # Đảm bảo các khóa con tồn tại
-        else:
-            if "random" not in scores[key]:
-                scores[key]["random"] = []
-            if "maps" not in scores[key]:
-                scores[key]["maps"] = {}
-
-        if map_name is None:
-            # Map ngẫu nhiên
-            scores[key]["random"].append(new_score)
-            # Sắp xếp theo điểm cao đến thấp
-            scores[key]["random"] = sorted(scores[key]["random"], key=lambda x: x["score"], reverse=True)
-            # Chỉ giữ lại một số điểm cao nhất
-            scores[key]["random"] = scores[key]["random"][:MAX_HIGH_SCORES]
-        else:
-            # Map cụ thể
-            if map_name not in scores[key]["maps"]:
-                scores[key]["maps"][map_name] = []
+        with self._condition:
+            if not self._load_scores().add(size, new_score, map_name):
+                # Không vào bảng nào: không có gì để ghi
+                return new_score
+            # Số thứ tự được gán khi ghi (trong khóa file), ở đây chỉ mã hóa phần còn lại của dòng
+            self._pending.append((json.dumps({"size": size, "map": map_name, "score": new_score})[1:] + "\n",
+                                  new_score))
+            if self.write_behind:
+                self._start_writer()
+                self._condition.notify_all()
 
-            scores[key]["maps"][map_name].append(new_score)
-            # Sắp xếp theo điểm cao đến thấp
-            scores[key]["maps"][map_name] = sorted(scores[key]["maps"][map_name], key=lambda x: x["score"],
-                                                   reverse=True)
-            # Chỉ giữ lại một số điểm cao nhất cho mỗi map
-            scores[key]["maps"][map_name] = scores[key]["maps"][map_name][:MAX_HIGH_SCORES_PER_MAP]
-
-        # Lưu lại
-        self._save_scores(scores)
+        if not self.write_behind:
+            self.flush()
 
         return new_score
 
-    def get_high_scores(self, size, map_name=None):
+    def get_high_scores(self, size, map_name=None, solver=None):
         """
         Lấy danh sách điểm cao
 
         Args:
-            size: Kích thước bàn cờ (3 hoặc 4)
+            size: Kích thước bàn cờ (n cho bàn n x n)
             map_name: Tên map cụ thể (None nếu là map ngẫu nhiên)
+            solver: Chỉ lấy điểm của người/bot giải này (None cho bảng chung)
 
         Returns:
             list: Danh sách điểm cao
         """
-        scores = self._load_scores()
-        key = f"{size}x{size}"
+        with self._condition:
+            board = self._load_scores().get(size, map_name, solver)
+            return board.entries() if board is not None else []
 
-        if key not in scores:
-            return []
+    def would_place(self, size, score, map_name=None, solver=None):
+        """
+        Điểm này có vào bảng điểm cao nếu được lưu bây giờ không (O(1), không đọc file
+        trừ khi tới lượt kiểm tra mtime)
+        """
+        with self._condition:
+            return self._load_scores().would_place(size, score, map_name, solver)
 
-        # Kiểm tra xem có phải là dictionary không
-        if not isinstance(scores[key], dict):
-            return []
+    def rank(self, size, score, map_name=None, solver=None):
+        """
+        Hạng mà điểm này sẽ có trên bảng điểm cao nếu được lưu bây giờ
 
-        if map_name is None:
-            # Map ngẫu nhiên
-            if "random" not in scores[key]:
-                return []
-            return scores[key]["random"]
-        else:
-            # Map cụ thể
-            if "maps" not in scores[key]:
-                return []
-            if map_name not in scores[key]["maps"]:
-                return []
-            return scores[key]["maps"][map_name]
+        Returns:
+            int: Hạng (1 là cao nhất), hoặc None nếu không vào bảng
+        """
+        with self._condition:
+            board = self._load_scores().get(size, map_name, solver)
+            return board.rank(score) if board is not None else 1
 
     def get_best_score_for_map(self, size, map_name):
         """
         Lấy điểm cao nhất cho một map cụ thể
 
         Args:
-            size: Kích thước bàn cờ (3 hoặc 4)
+            size: Kích thước bàn cờ (n cho bàn n x n)
             map_name: Tên map
 
         Returns:
@@ -156,19 +199,308 @@ class ScoreManager:
             return high_scores[0]
         return None
 
+    def get_all_scores(self):
+        """Toàn bộ dữ liệu điểm (bản chụp cộng journal), dạng giống scores.json"""
+        with self._condition:
+            return json.loads(json.dumps(self._load_scores().to_dict()))
+
+    def flush(self):
+        """Ghi các điểm còn chờ vào journal và chờ tới khi ghi xong"""
+        if not self.write_behind:
+            self._write_pending()
+            return
+
+        with self._condition:
+            if self._pending or self._compact_requested:
+                self._start_writer()
+                self._condition.notify_all()
+            while self._pending or self._compact_requested or self._writing:
+                self._condition.wait()
+
+    def compact(self):
+        """Gộp journal vào bản chụp scores.json (ghi file tạm rồi đổi tên) và chờ xong"""
+        with self._condition:
+            self._compact_requested = True
+        self.flush()
+
+    def close(self):
+        """Ghi nốt các điểm, gộp journal và dừng luồng ghi nền"""
+        if self._pending or max(self._seq, self._written_seq) > self._compacted_seq:
+            self.compact()
+        else:
+            self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+
     def _load_scores(self):
-        """Đọc dữ liệu điểm từ file"""
+        """
+        Dữ liệu điểm trong bộ nhớ (đọc file lần đầu hoặc khi file bị sửa từ bên ngoài)
+
+        Journal chỉ đổi thì đọc tiếp từ chỗ đã đọc; bản chụp đổi (có bản game đã
+        gộp journal) thì đọc lại toàn bộ. Không đọc khi còn điểm đang chờ ghi, để
+        không mất hoặc áp dụng hai lần điểm vừa lưu.
+        """
+        now = time.monotonic()
+        if self._scores is not None and now - self._checked_at < SCORES_REFRESH_INTERVAL:
+            return self._scores
+        self._checked_at = now
+
+        mtime = self._file_mtime()
+        if self._scores is not None and (mtime == self._mtime or self._pending or self._writing):
+            return self._scores
+
+        if self._scores is None or mtime[0] != self._snapshot_id or (mtime[1] or (0, 0, 0))[2] < self._offset:
+            (self._scores, self._compacted_seq, self._seq,
+             self._offset, self._snapshot_id) = self._read_files()
+            self._applied = set()
+        else:
+            self._offset, self._seq = self._read_journal(self._scores, self._seq, self._offset, self._applied)
+        self._mtime = mtime
+        return self._scores
+
+    def _read_files(self):
+        """
+        Đọc bản chụp rồi áp dụng các dòng journal mới hơn
+
+        Nếu bản chụp bị thay trong lúc đọc journal (bản game khác vừa gộp) thì đọc lại.
+
+        Returns:
+            tuple: (LeaderboardSet, số thứ tự đã gộp trong bản chụp, số thứ tự mới nhất,
+            số byte đã đọc của journal, file_id của bản chụp)
+        """
+        for _ in range(3):
+            scores, snapshot_id = self._read_snapshot()
+            compacted_seq = scores.pop("_journal_seq", 0)
+            boards = LeaderboardSet.from_dict(scores)
+            offset, seq = self._read_journal(boards, compacted_seq, 0, set())
+            if file_id(self.scores_file) == snapshot_id:
+                break
+        return boards, compacted_seq, seq, offset, snapshot_id
+
+    def _read_snapshot(self):
+        """
+        Đọc bản chụp scores.json
+
+        Returns:
+            tuple: (dữ liệu điểm, file_id của bản chụp đã đọc)
+        """
+        while True:
+            snapshot_id = file_id(self.scores_file)
+            try:
+                with open(self.scores_file, 'r') as f:
+                    return json.load(f), snapshot_id
+            except FileNotFoundError:
+                return _default_scores(), snapshot_id
+            except json.JSONDecodeError:
+                # Bản chụp chỉ được thay bằng đổi tên nên không thể bị ghi dở; nếu vẫn hỏng
+                # (sửa tay) thì giữ lại một bản để không mất dữ liệu. Chỉ dời đi trong khóa
+                # và khi vẫn là đúng file đã đọc, để không dời bản chụp tốt vừa được gộp
+                with FileLock(self.scores_file):
+                    if file_id(self.scores_file) != snapshot_id:
+                        # Bản game khác vừa thay bản chụp: đọc lại
+                        continue
+                    backup = self.scores_file + ".corrupt"
+                    os.replace(self.scores_file, backup)
+                print(f"{self.scores_file} is not valid JSON, moved it to {backup}")
+                return _default_scores(), None
+
+    def _read_journal(self, boards, seq, offset, applied):
+        """
+        Áp dụng các dòng journal từ byte offset có số thứ tự lớn hơn seq
+
+        Dòng không đọc được (ghi dở khi mất điện) bị bỏ qua; phần cuối chưa hết dòng
+        (tiến trình khác đang ghi) để lần sau đọc. Các số thứ tự trong applied là điểm
+        của chính tiến trình này, đã có trong bộ nhớ nên chỉ bị bỏ khỏi applied.
+
+        Returns:
+            tuple: (byte đã đọc tới, số thứ tự mới nhất)
+        """
+        try:
+            with open(self.journal_file, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return 0, seq
+
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                entry = json.loads(line)
+                entry_seq = entry["seq"]
+            except (ValueError, KeyError, TypeError):
+                continue
+            if entry_seq <= seq:
+                continue
+            seq = entry_seq
+            if entry_seq in applied:
+                applied.discard(entry_seq)
+            elif "score" in entry:
+                boards.add(entry["size"], dict(entry["score"], seq=entry_seq), entry["map"])
+        return offset + end, seq
+
+    def _file_mtime(self):
+        """file_id của bản chụp và journal (None cho file chưa có)"""
+        return file_id(self.scores_file), file_id(self.journal_file)
+
+    def _write_pending(self):
+        """
+        Ghi các điểm đang chờ vào journal, gộp journal vào bản chụp khi đủ dòng hoặc khi được yêu cầu
+
+        Lấy dữ liệu khi giữ _condition, ghi file khi đã nhả khóa.
+        """
+        with self._condition:
+            pending = self._pending
+            self._pending = []
+            compact = self._compact_requested
+            self._compact_requested = False
+            self._writing = True
+
+        try:
+            if pending:
+                seqs = self._append([body for body, _ in pending])
+                with self._condition:
+                    self._applied.update(seqs)
+                    self._written_seq = seqs[-1]
+                    for (_, entry), seq in zip(pending, seqs):
+                        entry["seq"] = seq
+                compact = compact or seqs[-1] - self._compacted_seq >= SCORES_COMPACT_EVERY
+            if compact:
+                self._compact_files()
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    def _append(self, bodies):
+        """
+        Ghi nối các điểm vào journal
+
+        Trong khóa file chỉ đọc số thứ tự cuối ở đuôi journal và ghi một lần (vài
+        micro giây); mã hóa JSON làm trước, fsync làm sau khi nhả khóa.
+
+        Returns:
+            list: Số thứ tự đã gán cho các điểm
+        """
+        with open(self.journal_file, 'ab+') as f:
+            with FileLock(self.scores_file):
+                last_seq, torn = self._last_seq(f)
+                seqs = list(range(last_seq + 1, last_seq + 1 + len(bodies)))
+                data = "".join(f'{{"seq": {seq}, {body}' for seq, body in zip(seqs, bodies)).encode()
+                # Dòng cuối bị ghi dở (mất điện): bắt đầu dòng mới để không dính vào nó
+                f.write(b"\n" + data if torn else data)
+                f.flush()
+            os.fsync(f.fileno())
+        return seqs
+
+    def _last_seq(self, f):
+        """
+        Số thứ tự lớn nhất đã ghi (gọi khi giữ khóa file)
+
+        Thường chỉ đọc vài KB ở đuôi journal; journal rỗng thì lấy từ bản chụp.
+
+        Returns:
+            tuple: (số thứ tự, True nếu journal không kết thúc bằng xuống dòng)
+        """
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return self._snapshot_seq(), False
+
+        f.seek(max(0, size - JOURNAL_TAIL_BYTES))
+        tail = f.read()
+        torn = not tail.endswith(b"\n")
+        lines = tail.split(b"\n")
+        if size > JOURNAL_TAIL_BYTES:
+            # Dòng đầu của đoạn đuôi có thể bị cắt giữa chừng
+            lines = lines[1:]
+            if not any(lines):
+                f.seek(0)
+                lines = f.read().split(b"\n")
+        for line in reversed(lines):
+            try:
+                return json.loads(line)["seq"], torn
+            except (ValueError, KeyError, TypeError):
+                continue
+        return self._snapshot_seq(), torn
+
+    def _snapshot_seq(self):
+        """Số thứ tự đã gộp trong bản chụp trên đĩa (khi journal không có dòng nào đọc được)"""
         try:
             with open(self.scores_file, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            # Nếu file không tồn tại hoặc không đọc được, tạo mới
-            return {
-                "3x3": {"random": [], "maps": {}},
-                "4x4": {"random": [], "maps": {}}
-            }
-
-    def _save_scores(self, scores):
-        """Lưu dữ liệu điểm vào file"""
-        with open(self.scores_file, 'w') as f:
-            json.dump(scores, f, indent=2)
\ No newline at end of file
+                return json.load(f).get("_journal_seq", 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _compact_files(self):
+        """
+        Gộp journal vào bản chụp mới
+
+        Gộp từ dữ liệu trên đĩa (không phải bản sao trong bộ nhớ, có thể thiếu điểm
+        của bản game khác), ghi file tạm ngoài khóa; trong khóa chỉ kiểm tra bản chụp
+        chưa bị bản game khác thay rồi đổi tên. Journal chỉ bị xóa trắng khi không ai
+        ghi thêm từ lúc đọc; dòng đã gộp còn sót lại bị bỏ qua nhờ số thứ tự.
+        """
+        for _ in range(MAX_COMPACT_ATTEMPTS):
+            boards, compacted_seq, seq, offset, snapshot_id = self._read_files()
+            marker = f'{{"seq": {seq}}}\n'.encode()
+            if seq == compacted_seq and offset <= len(marker):
+                # Đã gộp hết và journal chỉ còn dòng đánh dấu
+                return
+            temp_path = write_temp(self.scores_file,
+                                   json.dumps(dict(boards.to_dict(), _journal_seq=seq), indent=2))
+
+            with FileLock(self.scores_file):
+                replaced = file_id(self.scores_file) == snapshot_id
+                if replaced:
+                    os.replace(temp_path, self.scores_file)
+                    with open(self.journal_file, 'ab+') as f:
+                        if f.seek(0, os.SEEK_END) == offset:
+                            # Giữ số thứ tự cuối ở đầu journal để lần ghi sau không phải đọc bản chụp
+                            f.truncate(0)
+                            f.write(marker)
+            if replaced:
+                with self._condition:
+                    self._compacted_seq = max(self._compacted_seq, seq)
+                return
+            # Bản game khác vừa gộp (có thể chưa có các dòng mới hơn): đọc lại và gộp tiếp
+            os.remove(temp_path)
+
+    def _start_writer(self):
+        """Tạo luồng ghi nền nếu chưa có (gọi khi giữ _condition)"""
+        if self._writer is None:
+            self._closed = False
+            self._writer = threading.Thread(target=self._write_loop, name="score-writer", daemon=True)
+            self._writer.start()
+
+    def _write_loop(self):
+        """Luồng ghi nền: mỗi lần thức dậy ghi mọi dòng đang chờ (gộp các lần lưu liên tiếp)"""
+        while True:
+            with self._condition:
+                while not self._pending and not self._compact_requested and not self._closed:
+                    self._condition.wait()
+                if not self._pending and not self._compact_requested:
+                    return
+            try:
+                self._write_pending()
+            except OSError as e:
+                print(f"Could not save scores: {e}")
+
+
+def get_score_manager():
+    """
+    ScoreManager dùng chung trong tiến trình (tạo khi cần, ghi nốt điểm khi thoát)
+
+    Khi SCORES_BACKEND là "sqlite" thì trả về score_db.SQLiteScoreStore (cùng giao diện).
+    """
+    global _shared_manager
+    if _shared_manager is None:
+        if SCORES_BACKEND == "sqlite":
+            from score_db import SQLiteScoreStore
+            _shared_manager = SQLiteScoreStore()
+        else:
+            _shared_manager = ScoreManager()
+        atexit.register(_shared_manager.close)
+    return _shared_manager
@@ -0,0 +1,403 @@
+"""
+Lưu điểm bằng SQLite (tùy chọn, thư viện chuẩn sqlite3)
+
+Khác với scores.json chỉ giữ top 10/5, mỗi lượt chơi hoàn thành là một dòng
+của bảng scores nên không mất lịch sử. Các truy vấn bảng xếp hạng dùng chỉ mục:
+- scores_by_map (size, map, score): top-k theo bàn/map
+- scores_by_map_solver (size, map, solver, score): top-k theo bàn/map của một
+  người/bot giải (scores_by_map vẫn cần: solver đứng trước score nên chỉ mục
+  này không cho top-k theo map mà không phải sắp xếp)
+- scores_by_solver (size, solver, score): top-k theo người/bot giải
+- scores_by_date (size, date): lọc theo khoảng ngày
+Bảng score_counts (số lượt theo size, map, solver, điểm) được trigger cập nhật
+khi thêm/xóa dòng, nên truy vấn phân vị và thống kê theo người giải chỉ đọc vài
+nghìn mức điểm thay vì đếm hàng triệu dòng.
+
+Bật bằng SCORES_BACKEND = "sqlite" trong constants.py (ScoreManager dùng chung
+sẽ là SQLiteScoreStore, cùng giao diện save_score/get_high_scores). Chuyển dữ
+liệu cũ bằng lệnh (chạy lại thì chỉ nhập các lượt mới):
+    python score_db.py import data/scores.json
+Các lệnh khác:
+    python score_db.py top --size 3 --solver player -n 20
+    python score_db.py percentile --size 4 --score 9200
+    python score_db.py solvers --size 3
+"""
+import argparse
+import json
+import os
+import sqlite3
+import time
+from constants import (DATA_DIRECTORY, MAX_HIGH_SCORES, MAX_HIGH_SCORES_PER_MAP, SCORES_DB_FILE,
+                       SCORES_FILE, SCORES_REFRESH_INTERVAL)
+from score import ScoreManager
+from utils import calculate_score, format_time
+
+# Giá trị cột map của bàn ngẫu nhiên, và tham số map_name nghĩa là "mọi map"
+RANDOM_MAP = ""
+ALL_MAPS = "*"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    size INTEGER NOT NULL,
+    map TEXT NOT NULL,
+    solver TEXT NOT NULL,
+    moves INTEGER NOT NULL,
+    time REAL NOT NULL,
+    score INTEGER NOT NULL,
+    min_moves INTEGER,
+    date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_map ON scores (size, map, score DESC);
+CREATE INDEX IF NOT EXISTS scores_by_map_solver ON scores (size, map, solver, score DESC);
+CREATE INDEX IF NOT EXISTS scores_by_solver ON scores (size, solver, score DESC);
+CREATE INDEX IF NOT EXISTS scores_by_date ON scores (size, date);
+
+CREATE TABLE IF NOT EXISTS score_counts (
+    size INTEGER NOT NULL,
+    map TEXT NOT NULL,
+    solver TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (size, map, solver, score)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS score_counts_insert AFTER INSERT ON scores BEGIN
+    INSERT INTO score_counts VALUES (NEW.size, NEW.map, NEW.solver, NEW.score, 1)
+    ON CONFLICT (size, map, solver, score) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS score_counts_delete AFTER DELETE ON scores BEGIN
+    UPDATE score_counts SET count = count - 1
+    WHERE size = OLD.size AND map = OLD.map AND solver = OLD.solver AND score = OLD.score;
+    DELETE FROM score_counts
+    WHERE size = OLD.size AND map = OLD.map AND solver = OLD.solver AND score = OLD.score AND count <= 0;
+END;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_COLUMNS = "moves, time, score, date, solver, map"
+
+
+def _map_value(map_name):
+    return RANDOM_MAP if map_name is None else map_name
+
+
+def _leaderboard_limit(map_name):
+    return MAX_HIGH_SCORES if map_name is None else MAX_HIGH_SCORES_PER_MAP
+
+
+def _row_to_score(row):
+    """Dòng (moves, time, score, date, solver, map) -> dict cùng dạng với scores.json"""
+    moves, elapsed, score, date, solver, map_name = row
+    return {
+        "moves": moves,
+        "time": int(elapsed),
+        "time_formatted": format_time(elapsed),
+        "score": score,
+        "date": date,
+        "solver": solver,
+        "map": map_name or None,
+    }
+
+
+class SQLiteScoreStore:
+    """Lưu mọi lượt chơi vào SQLite, cùng giao diện với score.ScoreManager"""
+
+    def __init__(self, path=SCORES_DB_FILE):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or DATA_DIRECTORY, exist_ok=True)
+        self._connection = sqlite3.connect(path)
+        # WAL + synchronous=NORMAL: mỗi lần commit không cần fsync, không chặn khung hình
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._connection.commit()
+
+        # Bảng xếp hạng đã truy vấn, xóa khi có dòng mới (của tiến trình này hoặc tiến trình khác)
+        self._leaderboards = {}
+        self._data_version = None
+        self._checked_at = 0.0
+
+    def save_score(self, size, moves, time_elapsed, map_name=None, solver="player", min_moves=None):
+        """
+        Lưu một lượt chơi (giống ScoreManager.save_score nhưng không bỏ lượt nào)
+
+        Returns:
+            dict: Thông tin điểm số vừa lưu
+        """
+        score = calculate_score(moves, time_elapsed, size, min_moves)
+        date = time.strftime("%Y-%m-%d %H:%M")
+        with self._connection:
+            self._connection.execute(
+                "INSERT INTO scores (size, map, solver, moves, time, score, min_moves, date) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (size, _map_value(map_name), solver, moves, time_elapsed, score, min_moves, date))
+        self._leaderboards.clear()
+        return _row_to_score((moves, time_elapsed, score, date, solver, _map_value(map_name)))
+
+    def get_high_scores(self, size, map_name=None, solver=None):
+        """
+        Bảng điểm cao như ScoreManager (MAX_HIGH_SCORES cho bàn ngẫu nhiên,
+        MAX_HIGH_SCORES_PER_MAP cho mỗi map), được giữ trong bộ nhớ giữa các khung hình
+        """
+        self._refresh()
+        key = (size, map_name, solver)
+        if key not in self._leaderboards:
+            self._leaderboards[key] = self.top_scores(size, map_name, solver, limit=_leaderboard_limit(map_name))
+        return self._leaderboards[key]
+
+    def would_place(self, size, score, map_name=None, solver=None):
+        """Điểm này có vào bảng điểm cao nếu được lưu bây giờ không (so với bảng đã giữ trong bộ nhớ)"""
+        high_scores = self.get_high_scores(size, map_name, solver)
+        return len(high_scores) < _leaderboard_limit(map_name) or score > high_scores[-1]["score"]
+
+    def rank(self, size, score, map_name=None, solver=None):
+        """
+        Hạng mà điểm này sẽ có trên bảng điểm cao nếu được lưu bây giờ
+
+        Returns:
+            int: Hạng (1 là cao nhất), hoặc None nếu không vào bảng
+        """
+        if not self.would_place(size, score, map_name, solver):
+            return None
+        return 1 + sum(1 for entry in self.get_high_scores(size, map_name, solver) if entry["score"] >= score)
+
+    def get_best_score_for_map(self, size, map_name):
+        """Điểm cao nhất của một map, hoặc None nếu chưa có"""
+        high_scores = self.get_high_scores(size, map_name)
+        return high_scores[0] if high_scores else None
+
+    def top_scores(self, size, map_name=None, solver=None, since=None, until=None, limit=10):
+        """
+        Các lượt chơi điểm cao nhất
+
+        Args:
+            size: Kích thước bàn cờ
+            map_name: Tên map, None là bàn ngẫu nhiên, ALL_MAPS là mọi map
+            solver: Chỉ lấy lượt của người/bot giải này (None là tất cả)
+            since: Ngày bắt đầu (chuỗi "YYYY-MM-DD" hoặc "YYYY-MM-DD HH:MM", tính cả ngày này)
+            until: Ngày kết thúc (không tính), cùng định dạng
+            limit: Số lượt tối đa
+
+        Returns:
+            list: Các dict điểm, điểm cao trước
+        """
+        where, params = self._filters(size, map_name, solver)
+        if since is not None:
+            where.append("date >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("date < ?")
+            params.append(until)
+        rows = self._connection.execute(
+            f"SELECT {_COLUMNS} FROM scores WHERE {' AND '.join(where)} ORDER BY score DESC, id LIMIT ?",
+            params + [limit])
+        return [_row_to_score(row) for row in rows]
+
+    def percentile(self, size, score, map_name=None, solver=None):
+        """
+        Phần trăm lượt chơi có điểm thấp hơn score (tra bảng score_counts)
+
+        Returns:
+            float: Từ 0 đến 100, hoặc None nếu chưa có lượt chơi nào
+        """
+        where, params = self._filters(size, map_name, solver)
+        total, lower = self._connection.execute(
+            f"SELECT SUM(count), SUM(CASE WHEN score < ? THEN count ELSE 0 END) "
+            f"FROM score_counts WHERE {' AND '.join(where)}", [score] + params).fetchone()
+        if not total:
+            return None
+        return 100.0 * lower / total
+
+    def score_at_percentile(self, size, percent, map_name=None, solver=None):
+        """
+        Điểm nhỏ nhất mà ít nhất percent phần trăm lượt chơi không vượt quá
+
+        Returns:
+            int: Điểm, hoặc None nếu chưa có lượt chơi nào
+        """
+        where, params = self._filters(size, map_name, solver)
+        rows = self._connection.execute(
+            f"SELECT score, SUM(count) FROM score_counts WHERE {' AND '.join(where)} "
+            f"GROUP BY score ORDER BY score", params).fetchall()
+        total = sum(count for _, count in rows)
+        if not total:
+            return None
+        needed = percent / 100.0 * total
+        seen = 0
+        for score, count in rows:
+            seen += count
+            if seen >= needed:
+                return score
+        return rows[-1][0]
+
+    def solver_summary(self, size, map_name=ALL_MAPS):
+        """
+        Thống kê theo người/bot giải (tra bảng score_counts)
+
+        Returns:
+            list: Mỗi phần tử {"solver", "games", "best", "average"}, nhiều lượt trước
+        """
+        where, params = self._filters(size, map_name, None)
+        rows = self._connection.execute(
+            f"SELECT solver, SUM(count), MAX(score), SUM(score * count) FROM score_counts "
+            f"WHERE {' AND '.join(where)} GROUP BY solver ORDER BY SUM(count) DESC", params)
+        return [{"solver": solver, "games": games, "best": best, "average": round(total / games, 1)}
+                for solver, games, best, total in rows]
+
+    def import_json(self, path=SCORES_FILE, force=False):
+        """
+        Chuyển điểm từ scores.json (cả journal) sang cơ sở dữ liệu
+
+        Điểm có số thứ tự journal ("seq") là một lượt chơi xác định: chỉ nhập các
+        lượt có số thứ tự lớn hơn lần nhập trước của cùng file (ghi trong bảng meta),
+        nên gọi lại sau khi chơi thêm chỉ nhập các lượt mới. Điểm cũ không có số thứ
+        tự chỉ được nhập ở lần đầu. Một lượt có mặt ở cả bảng chung và bảng của
+        người giải chỉ được nhập một lần, còn các lượt giống hệt nhau trong cùng một
+        bảng là những lượt chơi khác nhau nên đều được nhập.
+
+        Args:
+            path: Đường dẫn scores.json
+            force: Nhập lại tất cả, kể cả các lượt đã nhập
+
+        Returns:
+            int: Số lượt chơi đã nhập
+        """
+        key = "imported:" + os.path.abspath(path)
+        imported = self._connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        last_seq = None
+        if imported is not None and not force:
+            if not imported[0].isdigit():
+                # Nhập bởi phiên bản cũ (giá trị là ngày giờ, không có số thứ tự): đã nhập hết
+                return 0
+            last_seq = int(imported[0])
+
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        # Đọc qua ScoreManager để có cả các điểm còn nằm trong journal
+        data = ScoreManager(path, write_behind=False).get_all_scores()
+
+        rows = []
+        newest_seq = last_seq or 0
+        for board_key, groups in data.items():
+            if not isinstance(groups, dict):
+                continue
+            size = int(board_key.split("x")[0])
+            # Bảng chung và bảng của từng người giải có chung nhiều lượt
+            sequenced = {}
+            unsequenced = {}
+            for group in [groups] + list(groups.get("solvers", {}).values()):
+                entries = [(RANDOM_MAP, score) for score in group.get("random", [])]
+                for map_name, map_scores in group.get("maps", {}).items():
+                    entries.extend((map_name, score) for score in map_scores)
+                counts = {}
+                for map_name, score in entries:
+                    row = (size, map_name, score.get("solver", "player"), score["moves"], score["time"],
+                           score["score"], score.get("date", ""))
+                    seq = score.get("seq")
+                    if seq is None:
+                        counts[row] = counts.get(row, 0) + 1
+                    else:
+                        sequenced[seq] = row
+                # Không có số thứ tự: mỗi lượt có mặt trong nhiều bảng nhất là số lần xuất hiện ở một bảng
+                for row, count in counts.items():
+                    unsequenced[row] = max(unsequenced.get(row, 0), count)
+
+            if last_seq is None:
+                for row, count in unsequenced.items():
+                    rows.extend([row] * count)
+            for seq in sorted(sequenced):
+                if last_seq is None or seq > last_seq:
+                    rows.append(sequenced[seq])
+                newest_seq = max(newest_seq, seq)
+
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO scores (size, map, solver, moves, time, score, date) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows)
+            self._connection.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(newest_seq)))
+        self._leaderboards.clear()
+        return len(rows)
+
+    def flush(self):
+        """Mỗi lần lưu đã được commit ngay, không có gì phải chờ"""
+
+    def close(self):
+        """Đóng kết nối"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _filters(self, size, map_name, solver):
+        """Điều kiện WHERE chung (danh sách điều kiện, danh sách tham số)"""
+        where, params = ["size = ?"], [size]
+        if map_name != ALL_MAPS:
+            where.append("map = ?")
+            params.append(_map_value(map_name))
+        if solver is not None:
+            where.append("solver = ?")
+            params.append(solver)
+        return where, params
+
+    def _refresh(self):
+        """Xóa bảng xếp hạng đã nhớ nếu tiến trình khác đã ghi (kiểm tra tối đa mỗi SCORES_REFRESH_INTERVAL giây)"""
+        now = time.monotonic()
+        if now - self._checked_at < SCORES_REFRESH_INTERVAL:
+            return
+        self._checked_at = now
+        version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            self._data_version = version
+            self._leaderboards.clear()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SQLite score storage")
+    parser.add_argument("--db", default=SCORES_DB_FILE, help=f"database file (default: {SCORES_DB_FILE})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="import the games of a scores.json not imported yet")
+    import_parser.add_argument("path", nargs="?", default=SCORES_FILE)
+    import_parser.add_argument("--force", action="store_true", help="import every game again, even if already imported")
+
+    top_parser = commands.add_parser("top", help="print the best games")
+    top_parser.add_argument("--size", type=int, required=True)
+    top_parser.add_argument("--map", default=None, help=f"map name ('{ALL_MAPS}' for every map, default: random boards)")
+    top_parser.add_argument("--solver", default=None)
+    top_parser.add_argument("--since", default=None, help="first date, YYYY-MM-DD")
+    top_parser.add_argument("--until", default=None, help="end date (exclusive), YYYY-MM-DD")
+    top_parser.add_argument("-n", type=int, default=10)
+
+    percentile_parser = commands.add_parser("percentile", help="percentage of games below a score")
+    percentile_parser.add_argument("--size", type=int, required=True)
+    percentile_parser.add_argument("--score", type=int, required=True)
+    percentile_parser.add_argument("--map", default=None)
+    percentile_parser.add_argument("--solver", default=None)
+
+    solvers_parser = commands.add_parser("solvers", help="games, best and average score per solver")
+    solvers_parser.add_argument("--size", type=int, required=True)
+
+    args = parser.parse_args(argv)
+    store = SQLiteScoreStore(args.db)
+    try:
+        if args.command == "import":
+            count = store.import_json(args.path, args.force)
+            print(f"Imported {count} scores from {args.path}" if count else f"No new scores in {args.path}")
+        elif args.command == "top":
+            for score in store.top_scores(args.size, args.map, args.solver, args.since, args.until, args.n):
+                print(json.dumps(score))
+        elif args.command == "percentile":
+            value = store.percentile(args.size, args.score, args.map, args.solver)
+            print("no games yet" if value is None else f"{value:.1f}% of games scored below {args.score}")
+        else:
+            for summary in store.solver_summary(args.size):
+                print(json.dumps(summary))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
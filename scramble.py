@@ -0,0 +1,273 @@
+"""
+Sinh bàn cờ giải được (không import pygame)
+
+- random_board: hoán vị ngẫu nhiên, sửa tính chẵn lẻ trong O(số ô) bằng cách
+  đếm chu trình thay cho đếm nghịch thế O(n^2) rồi thử lại
+- random_walk: trộn bằng bước đi ngẫu nhiên từ trạng thái đích
+- scramble_to_distance: bàn có số bước tối thiểu đúng bằng (hoặc nằm trong
+  khoảng) giá trị cho trước; 3x3 chọn đều trong bảng khoảng cách, 4x4 trộn rồi
+  đo bằng bộ giải tối ưu
+- generate_boards: sinh hàng loạt (theo khối bằng NumPy nếu có cài)
+
+Quy tắc giải được (đích là 1..n*n-1 rồi ô trống): xem bàn cờ là hoán vị của
+các vị trí đích (ô trống có đích là ô cuối), bàn cờ giải được khi và chỉ khi
+tính chẵn lẻ của hoán vị bằng tính chẵn lẻ khoảng cách Manhattan từ ô trống
+tới góc dưới bên phải. Đổi chỗ hai ô số đổi tính chẵn lẻ của hoán vị mà
+không di chuyển ô trống.
+
+Ví dụ (ghi mỗi dòng một bàn, cùng định dạng đầu vào của batch_solve.py):
+    python scramble.py --size 4 --count 1000000 -o boards.jsonl
+    python scramble.py --size 3 --count 100 --distance 20
+    python scramble.py --size 4 --count 10 --distance 30-35
+"""
+import argparse
+import contextlib
+import os
+import random
+import sys
+from bot import BoardSnapshot, BotSolver
+from constants import MAX_OPTIMAL_SIZE
+from distance_table import get_distance, index_state, states_at_distance
+from tables import move_table
+
+try:
+    import numpy as np
+except ImportError:  # NumPy là phụ thuộc tùy chọn (chỉ để sinh hàng loạt nhanh hơn)
+    np = None
+
+# Số bàn mỗi khối khi sinh hàng loạt bằng NumPy
+BATCH_SIZE = 65536
+# Số lần trộn tối đa khi tìm bàn 4x4 theo số bước tối thiểu
+MAX_SCRAMBLE_ATTEMPTS = 200
+
+
+def permutation_parity(tiles, size):
+    """
+    Tính chẵn lẻ của hoán vị các vị trí đích bằng cách đếm chu trình (O(số ô))
+
+    Returns:
+        int: 0 nếu hoán vị chẵn, 1 nếu lẻ
+    """
+    cells = size * size
+    seen = [False] * cells
+    cycles = 0
+    for start in range(cells):
+        if seen[start]:
+            continue
+        cycles += 1
+        index = start
+        while not seen[index]:
+            seen[index] = True
+            tile = tiles[index]
+            index = tile - 1 if tile else cells - 1
+    return (cells - cycles) % 2
+
+
+def is_solvable(tiles, size):
+    """Kiểm tra bàn cờ giải được trong O(số ô) (cùng kết quả với utils.is_solvable)"""
+    blank = tiles.index(0)
+    blank_distance = (size - 1 - blank // size) + (size - 1 - blank % size)
+    return permutation_parity(tiles, size) == blank_distance % 2
+
+
+def fix_parity(tiles, size):
+    """Làm bàn cờ giải được bằng cách đổi chỗ hai ô số đầu tiên nếu cần (sửa tại chỗ)"""
+    if not is_solvable(tiles, size):
+        first, second = [index for index, tile in enumerate(tiles[:3]) if tile != 0][:2]
+        tiles[first], tiles[second] = tiles[second], tiles[first]
+    return tiles
+
+
+def random_board(size, rng=None):
+    """
+    Hoán vị ngẫu nhiên giải được (phân bố đều trên các trạng thái giải được)
+
+    Args:
+        size: Kích thước bàn cờ
+        rng: random.Random (None để dùng module random)
+
+    Returns:
+        list: Danh sách 1D các ô
+    """
+    rng = rng or random
+    tiles = list(range(size * size))
+    rng.shuffle(tiles)
+    return fix_parity(tiles, size)
+
+
+def random_walk(size, length, rng=None):
+    """
+    Trộn bàn cờ đã giải bằng length bước đi ngẫu nhiên (không quay ngược)
+
+    Số bước tối thiểu của kết quả không vượt quá length và cùng tính chẵn lẻ với length.
+
+    Returns:
+        list: Danh sách 1D các ô
+    """
+    rng = rng or random
+    moves = move_table(size)
+    tiles = list(range(1, size * size)) + [0]
+    blank = size * size - 1
+    previous = -1
+    for _ in range(length):
+        cell = rng.choice(moves[blank][previous])
+        tiles[blank], tiles[cell] = tiles[cell], 0
+        previous, blank = blank, cell
+    return tiles
+
+
+def optimal_distance(tiles, size):
+    """
+    Số bước tối thiểu của bàn cờ (bảng khoảng cách cho 3x3, bộ giải tối ưu tới MAX_OPTIMAL_SIZE)
+
+    Returns:
+        int: Số bước tối thiểu, hoặc None nếu không giải được
+    """
+    if size == 3:
+        return get_distance(tiles)
+    if size > MAX_OPTIMAL_SIZE:
+        raise ValueError(f"optimal distance is only available up to {MAX_OPTIMAL_SIZE}x{MAX_OPTIMAL_SIZE}")
+    if not is_solvable(tiles, size):
+        return None
+
+    solver = BotSolver(BoardSnapshot([tiles[row * size:(row + 1) * size] for row in range(size)]))
+    solver.stats_file = None
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return len(solver.solve("optimal"))
+
+
+def scramble_to_distance(size, low, high=None, rng=None):
+    """
+    Sinh bàn cờ có số bước tối thiểu trong khoảng [low, high]
+
+    Bàn 3x3: chọn đều trong mọi trạng thái của khoảng (theo bảng khoảng cách).
+    Bàn 4x4: trộn ngẫu nhiên rồi đo bằng IDA*, tăng/giảm độ dài trộn tới khi
+    trúng khoảng (số bước càng lớn thì mỗi lần đo càng chậm).
+
+    Args:
+        size: Kích thước bàn cờ (tối đa MAX_OPTIMAL_SIZE)
+        low: Số bước tối thiểu nhỏ nhất
+        high: Số bước tối thiểu lớn nhất (None là đúng bằng low)
+        rng: random.Random (None để dùng module random)
+
+    Returns:
+        tuple: (danh sách 1D các ô, số bước tối thiểu)
+    """
+    rng = rng or random
+    high = low if high is None else high
+    if low > high or low < 0:
+        raise ValueError(f"invalid distance range {low}-{high}")
+
+    if size == 3:
+        counts = [len(states_at_distance(distance)) for distance in range(low, high + 1)]
+        if not any(counts):
+            raise ValueError(f"no 3x3 board has an optimal distance in {low}-{high}")
+        distance = rng.choices(range(low, high + 1), weights=counts)[0]
+        return index_state(rng.choice(states_at_distance(distance))), distance
+
+    if size > MAX_OPTIMAL_SIZE:
+        raise ValueError(f"distance targeting is only available up to {MAX_OPTIMAL_SIZE}x{MAX_OPTIMAL_SIZE}")
+
+    # Trộn length bước cho số bước tối thiểu <= length, cùng tính chẵn lẻ
+    length = high
+    for _ in range(MAX_SCRAMBLE_ATTEMPTS):
+        tiles = random_walk(size, length, rng)
+        distance = optimal_distance(tiles, size)
+        if low <= distance <= high:
+            return tiles, distance
+        length = length + 2 if distance < low else max(high, length - 2)
+    raise ValueError(f"could not reach an optimal distance in {low}-{high} "
+                     f"after {MAX_SCRAMBLE_ATTEMPTS} scrambles")
+
+
+def generate_boards(size, count, rng=None):
+    """
+    Sinh count bàn cờ ngẫu nhiên giải được, từng bàn một (thuần Python)
+
+    Yields:
+        list: Danh sách 1D các ô
+    """
+    rng = rng or random
+    for _ in range(count):
+        yield random_board(size, rng)
+
+
+def generate_batch(size, count, seed=None):
+    """
+    Sinh count bàn cờ ngẫu nhiên giải được theo khối (cần NumPy)
+
+    Tính chẵn lẻ của cả khối được tính bằng đếm nghịch thế trên mảng (số ô
+    lần phép so sánh theo cột), sau đó đổi chỗ hai ô số ở các hàng sai tính
+    chẵn lẻ, giống fix_parity.
+
+    Returns:
+        numpy.ndarray: Ma trận (count, size * size) kiểu uint8 (uint16 cho bàn lớn hơn 15x15)
+    """
+    if np is None:
+        raise RuntimeError("NumPy is required for batch generation (pip install numpy)")
+    cells = size * size
+    rng = np.random.default_rng(seed)
+    dtype = np.uint8 if cells <= 256 else np.uint16
+    boards = rng.permuted(np.tile(np.arange(cells, dtype=dtype), (count, 1)), axis=1)
+
+    # Vị trí đích của từng ô (ô trống có đích là ô cuối)
+    goals = (boards.astype(np.int32) - 1) % cells
+    parity = np.zeros(count, dtype=np.int32)
+    for index in range(cells - 1):
+        parity += (goals[:, index:index + 1] > goals[:, index + 1:]).sum(axis=1)
+
+    blanks = np.argmax(boards == 0, axis=1)
+    blank_distance = (size - 1 - blanks // size) + (size - 1 - blanks % size)
+    wrong = np.nonzero(parity % 2 != blank_distance % 2)[0]
+
+    # Hai ô số đầu tiên: (0, 1), hoặc bỏ qua vị trí của ô trống nếu nó nằm ở đó
+    first = np.where(blanks[wrong] == 0, 1, 0)
+    second = np.where(blanks[wrong] <= 1, 2, 1)
+    first_tiles = boards[wrong, first]
+    boards[wrong, first] = boards[wrong, second]
+    boards[wrong, second] = first_tiles
+    return boards
+
+
+def _parse_distance(text):
+    """Đọc giá trị --distance: "20" là (20, 20), "20-25" là (20, 25)"""
+    low, _, high = text.partition("-")
+    return int(low), int(high or low)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate solvable sliding puzzle boards as JSON lines")
+    parser.add_argument("--size", type=int, default=4, help="board size (default: 4)")
+    parser.add_argument("--count", type=int, default=1, help="number of boards")
+    parser.add_argument("--distance", default=None,
+                        help="exact optimal distance (e.g. 20) or a range (e.g. 20-25); up to 4x4")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("-o", "--output", default="-", help="output file ('-' for stdout)")
+    args = parser.parse_args(argv)
+    if args.size < 2:
+        parser.error("size must be at least 2")
+
+    with contextlib.ExitStack() as stack:
+        output = sys.stdout if args.output == "-" else stack.enter_context(open(args.output, 'w'))
+
+        if args.distance is not None:
+            low, high = _parse_distance(args.distance)
+            rng = random.Random(args.seed)
+            for _ in range(args.count):
+                tiles, distance = scramble_to_distance(args.size, low, high, rng)
+                output.write(f'{{"board": [{", ".join(map(str, tiles))}], "distance": {distance}}}\n')
+        elif np is not None:
+            # Mỗi khối dùng seed riêng suy ra từ seed chung để kết quả lặp lại được
+            seeds = np.random.SeedSequence(args.seed).spawn((args.count + BATCH_SIZE - 1) // BATCH_SIZE)
+            for batch, seed in enumerate(seeds):
+                count = min(BATCH_SIZE, args.count - batch * BATCH_SIZE)
+                output.writelines(f'{{"board": [{", ".join(map(str, tiles))}]}}\n'
+                                  for tiles in generate_batch(args.size, count, seed).tolist())
+        else:
+            rng = random.Random(args.seed)
+            output.writelines(f'{{"board": [{", ".join(map(str, tiles))}]}}\n'
+                              for tiles in generate_boards(args.size, args.count, rng))
+
+
+if __name__ == "__main__":
+    main()
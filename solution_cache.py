@@ -0,0 +1,274 @@
+"""
+Bộ nhớ đệm lời giải theo trạng thái bàn cờ
+
+Hai tầng:
+- Tầng bộ nhớ: LRU (OrderedDict) giới hạn số phần tử
+- Tầng đĩa: file dbm trong data/, giữ lời giải giữa các lần chạy
+
+Tầng đĩa có thể dùng chung giữa nhiều bản game (cùng thư mục data/):
+- put() chỉ ghi vào bộ nhớ; một luồng nền ghi các lời giải mới ra đĩa trong
+  file_lock.FileLock, mỗi lần mở lại file (đọc chỉ mục mới nhất, gồm cả lời
+  giải của bản game khác), chỉ thêm khóa chưa có rồi đóng lại. Vòng lặp khung
+  hình không phải chờ ghi đĩa.
+- get() đọc qua một handle chỉ đọc, được mở lại khi file bị sửa (kiểm tra tối
+  đa mỗi SOLUTION_CACHE_REFRESH_INTERVAL giây). Giá trị của một khóa không bao
+  giờ bị ghi đè nên chỉ mục cũ vẫn trỏ tới dữ liệu đúng.
+
+Khóa là trạng thái chuẩn hóa: bàn cờ và bản chuyển vị của nó (đổi hàng thành
+cột rồi đánh số lại các ô theo đích chuyển vị) có lời giải tương ứng nhau, nên
+chỉ lưu một trong hai (bản có mã nhỏ hơn). Nhờ vậy số lần trúng bộ nhớ đệm tăng
+gấp đôi. Lời giải được lưu dưới dạng dãy vị trí ô trống (mỗi vị trí một byte).
+"""
+import dbm
+import os
+import threading
+import time
+from collections import OrderedDict
+from bot import pack_state
+from constants import DATA_DIRECTORY, SOLUTION_CACHE_FILE, SOLUTION_CACHE_REFRESH_INTERVAL, SOLUTION_CACHE_SIZE
+from file_lock import FileLock, file_id
+
+# Bộ nhớ đệm dùng chung trong tiến trình
+_shared_cache = None
+
+
+def transpose_tiles(tiles, size):
+    """
+    Chuyển vị bàn cờ và đánh số lại các ô để đích vẫn là đích
+
+    Ô ở (row, col) chuyển sang (col, row); ô số v có vị trí đích (r, c) được
+    đổi thành ô có vị trí đích (c, r).
+
+    Args:
+        tiles: Danh sách 1D các ô
+        size: Kích thước bàn cờ
+
+    Returns:
+        list: Danh sách 1D của bàn chuyển vị
+    """
+    result = [0] * (size * size)
+    for index, tile in enumerate(tiles):
+        row, col = index // size, index % size
+        if tile != 0:
+            goal_row, goal_col = (tile - 1) // size, (tile - 1) % size
+            tile = goal_col * size + goal_row + 1
+        result[col * size + row] = tile
+    return result
+
+
+def canonical_state(tiles, size):
+    """
+    Trạng thái chuẩn hóa dùng làm khóa
+
+    Returns:
+        tuple: (trạng thái đã mã hóa, True nếu đã chuyển vị)
+    """
+    state = pack_state(tiles, size)
+    transposed = pack_state(transpose_tiles(tiles, size), size)
+    if transposed < state:
+        return transposed, True
+    return state, False
+
+
+def _solves(tiles, size, cells):
+    """Kiểm tra dãy vị trí ô trống có đưa bàn cờ về đích không"""
+    state = list(tiles)
+    blank = state.index(0)
+    for cell in cells:
+        if abs(cell // size - blank // size) + abs(cell % size - blank % size) != 1:
+            return False
+        state[blank], state[cell] = state[cell], 0
+        blank = cell
+    return state == list(range(1, size * size)) + [0]
+
+
+class SolutionCache:
+    """Bộ nhớ đệm lời giải hai tầng (LRU trong bộ nhớ + dbm trên đĩa)"""
+
+    def __init__(self, path=SOLUTION_CACHE_FILE, capacity=SOLUTION_CACHE_SIZE):
+        self.path = path
+        self.capacity = capacity
+        self._memory = OrderedDict()
+        self._disk = None
+        self.hits = 0
+        self.misses = 0
+
+        # Handle chỉ đọc, file_id các file dbm lúc mở và lần kiểm tra gần nhất
+        self._disk_id = None
+        self._checked_at = 0.0
+        # Ghi nền (được bảo vệ bởi _condition): khóa -> giá trị chưa ghi ra đĩa
+        self._condition = threading.Condition()
+        self._pending = {}
+        self._writing = False
+        self._closed = False
+        self._writer = None
+
+        if path is not None:
+            try:
+                os.makedirs(os.path.dirname(path) or DATA_DIRECTORY, exist_ok=True)
+                with FileLock(path):
+                    dbm.open(path, 'c').close()
+                self._open_disk()
+            except (OSError, dbm.error):
+                # Không mở được file thì chỉ dùng tầng bộ nhớ
+                self.path = None
+
+    def get(self, board, algorithm):
+        """
+        Tìm lời giải đã lưu
+
+        Args:
+            board: Bàn cờ (list 2D)
+            algorithm: Tên thuật toán đã tạo lời giải
+
+        Returns:
+            list: Danh sách vị trí (row, col) các ô cần di chuyển, hoặc None nếu chưa có
+        """
+        size = len(board)
+        tiles = [tile for row in board for tile in row]
+        key, transposed = self._key(tiles, size, algorithm)
+
+        cells = self._memory.get(key)
+        if cells is not None:
+            self._memory.move_to_end(key)
+        elif self.path is not None:
+            with self._condition:
+                self._refresh_disk()
+                try:
+                    cells = self._disk.get(key) if self._disk is not None else None
+                except (OSError, dbm.error):
+                    cells = None
+            if cells is not None:
+                self._remember(key, cells)
+
+        if cells is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if transposed:
+            return [(cell % size, cell // size) for cell in cells]
+        return [(cell // size, cell % size) for cell in cells]
+
+    def put(self, board, algorithm, moves):
+        """
+        Lưu lời giải (chỉ lưu khi dãy nước đi thật sự giải được bàn cờ)
+
+        Args:
+            board: Bàn cờ ban đầu (list 2D)
+            algorithm: Tên thuật toán đã tạo lời giải
+            moves: Danh sách vị trí (row, col) các ô cần di chuyển
+        """
+        size = len(board)
+        tiles = [tile for row in board for tile in row]
+        cells = [row * size + col for row, col in moves]
+        if not _solves(tiles, size, cells):
+            return
+
+        key, transposed = self._key(tiles, size, algorithm)
+        if transposed:
+            cells = [(cell % size) * size + cell // size for cell in cells]
+
+        value = bytes(cells)
+        self._remember(key, value)
+        if self.path is not None:
+            with self._condition:
+                self._pending[key] = value
+                self._start_writer()
+                self._condition.notify_all()
+
+    def flush(self):
+        """Chờ tới khi các lời giải đang chờ đã được ghi ra đĩa"""
+        with self._condition:
+            while self._pending or self._writing:
+                self._condition.wait()
+
+    def close(self):
+        """Ghi nốt các lời giải, dừng luồng ghi nền và đóng file trên đĩa"""
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        with self._condition:
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
+            self.path = None
+
+    def _disk_files(self):
+        """file_id của các file dbm có thể có (tên file tùy kiểu dbm)"""
+        return tuple(file_id(self.path + suffix) for suffix in ("", ".db", ".dir", ".dat", ".pag"))
+
+    def _open_disk(self):
+        """Mở lại handle chỉ đọc (gọi khi giữ _condition hoặc trước khi có luồng ghi)"""
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+        self._disk_id = self._disk_files()
+        self._disk = dbm.open(self.path, 'r')
+
+    def _refresh_disk(self):
+        """Mở lại handle chỉ đọc nếu bản game khác (hoặc luồng ghi) đã thêm lời giải"""
+        now = time.monotonic()
+        if now - self._checked_at < SOLUTION_CACHE_REFRESH_INTERVAL:
+            return
+        self._checked_at = now
+        if self._disk_files() != self._disk_id:
+            try:
+                self._open_disk()
+            except (OSError, dbm.error):
+                self._disk = None
+
+    def _start_writer(self):
+        """Tạo luồng ghi nền nếu chưa có (gọi khi giữ _condition)"""
+        if self._writer is None:
+            self._closed = False
+            self._writer = threading.Thread(target=self._write_loop, name="solution-cache-writer", daemon=True)
+            self._writer.start()
+
+    def _write_loop(self):
+        """Luồng ghi nền: mỗi lần thức dậy ghi mọi lời giải đang chờ"""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                pending = self._pending
+                self._pending = {}
+                self._writing = True
+            try:
+                # Mở lại trong khóa để đọc chỉ mục mới nhất (dbm.dumb ghi đè cả file chỉ mục
+                # khi đóng, nên hai bản game ghi cùng lúc sẽ làm mất khóa của nhau)
+                with FileLock(self.path):
+                    with dbm.open(self.path, 'c') as disk:
+                        for key, value in pending.items():
+                            if key not in disk:
+                                disk[key] = value
+            except (OSError, dbm.error) as e:
+                print(f"Could not save solutions: {e}")
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def _key(self, tiles, size, algorithm):
+        state, transposed = canonical_state(tiles, size)
+        return f"{algorithm}:{size}:{state:x}".encode(), transposed
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+
+def get_solution_cache():
+    """Bộ nhớ đệm lời giải dùng chung trong tiến trình (tạo khi cần)"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = SolutionCache()
+    return _shared_cache
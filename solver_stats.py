@@ -0,0 +1,123 @@
+"""
+Thống kê của một lượt giải
+
+Mỗi bộ giải của BotSolver ghi số liệu vào một SolverStats thay vì chỉ in ra màn
+hình: số nút mở rộng và sinh ra, kích thước lớn nhất của tập biên và tập đã
+thăm, số lần gọi heuristic, thời gian tới lời giải đầu tiên và lý do dừng.
+Đặt SOLVER_STATS_FILE trong constants.py để ghi mỗi lượt giải thành một dòng
+JSON (JSONL) phục vụ theo dõi hiệu năng.
+"""
+import json
+import os
+import time
+
+# Lý do dừng
+SOLVED = "solved"
+EXHAUSTED = "exhausted"  # Đã duyệt hết không gian tìm kiếm mà không có lời giải
+ITERATION_LIMIT = "iteration_limit"
+TIME_LIMIT = "time_limit"
+MEMORY_LIMIT = "memory_limit"
+LOCAL_MINIMUM = "local_minimum"
+UNSOLVABLE = "unsolvable"
+
+
+class SolverStats:
+    """Số liệu của một lượt giải (một thuật toán trên một bàn cờ)"""
+
+    def __init__(self, algorithm, size, heuristic=None):
+        self.algorithm = algorithm
+        self.size = size
+        self.heuristic = heuristic
+
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        # Tập biên: hàng đợi ưu tiên (A*, best-first), độ sâu ngăn xếp (IDA*) hoặc độ rộng tầng (beam)
+        self.peak_frontier = 0
+        # Tập đã thăm: bảng nút cha / bảng chuyển vị
+        self.peak_visited = 0
+        self.heuristic_calls = 0
+
+        self.solution_length = None
+        self.time_to_first_solution = None
+        self.elapsed = 0.0
+        self.termination = None
+
+        self._start = time.perf_counter()
+
+    def observe(self, frontier, visited):
+        """Cập nhật kích thước lớn nhất của tập biên và tập đã thăm"""
+        if frontier > self.peak_frontier:
+            self.peak_frontier = frontier
+        if visited > self.peak_visited:
+            self.peak_visited = visited
+
+    def record_solution(self):
+        """Ghi nhận thời điểm có lời giải (chỉ lần đầu được giữ lại)"""
+        if self.time_to_first_solution is None:
+            self.time_to_first_solution = time.perf_counter() - self._start
+
+    def finish(self, termination, moves):
+        """
+        Kết thúc lượt giải
+
+        Args:
+            termination: Lý do dừng (SOLVED, TIME_LIMIT, ...)
+            moves: Lời giải trả về (danh sách rỗng nếu không có)
+        """
+        self.elapsed = time.perf_counter() - self._start
+        self.termination = termination
+        if moves:
+            self.record_solution()
+            self.solution_length = len(moves)
+        elif termination == SOLVED:
+            # Bàn cờ đã ở trạng thái đích
+            self.record_solution()
+            self.solution_length = 0
+
+    @property
+    def nodes_per_second(self):
+        """Số nút mở rộng mỗi giây"""
+        if self.elapsed <= 0:
+            return 0.0
+        return self.nodes_expanded / self.elapsed
+
+    def to_dict(self):
+        """Chuyển thành dict (để ghi JSON)"""
+        return {
+            "algorithm": self.algorithm,
+            "size": self.size,
+            "heuristic": self.heuristic,
+            "nodes_expanded": self.nodes_expanded,
+            "nodes_generated": self.nodes_generated,
+            "peak_frontier": self.peak_frontier,
+            "peak_visited": self.peak_visited,
+            "heuristic_calls": self.heuristic_calls,
+            "nodes_per_second": round(self.nodes_per_second, 1),
+            "time_to_first_solution": (None if self.time_to_first_solution is None
+                                       else round(self.time_to_first_solution, 6)),
+            "elapsed": round(self.elapsed, 6),
+            "solution_length": self.solution_length,
+            "termination": self.termination,
+        }
+
+    def summary(self):
+        """Mô tả ngắn gọn trên một dòng"""
+        length = "no solution" if self.solution_length is None else f"{self.solution_length} steps"
+        return (f"{self.algorithm}: {self.termination}, {length}, {self.nodes_expanded:,} nodes "
+                f"in {self.elapsed:.2f}s ({self.nodes_per_second:,.0f} nodes/s)")
+
+
+def append_stats(path, stats):
+    """
+    Ghi thêm một dòng JSON vào file thống kê
+
+    Mỗi dòng được ghi bằng một lệnh write ở chế độ append nên nhiều tiến trình
+    có thể ghi chung một file.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    record = stats.to_dict()
+    record["timestamp"] = round(time.time(), 3)
+    with open(path, 'a') as f:
+        f.write(json.dumps(record) + "\n")
@@ -0,0 +1,150 @@
+"""
+Chạy bộ giải trong một tiến trình riêng
+
+Vòng lặp pygame không bị treo trong lúc tìm kiếm: Game.update chỉ gọi
+SolverJob.poll() mỗi khung hình để nhận tiến độ và kết quả. Tiến trình con
+không import pygame (module này không import, và main.py chỉ import pygame
+bên trong main() nên khi "spawn" import lại main.py dưới tên __mp_main__ thì
+cũng không kéo theo pygame), nên khởi động nhanh.
+"""
+import atexit
+import multiprocessing
+import time
+import weakref
+from bot import BoardSnapshot, BotSolver
+
+# Khoảng thời gian tối thiểu giữa hai lần gửi tiến độ (giây)
+PROGRESS_REPORT_INTERVAL = 0.1
+
+# Dùng "spawn" để tiến trình con không kế thừa trạng thái SDL/pygame của tiến trình chính
+_context = multiprocessing.get_context("spawn")
+
+# Các lượt giải đang chạy, dừng hết khi chương trình thoát
+_running_jobs = weakref.WeakSet()
+
+
+@atexit.register
+def _cancel_running_jobs():
+    # Tiến trình giải không phải daemon nên multiprocessing sẽ chờ nó khi thoát
+    for job in list(_running_jobs):
+        job.cancel()
+
+
+def _run_solver(connection, board, algorithm, heuristic, time_limit, memory_limit_mb):
+    """Hàm chạy trong tiến trình con: giải rồi gửi kết quả qua pipe"""
+    solver = BotSolver(BoardSnapshot(board), heuristic, memory_limit_mb)
+    last_report = 0.0
+
+    def report(nodes):
+        nonlocal last_report
+        now = time.time()
+        if now - last_report >= PROGRESS_REPORT_INTERVAL:
+            last_report = now
+            connection.send(("progress", nodes))
+
+    solver.progress_callback = report
+    # Lời giải tạm thời (chế độ anytime) được gửi ngay, không giới hạn tần suất
+    solver.solution_callback = lambda moves: connection.send(("solution", moves))
+    moves = solver.solve(algorithm, time_limit)
+    connection.send(("stats", solver.stats))
+    connection.send(("result", moves))
+    connection.close()
+
+
+class SolverJob:
+    """Một lượt giải chạy nền, có tiến độ và có thể hủy"""
+
+    def __init__(self, board, algorithm, heuristic=None, time_limit=None, memory_limit_mb=None):
+        self.board = [list(row) for row in board]
+        self.algorithm = algorithm
+        self.heuristic = heuristic
+        self.time_limit = time_limit
+        self.memory_limit_mb = memory_limit_mb
+
+        self.nodes = 0  # Số nút đã mở rộng (theo báo cáo gần nhất)
+        self.stats = None  # SolverStats của lượt giải (có khi giải xong)
+        self.start_time = 0
+        self.finished = False
+        self.result = None
+        self._solution = None  # Lời giải tạm thời mới nhất chưa được lấy
+
+        self._process = None
+        self._connection = None
+
+    def start(self):
+        """Khởi động tiến trình giải"""
+        receiver, sender = _context.Pipe(duplex=False)
+        self._connection = receiver
+        # Không đặt daemon: tìm kiếm cục bộ cần tạo thêm tiến trình con
+        # (các tiến trình con đó tự dừng khi tiến trình này kết thúc)
+        self._process = _context.Process(
+            target=_run_solver,
+            args=(sender, self.board, self.algorithm, self.heuristic, self.time_limit,
+                  self.memory_limit_mb)
+        )
+        self.start_time = time.time()
+        self._process.start()
+        sender.close()
+        _running_jobs.add(self)
+
+    @property
+    def elapsed(self):
+        """Thời gian đã chạy (giây)"""
+        return time.time() - self.start_time
+
+    def poll(self):
+        """
+        Nhận tiến độ và kết quả mà không chặn
+
+        Returns:
+            list: Danh sách nước đi khi đã giải xong, None nếu chưa xong
+        """
+        if self.finished:
+            return self.result
+
+        try:
+            while self._connection.poll():
+                kind, value = self._connection.recv()
+                if kind == "progress":
+                    self.nodes = value
+                elif kind == "solution":
+                    self._solution = value
+                elif kind == "stats":
+                    self.stats = value
+                elif kind == "result":
+                    self._finish(value)
+                    return self.result
+        except (EOFError, OSError):
+            # Tiến trình con kết thúc mà không gửi kết quả (lỗi hoặc bị dừng)
+            self._finish([])
+            return self.result
+
+        return None
+
+    def take_solution(self):
+        """
+        Lấy lời giải tạm thời mới nhận (chế độ anytime), mỗi lời giải chỉ trả về một lần
+
+        Gọi sau poll().
+
+        Returns:
+            list: Danh sách nước đi ngắn hơn lời giải tạm thời trước đó, hoặc None
+        """
+        solution, self._solution = self._solution, None
+        return solution
+
+    def cancel(self):
+        """Dừng tiến trình giải ngay lập tức"""
+        if self._process is not None and self._process.is_alive():
+            self._process.terminate()
+        self._finish(None)
+
+    def _finish(self, result):
+        _running_jobs.discard(self)
+        self.finished = True
+        self.result = result
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        if self._process is not None:
+            self._process.join(timeout=1)
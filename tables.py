@@ -0,0 +1,78 @@
+"""
+Các bảng tra cứu tính sẵn theo kích thước bàn cờ
+
+Bảng được tạo một lần cho mỗi kích thước rồi dùng chung cho mọi bộ giải,
+để vòng lặp tìm kiếm chỉ còn các phép tra cứu thay vì chia, lấy dư và so sánh.
+"""
+from functools import lru_cache
+
+# Thứ tự xét ô kề: lên, xuống, trái, phải
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+@lru_cache(maxsize=None)
+def manhattan_table(size):
+    """
+    Bảng khoảng cách Manhattan của từng ô tại từng vị trí
+
+    Args:
+        size: Kích thước bàn cờ
+
+    Returns:
+        tuple: table[tile][index] là khoảng cách từ vị trí index tới vị trí đích
+        của ô tile (hàng của ô trống toàn 0)
+    """
+    cells = size * size
+    table = [(0,) * cells]
+    for tile in range(1, cells):
+        goal_row, goal_col = (tile - 1) // size, (tile - 1) % size
+        table.append(tuple(abs(index // size - goal_row) + abs(index % size - goal_col)
+                           for index in range(cells)))
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def neighbor_table(size):
+    """
+    Các ô kề của mỗi vị trí trên bàn cờ
+
+    Args:
+        size: Kích thước bàn cờ
+
+    Returns:
+        tuple: table[index] là tuple các vị trí kề index (theo thứ tự DIRECTIONS)
+    """
+    table = []
+    for index in range(size * size):
+        row, col = index // size, index % size
+        table.append(tuple((row + dr) * size + col + dc for dr, dc in DIRECTIONS
+                           if 0 <= row + dr < size and 0 <= col + dc < size))
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def move_table(size):
+    """
+    Các nước đi của ô trống, đã bỏ nước quay ngược lại nước vừa đi
+
+    Nước quay ngược chỉ sinh lại trạng thái cha, nên bỏ ngay từ bảng thay vì
+    sinh ra rồi mới thấy trạng thái đã thăm.
+
+    Args:
+        size: Kích thước bàn cờ
+
+    Returns:
+        tuple: table[blank][previous] là tuple các ô mà ô trống ở blank có thể đi
+        tới, khi nước vừa rồi đưa ô trống từ previous sang blank. previous = -1
+        (trạng thái gốc) trỏ tới phần tử cuối là toàn bộ ô kề.
+    """
+    neighbors = neighbor_table(size)
+    table = []
+    for blank in range(size * size):
+        # Vị trí không kề blank dùng chung tuple đầy đủ
+        row = [neighbors[blank]] * (size * size)
+        for previous in neighbors[blank]:
+            row[previous] = tuple(cell for cell in neighbors[blank] if cell != previous)
+        row.append(neighbors[blank])
+        table.append(tuple(row))
+    return tuple(table)
@@ -0,0 +1,55 @@
+"""
+Cấu hình chung cho pytest
+
+Các module của game nằm ở thư mục gốc (không đóng gói), nên thêm thư mục gốc
+vào sys.path để test import được như main.py.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def to_board(tiles, size):
+    """Danh sách 1D các ô -> bàn cờ 2D"""
+    return [list(tiles[row * size:(row + 1) * size]) for row in range(size)]
+
+
+def apply_moves(tiles, size, moves):
+    """
+    Thực hiện lần lượt các nước đi (row, col) trên bàn cờ
+
+    Mỗi nước đi phải là ô kề ô trống, nếu không thì test thất bại.
+
+    Returns:
+        list: Danh sách 1D các ô sau khi đi
+    """
+    tiles = list(tiles)
+    blank = tiles.index(0)
+    for row, col in moves:
+        cell = row * size + col
+        assert 0 <= row < size and 0 <= col < size, f"move {(row, col)} is off the board"
+        assert abs(cell // size - blank // size) + abs(cell % size - blank % size) == 1, \
+            f"move {(row, col)} is not adjacent to the blank"
+        tiles[blank], tiles[cell] = tiles[cell], 0
+        blank = cell
+    return tiles
+
+
+def goal(size):
+    """Trạng thái đích dạng 1D"""
+    return list(range(1, size * size)) + [0]
+
+
+@pytest.fixture
+def puzzle():
+    """Các hàm tiện ích cho bàn cờ: to_board, apply_moves, goal"""
+    return type("Puzzle", (), {
+        "to_board": staticmethod(to_board),
+        "apply_moves": staticmethod(apply_moves),
+        "goal": staticmethod(goal),
+    })
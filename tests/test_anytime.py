@@ -0,0 +1,46 @@
+"""Bộ giải anytime: lời giải ngắn dần theo thời gian, tối ưu khi kịp chạy hết, luôn trả lời trước hạn"""
+import random
+import time
+
+from bot import BoardSnapshot, BotSolver
+from distance_table import get_distance
+from scramble import random_board
+
+
+def _solver(tiles, size):
+    solver = BotSolver(BoardSnapshot([tiles[row * size:(row + 1) * size] for row in range(size)]))
+    solver.stats_file = None
+    return solver
+
+
+def test_improves_to_optimal_on_3x3(puzzle):
+    for seed in range(5):
+        tiles = random_board(3, random.Random(60 + seed))
+        solver = _solver(tiles, 3)
+        found = []
+        solver.solution_callback = found.append
+        moves = solver.solve("anytime", 30.0)
+
+        assert puzzle.apply_moves(tiles, 3, moves) == puzzle.goal(3)
+        assert len(moves) == get_distance(tiles)
+        assert solver.stats.termination == "solved"
+        lengths = [len(solution) for solution in found]
+        assert lengths == sorted(set(lengths), reverse=True) and lengths[-1] == len(moves)
+
+
+def test_returns_best_solution_at_deadline(puzzle):
+    tiles = random_board(4, random.Random(65))
+    solver = _solver(tiles, 4)
+    start = time.time()
+    moves = solver.solve("anytime", 0.5)
+    assert time.time() - start < 0.5 + 2.0
+    assert moves, "the first weighted run should finish well within the budget"
+    assert puzzle.apply_moves(tiles, 4, moves) == puzzle.goal(4)
+    assert solver.stats.termination in ("solved", "time_limit")
+
+
+def test_weighted_a_star_with_unit_weight_is_optimal(puzzle):
+    tiles = random_board(3, random.Random(66))
+    moves = _solver(tiles, 3).solve_weighted_a_star(1.0, 30.0)
+    assert puzzle.apply_moves(tiles, 3, moves) == puzzle.goal(3)
+    assert len(moves) == get_distance(tiles)
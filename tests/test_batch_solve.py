@@ -0,0 +1,55 @@
+"""Giải hàng loạt: đầu vào/đầu ra JSONL, giữ thứ tự, báo lỗi từng dòng và chạy nhiều tiến trình"""
+import json
+import os
+import random
+import subprocess
+import sys
+
+import batch_solve
+from distance_table import get_distance
+from scramble import random_board
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _write_input(path, boards):
+    lines = [json.dumps({"id": f"b{index}", "board": tiles}) for index, tiles in enumerate(boards)]
+    # Bàn cờ có thể ghi dạng 1D hoặc 2D
+    lines[1] = json.dumps({"id": "b1", "board": [boards[1][0:3], boards[1][3:6], boards[1][6:9]]})
+    lines += [
+        json.dumps({"id": "bad-square", "board": [1, 2, 3, 0, 4]}),
+        json.dumps({"id": "bad-tiles", "board": [[1, 1], [2, 0]]}),
+        "not json",
+        "",
+    ]
+    path.write_text("\n".join(lines) + "\n")
+
+
+def _check_output(path, boards):
+    results = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [result["id"] for result in results] == [f"b{index}" for index in range(len(boards))] + \
+        ["bad-square", "bad-tiles", None]
+    for result, tiles in zip(results, boards):
+        assert result["solved"] and result["size"] == 3
+        assert result["length"] == len(result["moves"]) == get_distance(tiles)
+        assert result["stats"]["termination"] == "solved"
+    assert all("error" in result for result in results[len(boards):])
+
+
+def test_single_process(tmp_path, capsys):
+    boards = [random_board(3, random.Random(seed)) for seed in range(6)]
+    _write_input(tmp_path / "boards.jsonl", boards)
+    batch_solve.main([str(tmp_path / "boards.jsonl"), "-o", str(tmp_path / "out.jsonl"), "-j", "1"])
+    _check_output(tmp_path / "out.jsonl", boards)
+    # Thông báo của bộ giải không lẫn vào stdout
+    assert capsys.readouterr().out == ""
+
+
+def test_process_pool_keeps_input_order(tmp_path):
+    boards = [random_board(3, random.Random(seed)) for seed in range(20)]
+    _write_input(tmp_path / "boards.jsonl", boards)
+    with open(tmp_path / "boards.jsonl") as source:
+        output = subprocess.run([sys.executable, "batch_solve.py", "-", "-j", "3", "--chunksize", "2"],
+                                cwd=ROOT, stdin=source, capture_output=True, text=True, check=True)
+    (tmp_path / "out.jsonl").write_text(output.stdout)
+    _check_output(tmp_path / "out.jsonl", boards)
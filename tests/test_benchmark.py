@@ -0,0 +1,62 @@
+"""Benchmark: bộ bàn cờ tất định, báo cáo và so sánh với baseline"""
+import json
+
+import pytest
+
+import benchmark
+from benchmark import build_corpus, compare, run_benchmark
+from scramble import is_solvable
+
+
+def test_corpus_is_deterministic_and_solvable():
+    corpus = build_corpus()
+    assert corpus == build_corpus()
+    assert corpus != build_corpus(seed=1)
+    assert len(corpus["hard_4x4"]) == benchmark.HARD_4X4_COUNT
+    assert len(corpus["large"]) == len(benchmark.LARGE_SIZES) * benchmark.LARGE_PER_SIZE
+    for boards in corpus.values():
+        assert boards
+        for _, board in boards:
+            assert is_solvable([tile for row in board for tile in row], len(board))
+
+
+def test_run_benchmark_report():
+    report = run_benchmark(sets=["maps_3x3"], modes=["optimal", "reduction"], limit=2)
+    assert set(report["results"]) == {"maps_3x3/optimal", "maps_3x3/reduction"}
+    result = report["results"]["maps_3x3/optimal"]
+    assert result["boards"] == result["solved"] == 2
+    assert [instance["termination"] for instance in result["instances"]] == ["solved", "solved"]
+    assert result["mean_length"] is not None
+    json.dumps(report)
+
+
+def test_compare_flags_regressions():
+    base = {"results": {"a/optimal": {"solved": 3, "wall_time": 1.0, "nodes_per_second": 1000.0,
+                                      "mean_length": 20.0, "peak_rss_mb": 50.0}}}
+    same = {"results": {"a/optimal": dict(base["results"]["a/optimal"], wall_time=1.1)}}
+    assert compare(same, base, 0.15) == []
+
+    worse = {"results": {"a/optimal": dict(base["results"]["a/optimal"], solved=2, nodes_per_second=500.0),
+                         "b/optimal": base["results"]["a/optimal"]}}
+    assert {metric for _, metric, _, _ in compare(worse, base, 0.15)} == {"solved", "nodes_per_second"}
+
+    # Chỉ số có ở baseline nhưng mất hoặc bằng 0 cũng là regression
+    missing = {"results": {"a/optimal": dict(base["results"]["a/optimal"], nodes_per_second=0.0, peak_rss_mb=None)}}
+    assert {metric for _, metric, _, _ in compare(missing, base, 0.15)} == {"nodes_per_second", "peak_rss_mb"}
+
+
+def test_every_mode_reports_node_rate():
+    report = run_benchmark(sets=["maps_3x3"], modes=["local_search", "reduction"], limit=1, time_limit=0.5)
+    for result in report["results"].values():
+        assert result["nodes"] > 0 and result["nodes_per_second"] > 0
+
+
+def test_cli_exits_on_regression(tmp_path, monkeypatch):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": {"maps_3x3/reduction": {
+        "solved": 99, "wall_time": None, "nodes_per_second": None, "mean_length": None, "peak_rss_mb": None}}}))
+    with pytest.raises(SystemExit) as exit_info:
+        benchmark.main(["--sets", "maps_3x3", "--modes", "reduction", "--limit", "1",
+                        "-o", str(tmp_path / "report.json"), "--baseline", str(baseline)])
+    assert exit_info.value.code == 1
+    assert "maps_3x3/reduction" in json.loads((tmp_path / "report.json").read_text())["results"]
@@ -0,0 +1,51 @@
+"""Bảng khoảng cách chính xác cho toàn bộ không gian trạng thái 3x3"""
+import random
+
+import distance_table
+from distance_table import (TABLE_SIZE, get_distance, index_state, load_distance_table, state_index,
+                            states_at_distance)
+from scramble import random_walk
+
+
+def test_index_round_trip():
+    rng = random.Random(13)
+    for index in rng.sample(range(TABLE_SIZE), 2000) + [0, TABLE_SIZE - 1]:
+        tiles = index_state(index)
+        assert sorted(tiles) == list(range(9))
+        assert state_index(tiles) == index
+
+
+def test_table_contents():
+    table = load_distance_table()
+    assert len(table) == TABLE_SIZE
+    assert get_distance([1, 2, 3, 4, 5, 6, 7, 8, 0]) == 0
+    assert max(table) == 31
+    # Mọi trạng thái giải được đều có khoảng cách, hai trạng thái xa nhất cách đích 31 bước
+    assert sum(len(states_at_distance(distance)) for distance in range(32)) == TABLE_SIZE
+    assert len(states_at_distance(31)) == 2
+    assert get_distance([2, 1, 3, 4, 5, 6, 7, 8, 0]) is None
+
+
+def test_neighbors_differ_by_one():
+    rng = random.Random(14)
+    for length in range(0, 40, 3):
+        tiles = random_walk(3, length, rng)
+        distance = get_distance(tiles)
+        assert distance <= length and distance % 2 == length % 2
+        blank = tiles.index(0)
+        for cell in distance_table._NEIGHBORS[blank]:
+            child = list(tiles)
+            child[blank], child[cell] = child[cell], 0
+            assert abs(get_distance(child) - distance) == 1
+
+
+def test_rebuilds_missing_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(distance_table, "_table", None)
+    path = str(tmp_path / "distance_3x3.bin")
+    table = load_distance_table(path)
+    with open(path, 'rb') as f:
+        assert f.read() == table
+
+    # Nạp lại từ file vừa ghi
+    monkeypatch.setattr(distance_table, "_table", None)
+    assert load_distance_table(path) == table
@@ -0,0 +1,149 @@
+"""Ghi điểm và map an toàn khi nhiều bản game (nhiều tiến trình) dùng chung thư mục data/"""
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+import file_lock
+import score
+from file_lock import FileLock, update_json
+from levels import LevelManager
+from score import ScoreManager
+
+WORKERS = 6
+PER_WORKER = 15
+
+_context = multiprocessing.get_context("spawn")
+
+
+def _run_workers(target, *args):
+    processes = [_context.Process(target=target, args=(worker,) + args) for worker in range(WORKERS)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+
+def _increment(worker, path):
+    def add(data):
+        data["count"] = data.get("count", 0) + 1
+        data[f"{worker}-{index}"] = worker
+        return data
+
+    for index in range(PER_WORKER):
+        update_json(path, add)
+
+
+def _save_scores(worker, path):
+    manager = ScoreManager(path)
+    for index in range(PER_WORKER):
+        # Mỗi điểm một map riêng nên luôn vào bảng và luôn được ghi
+        manager.save_score(3, 30 + index, 60, map_name=f"{worker}-{index}")
+    manager.close()
+
+
+def _add_levels(worker, directory):
+    os.chdir(directory)
+    manager = LevelManager()
+    for index in range(PER_WORKER):
+        assert manager.add_level(3, [[1, 2, 3], [4, 5, 6], [7, 0, 8]], [2, 1], f"{worker}-{index}")
+
+
+def test_file_lock_excludes_threads(tmp_path):
+    path = str(tmp_path / "data.json")
+    inside = []
+    overlaps = []
+
+    def work():
+        for _ in range(50):
+            with FileLock(path):
+                inside.append(1)
+                if len(inside) > 1:
+                    overlaps.append(1)
+                time.sleep(0.0001)
+                inside.pop()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert overlaps == []
+
+
+def test_update_json_concurrent_processes(tmp_path):
+    path = str(tmp_path / "data.json")
+    _run_workers(_increment, path)
+    with open(path) as f:
+        data = json.load(f)
+    # Không mất lần cập nhật nào dù nhiều tiến trình cùng đọc-sửa-ghi
+    assert data["count"] == WORKERS * PER_WORKER
+    assert len(data) == WORKERS * PER_WORKER + 1
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_update_json_falls_back_to_lock(tmp_path, monkeypatch):
+    path = str(tmp_path / "data.json")
+    calls = []
+
+    def update(data):
+        calls.append(1)
+        if len(calls) <= file_lock.MAX_OPTIMISTIC_ATTEMPTS:
+            # Tiến trình khác ghi file trong lúc gộp
+            with open(path, 'w') as f:
+                json.dump({"other": len(calls)}, f)
+        return dict(data, mine=True)
+
+    assert update_json(path, update) == {"other": file_lock.MAX_OPTIMISTIC_ATTEMPTS, "mine": True}
+    assert len(calls) == file_lock.MAX_OPTIMISTIC_ATTEMPTS + 1
+    with open(path) as f:
+        assert json.load(f) == {"other": file_lock.MAX_OPTIMISTIC_ATTEMPTS, "mine": True}
+
+
+def test_update_json_no_change(tmp_path):
+    path = str(tmp_path / "data.json")
+    assert update_json(path, lambda data: None) is None
+    assert not os.path.exists(path)
+
+
+def test_scores_from_concurrent_processes(tmp_path):
+    path = str(tmp_path / "scores.json")
+    _run_workers(_save_scores, path)
+
+    data = ScoreManager(path).get_all_scores()
+    assert len(data["3x3"]["maps"]) == WORKERS * PER_WORKER
+    # Mọi điểm đã được gộp vào bản chụp với số thứ tự không trùng
+    with open(path) as f:
+        assert json.load(f)["_journal_seq"] == WORKERS * PER_WORKER
+
+
+def test_levels_from_concurrent_processes(tmp_path):
+    _run_workers(_add_levels, str(tmp_path))
+    with open(tmp_path / "data" / "levels.json") as f:
+        levels = json.load(f)
+    names = {level["name"] for level in levels["3x3"]}
+    assert {f"{worker}-{index}" for worker in range(WORKERS) for index in range(PER_WORKER)} <= names
+
+
+def test_corrupt_snapshot_replaced_by_another_instance(tmp_path, monkeypatch):
+    path = str(tmp_path / "scores.json")
+    good = json.dumps({"3x3": {"random": [{"moves": 30, "time": 60, "score": 1, "solver": "player"}], "maps": {}},
+                       "_journal_seq": 0})
+    with open(path, 'w') as f:
+        f.write("{not json")
+    manager = ScoreManager(path, write_behind=False)
+
+    class CompactingLock(FileLock):
+        """Bản game khác gộp journal (thay bản chụp hỏng bằng bản tốt) ngay trước khi có khóa"""
+
+        def acquire(self):
+            with open(path + ".new", 'w') as f:
+                f.write(good)
+            os.replace(path + ".new", path)
+            super().acquire()
+
+    monkeypatch.setattr(score, "FileLock", CompactingLock)
+    assert [entry["moves"] for entry in manager.get_high_scores(3)] == [30]
+    assert not os.path.exists(path + ".corrupt")
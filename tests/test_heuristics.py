@@ -0,0 +1,95 @@
+"""Heuristic: cập nhật tăng dần khớp với tính lại từ đầu, và không vượt quá số bước tối thiểu"""
+import random
+
+import pytest
+
+from bot import BoardSnapshot, BotSolver
+from distance_table import get_distance
+from heuristics import HEURISTICS, LinearConflictHeuristic, ManhattanHeuristic, get_heuristic
+from pattern_db import load_pattern_database
+from scramble import random_board, random_walk
+from tables import neighbor_table
+
+
+def _heuristics(size):
+    for name in HEURISTICS:
+        if name == "pdb" and (size != 4 or load_pattern_database() is None):
+            continue
+        yield get_heuristic(name, size)
+
+
+def _walk(tiles, size, steps, rng):
+    """Các nước đi ngẫu nhiên: (ô, vị trí cũ, vị trí mới, bàn cờ sau khi đi)"""
+    neighbors = neighbor_table(size)
+    tiles = list(tiles)
+    blank = tiles.index(0)
+    for _ in range(steps):
+        cell = rng.choice(neighbors[blank])
+        tile = tiles[cell]
+        tiles[blank], tiles[cell] = tile, 0
+        yield tile, cell, blank, list(tiles)
+        blank = cell
+
+
+@pytest.mark.parametrize("size", [3, 4, 5])
+def test_incremental_matches_full(size):
+    rng = random.Random(size)
+    for heuristic in _heuristics(size):
+        tiles = random_board(size, rng)
+        h, key = heuristic.start(tiles)
+        for tile, src, dst, after in _walk(tiles, size, 300, rng):
+            h, key = heuristic.move(h, key, tile, src, dst)
+            assert (h, key) == heuristic.start(after), heuristic.name
+
+
+def test_admissible_on_3x3():
+    rng = random.Random(7)
+    heuristics = list(_heuristics(3))
+    for _ in range(300):
+        tiles = random_board(3, rng)
+        distance = get_distance(tiles)
+        for heuristic in heuristics:
+            assert heuristic.start(tiles)[0] <= distance, heuristic.name
+
+
+def test_dominates_manhattan():
+    rng = random.Random(8)
+    for size in (3, 4):
+        manhattan = ManhattanHeuristic(size)
+        stronger = [heuristic for heuristic in _heuristics(size)
+                    if isinstance(heuristic, LinearConflictHeuristic) or heuristic.name == "pdb"]
+        for _ in range(100):
+            tiles = random_board(size, rng)
+            for heuristic in stronger:
+                assert heuristic.start(tiles)[0] >= manhattan.start(tiles)[0], heuristic.name
+
+
+def test_get_heuristic_fallbacks():
+    assert get_heuristic("walking_distance", 5).name == "linear_conflict"
+    assert get_heuristic("pdb", 3).name == "manhattan"
+    assert get_heuristic(None, 5).name == "manhattan"
+
+
+def test_walking_distance_table_size():
+    # Số mẫu walking distance đã biết của bàn 4x4
+    assert get_heuristic("walking_distance", 4).count == 24964
+
+
+def test_selectable_heuristics_give_same_optimal_length():
+    rng = random.Random(9)
+    boards = [random_walk(4, 36, rng) for _ in range(4)]
+    lengths = {}
+    nodes = {}
+    for name in HEURISTICS:
+        lengths[name] = []
+        nodes[name] = 0
+        for tiles in boards:
+            solver = BotSolver(BoardSnapshot([tiles[row * 4:(row + 1) * 4] for row in range(4)]), name)
+            solver.stats_file = None
+            lengths[name].append(len(solver.solve_ida_star()))
+            nodes[name] += solver.stats.nodes_expanded
+            assert solver.stats.heuristic == solver.heuristic.name
+    assert all(value == lengths["manhattan"] for value in lengths.values())
+    # Heuristic mạnh hơn thì duyệt ít nút hơn Manhattan
+    assert nodes["linear_conflict"] <= nodes["manhattan"]
+    assert nodes["walking_distance"] <= nodes["manhattan"]
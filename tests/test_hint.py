@@ -0,0 +1,69 @@
+"""Gợi ý nước đi: dùng lại kế hoạch đã tính, bảng khoảng cách, bộ nhớ đệm hoặc tìm kiếm"""
+import random
+
+from bot import BoardSnapshot, BotSolver
+from distance_table import get_distance
+from hint import HintProvider
+from scramble import random_board, random_walk
+from solution_cache import SolutionCache
+
+
+def _follow(provider, tiles, size, puzzle, limit=1000):
+    """Đi theo gợi ý tới khi xong; trả về số bước và nguồn của từng gợi ý"""
+    sources = []
+    for _ in range(limit):
+        move = provider.hint(puzzle.to_board(tiles, size))
+        if move is None:
+            return len(sources), sources
+        sources.append(provider.source)
+        tiles = puzzle.apply_moves(tiles, size, [move])
+    raise AssertionError("hints did not solve the board")
+
+
+def test_3x3_hints_are_optimal(puzzle):
+    provider = HintProvider(cache=SolutionCache(None))
+    for tiles in [random_board(3, random.Random(seed)) for seed in range(5)]:
+        steps, sources = _follow(provider, tiles, 3, puzzle)
+        assert steps == get_distance(tiles)
+        # Chỉ tra bảng một lần, các bước sau đi theo kế hoạch đã nhớ
+        assert sources[0] == "distance_table" and set(sources[1:]) <= {"plan"}
+
+
+def test_solved_and_unsolvable(puzzle):
+    provider = HintProvider(cache=SolutionCache(None))
+    assert provider.hint(puzzle.to_board(puzzle.goal(3), 3)) is None
+    assert provider.hint([[2, 1, 3], [4, 5, 6], [7, 8, 0]]) is None
+
+
+def test_off_plan_move_gets_new_hint(puzzle):
+    provider = HintProvider(cache=SolutionCache(None))
+    tiles = random_board(3, random.Random(30))
+    first = provider.hint(puzzle.to_board(tiles, 3))
+    blank = tiles.index(0)
+    other = next(cell for cell in (blank - 3, blank + 3, blank - 1, blank + 1)
+                 if 0 <= cell < 9 and abs(cell // 3 - blank // 3) + abs(cell % 3 - blank % 3) == 1
+                 and (cell // 3, cell % 3) != first)
+    moved = puzzle.apply_moves(tiles, 3, [(other // 3, other % 3)])
+    steps, _ = _follow(provider, moved, 3, puzzle)
+    assert steps == get_distance(moved)
+
+
+def test_4x4_uses_cache_then_plan(puzzle):
+    cache = SolutionCache(None)
+    provider = HintProvider(cache=cache)
+    tiles = random_walk(4, 20, random.Random(31))
+    board = puzzle.to_board(tiles, 4)
+    moves = BotSolver(BoardSnapshot(board)).solve_ida_star()
+    cache.put(board, "optimal", moves)
+
+    steps, sources = _follow(provider, tiles, 4, puzzle)
+    assert steps == len(moves)
+    assert sources[0] == "cache" and set(sources[1:]) <= {"plan"}
+
+
+def test_larger_boards_use_search(puzzle):
+    provider = HintProvider(cache=SolutionCache(None))
+    for size, tiles in ((4, random_walk(4, 40, random.Random(32))), (5, random_board(5, random.Random(33)))):
+        steps, sources = _follow(provider, tiles, size, puzzle, limit=5000)
+        assert sources[0] == "search"
+        assert set(sources[1:]) <= {"plan", "search", "greedy"}
@@ -0,0 +1,75 @@
+"""Bảng xếp hạng top-k bằng heap: cùng kết quả với cách cũ (thêm, sắp xếp ổn định, cắt)"""
+import random
+
+from leaderboard import Leaderboard, LeaderboardSet
+from score import ScoreManager
+
+
+def _sort_and_slice(entries, capacity):
+    board = []
+    for entry in entries:
+        board.append(entry)
+        board.sort(key=lambda item: item["score"], reverse=True)
+        board = board[:capacity]
+    return board
+
+
+def test_matches_sort_and_slice():
+    rng = random.Random(5)
+    for capacity in (1, 5, 10):
+        entries = [{"score": rng.randint(0, 20), "id": index} for index in range(200)]
+        board = Leaderboard(capacity)
+        for entry in entries:
+            board.push(entry)
+        assert board.entries() == _sort_and_slice(entries, capacity)
+
+
+def test_would_place_and_rank():
+    board = Leaderboard(3)
+    assert board.would_place(0) and board.rank(0) == 1
+    for score in (50, 30, 40):
+        assert board.push({"score": score})
+    # Bằng điểm thấp nhất của bảng đã đầy thì không vào bảng
+    assert not board.would_place(30) and board.rank(30) is None
+    assert not board.push({"score": 30})
+    assert board.rank(45) == 2
+    assert board.rank(40) == 3
+    assert board.rank(60) == 1
+
+
+def test_set_keeps_combined_and_per_solver_boards():
+    boards = LeaderboardSet(random_capacity=2, map_capacity=1)
+    boards.add(3, {"score": 10, "solver": "player"})
+    boards.add(3, {"score": 30, "solver": "optimal"})
+    boards.add(3, {"score": 20, "solver": "player"})
+    boards.add(3, {"score": 5, "solver": "player"}, "Map 1")
+
+    assert [entry["score"] for entry in boards.get(3).entries()] == [30, 20]
+    assert [entry["score"] for entry in boards.get(3, solver="player").entries()] == [20, 10]
+    assert boards.would_place(3, 1, "Map 2")
+    assert not boards.would_place(3, 5, "Map 1")
+
+    restored = LeaderboardSet.from_dict(boards.to_dict())
+    assert restored.to_dict() == boards.to_dict()
+
+
+def test_from_dict_without_solver_boards():
+    data = {"3x3": {"random": [{"score": 30, "solver": "optimal"}, {"score": 20}], "maps": {}}}
+    boards = LeaderboardSet.from_dict(data)
+    assert [entry["score"] for entry in boards.get(3, solver="optimal").entries()] == [30]
+    assert [entry["score"] for entry in boards.get(3, solver="player").entries()] == [20]
+
+
+def test_non_qualifying_score_is_not_written(tmp_path):
+    path = str(tmp_path / "scores.json")
+    manager = ScoreManager(path, write_behind=False)
+    for moves in range(30, 40):
+        manager.save_score(3, moves, 60)
+    with open(path + ".journal", 'rb') as f:
+        journal = f.read()
+
+    assert not manager.would_place(3, manager.get_high_scores(3)[-1]["score"])
+    manager.save_score(3, 99, 600)
+    with open(path + ".journal", 'rb') as f:
+        assert f.read() == journal
+    assert manager.rank(3, manager.get_high_scores(3)[0]["score"] + 1) == 1
@@ -0,0 +1,83 @@
+"""Tìm kiếm cục bộ đa khởi đầu: cắt vòng lặp, từng chiến lược và chạy song song trong hạn chót"""
+import random
+import time
+
+import pytest
+
+from distance_table import solve_with_table
+import local_search
+from local_search import STRATEGIES, remove_loops, run_strategy, solve_local_search
+from scramble import random_board, random_walk
+
+
+def _positions(cells, size):
+    return [(cell // size, cell % size) for cell in cells]
+
+
+def _states(tiles, cells):
+    tiles = list(tiles)
+    blank = tiles.index(0)
+    states = [tuple(tiles)]
+    for cell in cells:
+        tiles[blank], tiles[cell] = tiles[cell], 0
+        blank = cell
+        states.append(tuple(tiles))
+    return states
+
+
+def test_remove_loops(puzzle):
+    tiles = random_walk(3, 12, random.Random(50))
+    rng = random.Random(51)
+    # Lời giải có vòng lặp: đi lung tung rồi quay lại bằng đúng đường cũ, sau đó mới giải
+    blank = tiles.index(0)
+    detour = []
+    for _ in range(15):
+        cell = rng.choice([c for c in range(9) if abs(c // 3 - blank // 3) + abs(c % 3 - blank % 3) == 1])
+        detour.append(cell)
+        blank = cell
+    back = [tiles.index(0)] + detour[:-1]
+    solution = [row * 3 + col for row, col in solve_with_table(tiles)]
+    cells = detour + back[::-1] + solution
+
+    trimmed = remove_loops(tiles, 3, cells)
+    assert puzzle.apply_moves(tiles, 3, _positions(trimmed, 3)) == puzzle.goal(3)
+    assert len(trimmed) <= len(solution)
+    states = _states(tiles, trimmed)
+    assert len(states) == len(set(states))
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_each_strategy_solves_3x3(puzzle, strategy):
+    for seed in range(3):
+        tiles = random_board(3, random.Random(seed))
+        cells, steps = run_strategy(tiles, 3, None, strategy, seed, time.time() + 10)
+        assert cells is not None
+        assert steps >= len(cells)
+        assert puzzle.apply_moves(tiles, 3, _positions(cells, 3)) == puzzle.goal(3)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_solve_within_deadline(puzzle, workers):
+    tiles = random_walk(4, 40, random.Random(52))
+    start = time.time()
+    cells, steps = solve_local_search(tiles, 4, time_limit=2.0, workers=workers, seed=53)
+    assert time.time() - start < 2.0 + 3.0
+    assert cells is not None
+    assert steps >= len(cells)
+    assert puzzle.apply_moves(tiles, 4, _positions(cells, 4)) == puzzle.goal(4)
+
+
+def test_quick_walk_solution_returns_after_grace(puzzle):
+    tiles = random_walk(4, 30, random.Random(54))
+    start = time.time()
+    cells, _ = solve_local_search(tiles, 4, time_limit=5.0, workers=3, seed=55)
+    # Lần leo đồi nhanh đã giải được: không chờ các tiến trình con khởi động xong
+    assert time.time() - start < 1.0
+    assert puzzle.apply_moves(tiles, 4, _positions(cells, 4)) == puzzle.goal(4)
+
+
+def test_crashed_workers_do_not_wait_for_deadline():
+    # Bàn cờ sai kích thước làm tiến trình con lỗi ngay, không kịp gửi None
+    start = time.time()
+    assert local_search._solve_parallel([0], 4, None, 56, time.time() + 10.0, 2, None) == (None, 0)
+    assert time.time() - start < 5.0
@@ -0,0 +1,66 @@
+"""Tìm kiếm có giới hạn bộ nhớ: bảng chuyển vị cố định và A* chuyển sang IDA* khi vượt ngân sách"""
+import random
+
+from bot import BoardSnapshot, BotSolver, pack_state
+from distance_table import get_distance, index_state, states_at_distance
+from scramble import random_board
+from transposition import ENTRY_BYTES, BoundedTranspositionTable
+
+
+def _solver(tiles, size, **kwargs):
+    solver = BotSolver(BoardSnapshot([tiles[row * size:(row + 1) * size] for row in range(size)]), **kwargs)
+    solver.stats_file = None
+    return solver
+
+
+def test_capacity_follows_budget():
+    table = BoundedTranspositionTable(1024 * 1024)
+    assert table.capacity & (table.capacity - 1) == 0
+    assert table.capacity * ENTRY_BYTES <= 1024 * 1024 < 2 * table.capacity * ENTRY_BYTES
+    # Khóa dài hơn 64 bit tốn thêm bộ nhớ cho số nguyên Python nên ít mục hơn
+    assert BoundedTranspositionTable(1024 * 1024, 5 * 5 * 5).capacity < table.capacity
+
+
+def test_probe_prunes_only_repeats_in_same_iteration():
+    table = BoundedTranspositionTable(0)
+    assert not table.probe(12345, 5)
+    assert table.probe(12345, 5)
+    assert table.probe(12345, 7)
+    assert not table.probe(12345, 3)
+    table.new_iteration()
+    assert not table.probe(12345, 9)
+
+
+def _slot(table, state):
+    """Ô của trạng thái trong bảng (cùng cách băm với BoundedTranspositionTable.probe)"""
+    hashed = hash(state) & ((1 << 64) - 1)
+    return (hashed ^ (hashed >> 23) ^ (hashed >> 41)) & table.mask
+
+
+def test_wide_keys_never_prune_unseen_states():
+    table = BoundedTranspositionTable(0, 5 * 5 * 5)
+    seen = pack_state(random_board(5, random.Random(11)), 5)
+    assert not table.probe(seen, 1)
+    # Trạng thái khác rơi vào cùng ô với trạng thái đã gặp vẫn phải được duyệt
+    other = next(state for state in range(seen + 1, seen + 1 + 100 * table.capacity)
+                 if _slot(table, state) == _slot(table, seen))
+    assert not table.probe(other, 1)
+    assert table.probe(other, 1)
+
+
+def test_a_star_switches_to_ida_star_within_budget():
+    tiles = index_state(states_at_distance(31)[0])
+    solver = _solver(tiles, 3, memory_limit_mb=0.05)
+    moves = solver.solve_a_star()
+    assert solver.stats.algorithm == "ida_star"
+    assert len(moves) == 31
+
+
+def test_bounded_ida_star_stays_optimal():
+    rng = random.Random(12)
+    for _ in range(10):
+        tiles = random_board(3, rng)
+        solver = _solver(tiles, 3, memory_limit_mb=0.01)
+        assert len(solver.solve_ida_star()) == get_distance(tiles)
+        assert solver.stats.peak_visited <= 1 << 10
+
@@ -0,0 +1,56 @@
+"""Pattern database cộng tính: bảng của từng nhóm, file ánh xạ bộ nhớ và tính chấp nhận được"""
+import random
+
+import pytest
+
+import pattern_db
+from bot import BoardSnapshot, BotSolver
+from distance_table import get_distance
+from heuristics import ManhattanHeuristic
+from pattern_db import PatternDatabaseHeuristic, _build_group, load_pattern_database
+from scramble import random_board, random_walk
+
+
+def _group_value(table, pattern, tiles):
+    key = 0
+    for i, tile in enumerate(pattern):
+        key |= tiles.index(tile) << (4 * i)
+    return table[key]
+
+
+def test_additive_groups_on_3x3():
+    # Cùng cách dựng bảng với bàn 4x4, trên bàn 3x3 để so được với bảng khoảng cách chính xác
+    patterns = ((1, 2, 3, 4), (5, 6, 7, 8))
+    tables = [_build_group(pattern, 3) for pattern in patterns]
+    manhattan = ManhattanHeuristic(3)
+    rng = random.Random(9)
+    for _ in range(300):
+        tiles = random_board(3, rng)
+        h = sum(_group_value(table, pattern, tiles) for table, pattern in zip(tables, patterns))
+        assert manhattan.estimate(tiles) <= h <= get_distance(tiles)
+    assert sum(_group_value(table, pattern, list(range(1, 9)) + [0])
+               for table, pattern in zip(tables, patterns)) == 0
+
+
+def test_missing_or_invalid_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(pattern_db, "_loaded", None)
+    assert load_pattern_database(str(tmp_path / "missing.bin")) is None
+    bogus = tmp_path / "bogus.bin"
+    bogus.write_bytes(b"PDB1" + bytes(100))
+    assert load_pattern_database(str(bogus)) is None
+
+
+def test_admissible_on_4x4():
+    data = load_pattern_database()
+    if data is None:
+        pytest.skip("pattern database not built (python pattern_db.py)")
+    heuristic = PatternDatabaseHeuristic(data)
+    assert heuristic.estimate(list(range(1, 16)) + [0]) == 0
+
+    rng = random.Random(10)
+    for _ in range(5):
+        tiles = random_walk(4, 30, rng)
+        # Độ dài tối ưu tính độc lập với PDB (IDA* dùng khoảng cách Manhattan)
+        solver = BotSolver(BoardSnapshot([tiles[row * 4:(row + 1) * 4] for row in range(4)]), "manhattan")
+        optimal = len(solver.solve_ida_star())
+        assert ManhattanHeuristic(4).estimate(tiles) <= heuristic.estimate(tiles) <= optimal
@@ -0,0 +1,50 @@
+"""Bàn NxN: bộ giải rút gọn từng hàng/cột về lõi 3x3"""
+import random
+
+import pytest
+
+from bot import BoardSnapshot, BotSolver
+from constants import MAX_OPTIMAL_SIZE
+from distance_table import get_distance
+from reduction import solve_reduction
+from scramble import random_board
+
+
+def _positions(cells, size):
+    return [(cell // size, cell % size) for cell in cells]
+
+
+@pytest.mark.parametrize("size", [3, 4, 5, 6, 7, 8, 10])
+def test_solves_random_boards(puzzle, size):
+    rng = random.Random(size)
+    for _ in range(5):
+        tiles = random_board(size, rng)
+        cells, slides = solve_reduction(tiles, size)
+        assert slides >= len(cells)
+        assert puzzle.apply_moves(tiles, size, _positions(cells, size)) == puzzle.goal(size)
+
+
+def test_3x3_is_optimal():
+    rng = random.Random(70)
+    for _ in range(20):
+        tiles = random_board(3, rng)
+        assert len(solve_reduction(tiles, 3)[0]) == get_distance(tiles)
+
+
+@pytest.mark.parametrize("size", [3, 5, 6])
+def test_unsolvable(size):
+    tiles = random_board(size, random.Random(71))
+    # Đổi chỗ hai ô số làm bàn cờ không giải được
+    first, second = [index for index, tile in enumerate(tiles) if tile != 0][:2]
+    tiles[first], tiles[second] = tiles[second], tiles[first]
+    assert solve_reduction(tiles, size)[0] is None
+
+
+def test_optimal_falls_back_to_reduction_on_large_boards(puzzle):
+    size = MAX_OPTIMAL_SIZE + 1
+    tiles = random_board(size, random.Random(72))
+    solver = BotSolver(BoardSnapshot(puzzle.to_board(tiles, size)))
+    solver.stats_file = None
+    moves = solver.solve("optimal")
+    assert solver.stats.algorithm == "reduction"
+    assert puzzle.apply_moves(tiles, size, moves) == puzzle.goal(size)
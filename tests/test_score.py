@@ -0,0 +1,166 @@
+"""Lưu điểm: bản sao trong bộ nhớ, journal ghi nối, phát lại và gộp vào bản chụp"""
+import json
+
+import pytest
+
+import score
+from score import ScoreManager
+
+
+@pytest.fixture
+def scores_file(tmp_path, monkeypatch):
+    # Không chờ giữa hai lần kiểm tra file bị sửa, để thấy ngay thay đổi của bản game khác
+    monkeypatch.setattr(score, "SCORES_REFRESH_INTERVAL", 0.0)
+    return str(tmp_path / "scores.json")
+
+
+def _journal_lines(path):
+    with open(path + ".journal", 'rb') as f:
+        return [json.loads(line) for line in f.read().splitlines()]
+
+
+def _moves(scores):
+    return sorted(entry["moves"] for entry in scores)
+
+
+def test_save_appends_to_journal_and_replays(scores_file):
+    manager = ScoreManager(scores_file, write_behind=False)
+    for moves in (30, 40, 35):
+        manager.save_score(3, moves, 60)
+    manager.save_score(3, 50, 60, map_name="Map 1")
+
+    # Bản chụp chưa đổi, mỗi điểm là một dòng journal với số thứ tự tăng dần
+    with open(scores_file) as f:
+        assert json.load(f)["3x3"]["random"] == []
+    assert [line["seq"] for line in _journal_lines(scores_file)] == [1, 2, 3, 4]
+
+    reloaded = ScoreManager(scores_file, write_behind=False)
+    assert [entry["moves"] for entry in reloaded.get_high_scores(3)] == [30, 35, 40]
+    assert _moves(reloaded.get_high_scores(3, "Map 1")) == [50]
+    assert reloaded.get_all_scores() == manager.get_all_scores()
+
+
+def test_write_behind_flush(scores_file):
+    manager = ScoreManager(scores_file)
+    for moves in range(30, 40):
+        manager.save_score(4, moves + 30, 90)
+    # Bản sao trong bộ nhớ có ngay, file có sau flush
+    assert len(manager.get_high_scores(4)) == 10
+    manager.flush()
+    assert len(_journal_lines(scores_file)) == 10
+    manager.close()
+    assert len(ScoreManager(scores_file).get_high_scores(4)) == 10
+
+
+def test_torn_last_line_is_skipped(scores_file):
+    manager = ScoreManager(scores_file, write_behind=False)
+    manager.save_score(3, 30, 60)
+    with open(scores_file + ".journal", 'ab') as f:
+        f.write(b'{"seq": 2, "size": 3, "map": null, "sc')
+
+    reloaded = ScoreManager(scores_file, write_behind=False)
+    assert _moves(reloaded.get_high_scores(3)) == [30]
+
+    # Điểm tiếp theo bắt đầu dòng mới và vẫn đọc lại được
+    reloaded.save_score(3, 31, 60)
+    assert _moves(ScoreManager(scores_file).get_high_scores(3)) == [30, 31]
+
+
+def test_compact_folds_journal_into_snapshot(scores_file):
+    manager = ScoreManager(scores_file, write_behind=False)
+    for moves in (30, 31, 32):
+        manager.save_score(3, moves, 60)
+    manager.compact()
+
+    with open(scores_file) as f:
+        snapshot = json.load(f)
+    assert snapshot["_journal_seq"] == 3
+    assert _moves(snapshot["3x3"]["random"]) == [30, 31, 32]
+    # Journal chỉ còn dòng đánh dấu số thứ tự cuối
+    assert _journal_lines(scores_file) == [{"seq": 3}]
+
+    manager.save_score(3, 33, 60)
+    assert [line["seq"] for line in _journal_lines(scores_file)] == [3, 4]
+    assert _moves(ScoreManager(scores_file).get_high_scores(3)) == [30, 31, 32, 33]
+
+
+def test_compaction_interrupted_before_truncate(scores_file):
+    manager = ScoreManager(scores_file, write_behind=False)
+    for moves in (30, 31):
+        manager.save_score(3, moves, 60)
+    with open(scores_file + ".journal", 'rb') as f:
+        journal = f.read()
+    manager.compact()
+
+    # Dừng giữa lúc đổi tên bản chụp và xóa journal: các dòng đã gộp không được áp dụng lại
+    with open(scores_file + ".journal", 'wb') as f:
+        f.write(journal)
+    reloaded = ScoreManager(scores_file, write_behind=False)
+    assert _moves(reloaded.get_high_scores(3)) == [30, 31]
+    reloaded.save_score(3, 32, 60)
+    assert _journal_lines(scores_file)[-1]["seq"] == 3
+    assert _moves(ScoreManager(scores_file).get_high_scores(3)) == [30, 31, 32]
+
+
+def test_compacts_every_n_lines(scores_file, monkeypatch):
+    monkeypatch.setattr(score, "SCORES_COMPACT_EVERY", 3)
+    manager = ScoreManager(scores_file, write_behind=False)
+    for moves in (30, 31, 32, 33):
+        manager.save_score(3, moves, 60)
+
+    with open(scores_file) as f:
+        assert json.load(f)["_journal_seq"] == 3
+    assert [line["seq"] for line in _journal_lines(scores_file)] == [3, 4]
+    assert _moves(ScoreManager(scores_file).get_high_scores(3)) == [30, 31, 32, 33]
+
+
+def test_sees_scores_saved_by_another_instance(scores_file):
+    first = ScoreManager(scores_file, write_behind=False)
+    second = ScoreManager(scores_file, write_behind=False)
+    first.save_score(3, 30, 60)
+    assert _moves(second.get_high_scores(3)) == [30]
+
+    second.save_score(3, 31, 60)
+    second.compact()
+    first.save_score(3, 32, 60)
+    assert _moves(first.get_high_scores(3)) == [30, 31, 32]
+    assert _moves(second.get_high_scores(3)) == [30, 31, 32]
+
+
+def test_reads_files_only_when_changed(scores_file, monkeypatch):
+    manager = ScoreManager(scores_file, write_behind=False)
+    manager.save_score(3, 30, 60)
+    manager.get_high_scores(3)
+
+    reads = []
+    read_files = manager._read_files
+    monkeypatch.setattr(manager, "_read_files", lambda: reads.append(1) or read_files())
+    for _ in range(100):
+        manager.get_high_scores(3)
+    assert reads == []
+
+
+def test_corrupt_snapshot_is_moved_aside(scores_file):
+    with open(scores_file, 'w') as f:
+        f.write("{not json")
+    manager = ScoreManager(scores_file, write_behind=False)
+    assert manager.get_high_scores(3) == []
+    with open(scores_file + ".corrupt") as f:
+        assert f.read() == "{not json"
+
+    manager.save_score(3, 30, 60)
+    assert _moves(ScoreManager(scores_file).get_high_scores(3)) == [30]
+
+
+def test_frame_loop_does_not_touch_disk(tmp_path, monkeypatch):
+    manager = ScoreManager(str(tmp_path / "scores.json"), write_behind=False)
+    manager.save_score(3, 30, 60)
+    manager.get_high_scores(3)
+
+    # Trong SCORES_REFRESH_INTERVAL giây không đọc cả mtime của file
+    stats = []
+    monkeypatch.setattr(score, "file_id", lambda path: stats.append(path))
+    for _ in range(1000):
+        manager.get_high_scores(3)
+        manager.would_place(3, 1)
+    assert stats == []
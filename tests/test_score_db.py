@@ -0,0 +1,130 @@
+"""Lưu điểm bằng SQLite: bảng xếp hạng, truy vấn theo chỉ mục, phân vị và nhập từ scores.json"""
+import json
+
+import pytest
+
+import score_db
+from score import ScoreManager
+from score_db import ALL_MAPS, SQLiteScoreStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(score_db, "SCORES_REFRESH_INTERVAL", 0.0)
+    store = SQLiteScoreStore(str(tmp_path / "scores.db"))
+    yield store
+    store.close()
+
+
+def test_high_scores_keep_every_game(store):
+    for moves in range(30, 50):
+        store.save_score(3, moves, 60)
+    store.save_score(3, 25, 60, solver="optimal")
+    store.save_score(3, 40, 60, map_name="Map 1")
+
+    high_scores = store.get_high_scores(3)
+    assert len(high_scores) == 10
+    assert [entry["moves"] for entry in high_scores[:3]] == [25, 30, 31]
+    assert [entry["moves"] for entry in store.get_high_scores(3, solver="optimal")] == [25]
+    assert [entry["moves"] for entry in store.get_high_scores(3, "Map 1")] == [40]
+    assert len(store.top_scores(3, ALL_MAPS, limit=100)) == 22
+
+    assert store.rank(3, high_scores[0]["score"] + 1) == 1
+    assert not store.would_place(3, high_scores[-1]["score"])
+
+
+def test_percentiles_and_summary(store):
+    for moves in (30, 40, 50, 60):
+        store.save_score(3, moves, 60)
+    store.save_score(3, 30, 60, solver="optimal")
+    scores = sorted(entry["score"] for entry in store.top_scores(3, limit=10))
+
+    assert store.percentile(3, scores[0]) == 0.0
+    assert store.percentile(3, scores[-1] + 1) == 100.0
+    assert store.score_at_percentile(3, 50) == scores[2]
+    assert store.percentile(4, 100) is None
+
+    summary = store.solver_summary(3)
+    assert [(row["solver"], row["games"]) for row in summary] == [("player", 4), ("optimal", 1)]
+
+
+def test_sees_writes_from_another_connection(store, tmp_path):
+    store.save_score(3, 40, 60)
+    assert len(store.get_high_scores(3)) == 1
+    other = SQLiteScoreStore(str(tmp_path / "scores.db"))
+    other.save_score(3, 30, 60)
+    other.close()
+    assert [entry["moves"] for entry in store.get_high_scores(3)] == [30, 40]
+
+
+def test_leaderboard_queries_use_indexes(store):
+    # Cùng câu truy vấn với top_scores cho bảng ngẫu nhiên và bảng của một người giải
+    for where, params in (("size = ? AND map = ?", (3, "")),
+                          ("size = ? AND map = ? AND solver = ?", (3, "", "player"))):
+        query = f"SELECT {score_db._COLUMNS} FROM scores WHERE {where} ORDER BY score DESC, id LIMIT 10"
+        plan = " ".join(row[-1] for row in store._connection.execute("EXPLAIN QUERY PLAN " + query, params))
+        assert "USING INDEX" in plan or "USING COVERING INDEX" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def test_import_json_includes_journal_once(store, tmp_path):
+    path = str(tmp_path / "scores.json")
+    manager = ScoreManager(path, write_behind=False)
+    manager.save_score(3, 30, 60)
+    manager.save_score(3, 31, 60, solver="optimal")
+    manager.compact()
+    manager.save_score(4, 80, 120, map_name="Map 1")
+
+    assert store.import_json(path) == 3
+    assert store.import_json(path) == 0
+    assert [entry["moves"] for entry in store.get_high_scores(3)] == [30, 31]
+    assert [entry["moves"] for entry in store.get_high_scores(4, "Map 1")] == [80]
+
+
+def test_import_json_keeps_identical_games(store, tmp_path):
+    path = str(tmp_path / "scores.json")
+    manager = ScoreManager(path, write_behind=False)
+    for _ in range(2):
+        manager.save_score(3, 30, 60)
+    manager.save_score(3, 30, 60, solver="optimal")
+    manager.compact()
+    manager.save_score(3, 30, 60)
+
+    # Cùng tên, số bước, thời gian và ngày nhưng là bốn lượt chơi khác nhau
+    assert store.import_json(path) == 4
+    assert [entry["solver"] for entry in store.get_high_scores(3)].count("player") == 3
+
+
+def test_import_json_adds_only_new_games(store, tmp_path):
+    path = str(tmp_path / "scores.json")
+    manager = ScoreManager(path, write_behind=False)
+    manager.save_score(3, 30, 60)
+    assert store.import_json(path) == 1
+
+    # Lượt mới còn trong journal, và lượt mới đã được gộp vào bản chụp
+    manager.save_score(3, 30, 60)
+    assert store.import_json(path) == 1
+    manager.save_score(3, 31, 60)
+    manager.compact()
+    assert store.import_json(path) == 1
+    assert store.import_json(path) == 0
+    assert sorted(entry["moves"] for entry in store.get_high_scores(3)) == [30, 30, 31]
+
+    assert store.import_json(path, force=True) == 3
+    assert len(store.get_high_scores(3)) == 6
+
+
+def test_import_json_without_sequence_numbers(store, tmp_path):
+    game = {"moves": 30, "time": 60, "time_formatted": "01:00", "score": 9000, "date": "2024-01-01 10:00",
+            "solver": "player"}
+    bot = dict(game, solver="optimal", score=9500)
+    # File cũ: hai lượt giống hệt nhau, có mặt ở cả bảng chung và bảng của người giải
+    path = tmp_path / "scores.json"
+    path.write_text(json.dumps({"3x3": {
+        "random": [bot, game, game], "maps": {},
+        "solvers": {"player": {"random": [game, game], "maps": {}},
+                    "optimal": {"random": [bot], "maps": {}}}}}))
+
+    assert store.import_json(str(path)) == 3
+    assert store.import_json(str(path)) == 0
+    assert [entry["solver"] for entry in store.get_high_scores(3)] == ["optimal", "player", "player"]
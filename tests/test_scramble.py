@@ -0,0 +1,76 @@
+"""Sinh bàn cờ: kiểm tra giải được O(n), hoán vị đều và bàn theo số bước tối thiểu"""
+import collections
+import json
+import random
+
+import pytest
+
+import scramble
+import utils
+from distance_table import get_distance
+from scramble import is_solvable, random_board, random_walk, scramble_to_distance
+
+
+@pytest.mark.parametrize("size", [2, 3, 4, 5, 6])
+def test_is_solvable_matches_inversion_count(size):
+    rng = random.Random(size)
+    for _ in range(200):
+        tiles = list(range(size * size))
+        rng.shuffle(tiles)
+        assert is_solvable(tiles, size) == utils.is_solvable(tiles, size, tiles.index(0) // size)
+
+
+def test_is_solvable_matches_distance_table():
+    rng = random.Random(20)
+    for _ in range(500):
+        tiles = list(range(9))
+        rng.shuffle(tiles)
+        assert is_solvable(tiles, 3) == (get_distance(tiles) is not None)
+
+
+def test_random_board_is_uniform_over_solvable_states():
+    rng = random.Random(21)
+    counts = collections.Counter(tuple(random_board(2, rng)) for _ in range(12000))
+    # Bàn 2x2 có đúng 12 trạng thái giải được
+    assert len(counts) == 12
+    assert all(is_solvable(list(tiles), 2) for tiles in counts)
+    assert min(counts.values()) > 800 and max(counts.values()) < 1200
+
+
+def test_random_walk_distance_bound():
+    rng = random.Random(22)
+    for length in range(0, 30):
+        distance = get_distance(random_walk(3, length, rng))
+        assert distance <= length and distance % 2 == length % 2
+
+
+def test_scramble_to_distance_3x3():
+    rng = random.Random(23)
+    for low, high in ((0, 0), (20, 20), (25, 28), (31, 31)):
+        tiles, distance = scramble_to_distance(3, low, high, rng)
+        assert low <= distance <= high
+        assert get_distance(tiles) == distance
+    with pytest.raises(ValueError):
+        scramble_to_distance(3, 32)
+
+
+def test_scramble_to_distance_4x4():
+    tiles, distance = scramble_to_distance(4, 14, 16, random.Random(24))
+    assert 14 <= distance <= 16
+    assert scramble.optimal_distance(tiles, 4) == distance
+
+
+def test_cli_writes_json_lines(tmp_path):
+    output = tmp_path / "boards.jsonl"
+    scramble.main(["--size", "3", "--count", "5", "--distance", "12", "--seed", "1", "-o", str(output)])
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(lines) == 5
+    assert all(get_distance(line["board"]) == line["distance"] == 12 for line in lines)
+
+
+def test_generate_batch_is_solvable():
+    if scramble.np is None:
+        pytest.skip("NumPy is not installed")
+    for size in (3, 4, 5):
+        boards = scramble.generate_batch(size, 500, seed=size)
+        assert all(is_solvable([int(tile) for tile in board], size) for board in boards)
@@ -0,0 +1,100 @@
+"""Bộ nhớ đệm lời giải: khóa chuẩn hóa theo chuyển vị, tầng bộ nhớ/đĩa và ghi từ nhiều tiến trình"""
+import multiprocessing
+import random
+
+import pytest
+
+import solution_cache
+from distance_table import solve_with_table
+from scramble import random_board
+from solution_cache import SolutionCache, transpose_tiles
+
+WORKERS = 4
+PER_WORKER = 20
+
+_context = multiprocessing.get_context("spawn")
+
+
+def _board(tiles):
+    return [tiles[row * 3:(row + 1) * 3] for row in range(3)]
+
+
+def _boards(count, seed):
+    rng = random.Random(seed)
+    return [random_board(3, rng) for _ in range(count)]
+
+
+def _put_boards(worker, path):
+    cache = SolutionCache(path)
+    for tiles in _boards(PER_WORKER, seed=100 + worker):
+        cache.put(_board(tiles), "optimal", solve_with_table(tiles))
+    cache.close()
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(solution_cache, "SOLUTION_CACHE_REFRESH_INTERVAL", 0.0)
+    return str(tmp_path / "solutions")
+
+
+def test_round_trip_and_transposed_hit(puzzle, cache_path):
+    cache = SolutionCache(cache_path)
+    for tiles in _boards(20, seed=15):
+        cache.put(_board(tiles), "optimal", solve_with_table(tiles))
+        assert cache.get(_board(tiles), "optimal") == solve_with_table(tiles)
+
+        # Bàn chuyển vị dùng chung khóa và nhận lời giải đã chuyển vị
+        transposed = transpose_tiles(tiles, 3)
+        moves = cache.get(_board(transposed), "optimal")
+        assert puzzle.apply_moves(transposed, 3, moves) == puzzle.goal(3)
+        assert len(moves) == len(solve_with_table(tiles))
+    assert cache.get(_board(_boards(1, seed=16)[0]), "optimal") is None
+    assert cache.get(_board(_boards(1, seed=15)[0]), "bfs") is None
+    cache.close()
+
+
+def test_rejects_invalid_solution(cache_path):
+    cache = SolutionCache(cache_path)
+    tiles = _boards(1, seed=17)[0]
+    cache.put(_board(tiles), "optimal", solve_with_table(tiles)[:-1])
+    assert cache.get(_board(tiles), "optimal") is None
+    cache.close()
+
+
+def test_persists_beyond_memory_capacity(cache_path):
+    boards = _boards(10, seed=18)
+    cache = SolutionCache(cache_path, capacity=2)
+    for tiles in boards:
+        cache.put(_board(tiles), "optimal", solve_with_table(tiles))
+    cache.flush()
+    # Tầng bộ nhớ chỉ giữ 2 lời giải, phần còn lại đọc từ đĩa
+    assert all(cache.get(_board(tiles), "optimal") == solve_with_table(tiles) for tiles in boards)
+    cache.close()
+
+    reopened = SolutionCache(cache_path)
+    assert all(reopened.get(_board(tiles), "optimal") == solve_with_table(tiles) for tiles in boards)
+    reopened.close()
+
+
+def test_memory_only_without_path():
+    cache = SolutionCache(None)
+    tiles = _boards(1, seed=19)[0]
+    cache.put(_board(tiles), "optimal", solve_with_table(tiles))
+    assert cache.get(_board(tiles), "optimal") == solve_with_table(tiles)
+    cache.close()
+
+
+def test_concurrent_processes(cache_path):
+    SolutionCache(cache_path).close()
+    processes = [_context.Process(target=_put_boards, args=(worker, cache_path)) for worker in range(WORKERS)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    cache = SolutionCache(cache_path)
+    for worker in range(WORKERS):
+        for tiles in _boards(PER_WORKER, seed=100 + worker):
+            assert cache.get(_board(tiles), "optimal") == solve_with_table(tiles)
+    cache.close()
@@ -0,0 +1,78 @@
+"""Thống kê lượt giải: có cho mọi chế độ, khớp với lời giải, ghi được ra file JSONL"""
+import json
+import random
+
+import pytest
+
+from batch_solve import ALGORITHMS
+from bot import BoardSnapshot, BotSolver
+from scramble import random_board, random_walk
+from solver_stats import SOLVED, SolverStats
+
+
+def _solver(tiles, size):
+    solver = BotSolver(BoardSnapshot([tiles[row * size:(row + 1) * size] for row in range(size)]))
+    solver.stats_file = None
+    return solver
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_every_mode_records_stats(algorithm):
+    tiles = random_board(3, random.Random(120))
+    solver = _solver(tiles, 3)
+    moves, stats = solver.solve_with_stats(algorithm, 1.0)
+    assert stats is solver.stats
+    assert stats.size == 3 and stats.elapsed >= 0
+    assert stats.termination is not None
+    assert stats.nodes_expanded > 0
+    if stats.termination == SOLVED:
+        assert stats.solution_length == len(moves)
+        assert stats.time_to_first_solution is not None
+    else:
+        assert stats.solution_length is None
+
+
+def test_search_counts_nodes():
+    tiles = random_walk(4, 40, random.Random(121))
+    solver = _solver(tiles, 4)
+    solver.solve_a_star()
+    stats = solver.stats
+    assert stats.algorithm == "a_star"
+    assert 0 < stats.nodes_expanded <= stats.nodes_generated + 1
+    assert stats.heuristic_calls == stats.nodes_generated + 1
+    assert stats.peak_frontier > 0 and stats.peak_visited > 0
+
+
+def test_ida_star_records_depth_and_table_use():
+    tiles = random_walk(4, 40, random.Random(122))
+    solver = _solver(tiles, 4)
+    moves = solver.solve_ida_star()
+    stats = solver.stats
+    # Tập biên là ngăn xếp đệ quy: sâu nhất bằng độ dài lời giải (nút đích ở độ sâu cuối)
+    assert stats.peak_frontier == len(moves)
+    assert 0 < stats.peak_visited <= stats.nodes_expanded
+
+
+def test_solved_board():
+    solver = _solver(list(range(1, 9)) + [0], 3)
+    assert solver.solve("optimal") == []
+    assert solver.stats.termination == SOLVED and solver.stats.solution_length == 0
+
+
+def test_appends_jsonl(tmp_path):
+    path = tmp_path / "stats" / "solver_stats.jsonl"
+    for seed in range(3):
+        solver = _solver(random_board(3, random.Random(seed)), 3)
+        solver.stats_file = str(path)
+        solver.solve("optimal")
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(records) == 3
+    assert set(SolverStats("a_star", 3).to_dict()) | {"timestamp"} == set(records[0])
+    assert all(record["termination"] == SOLVED for record in records)
+
+
+def test_summary():
+    stats = SolverStats("ida_star", 4, "pdb")
+    stats.nodes_expanded = 1000
+    stats.finish(SOLVED, [(0, 0)] * 12)
+    assert stats.summary().startswith("ida_star: solved, 12 steps, 1,000 nodes")
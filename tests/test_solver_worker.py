@@ -0,0 +1,58 @@
+"""Giải trong tiến trình riêng: kết quả, tiến độ, hủy, và tiến trình con không nạp pygame"""
+import os
+import random
+import subprocess
+import sys
+import time
+
+from distance_table import get_distance
+from scramble import random_board
+from solver_worker import SolverJob
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _wait(job, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        result = job.poll()
+        if result is not None:
+            return result
+        time.sleep(0.01)
+    job.cancel()
+    raise AssertionError("solver job did not finish")
+
+
+def test_job_returns_solution_and_stats(puzzle):
+    tiles = random_board(3, random.Random(40))
+    job = SolverJob(puzzle.to_board(tiles, 3), "optimal")
+    job.start()
+    moves = _wait(job)
+    assert job.finished
+    assert puzzle.apply_moves(tiles, 3, moves) == puzzle.goal(3)
+    assert len(moves) == get_distance(tiles)
+    assert job.stats.termination == "solved"
+
+
+def test_progress_and_cancel(puzzle):
+    # IDA* với khoảng cách Manhattan trên bàn 4x4 ngẫu nhiên chạy đủ lâu để báo tiến độ
+    tiles = random_board(4, random.Random(41))
+    job = SolverJob(puzzle.to_board(tiles, 4), "optimal", heuristic="manhattan")
+    job.start()
+    deadline = time.time() + 30
+    while job.nodes == 0 and time.time() < deadline:
+        assert job.poll() is None
+        time.sleep(0.01)
+    assert job.nodes > 0
+
+    job.cancel()
+    assert job.finished and job.result is None
+    assert not job._process.is_alive()
+    assert job.poll() is None
+
+
+def test_spawned_children_do_not_import_pygame():
+    # Tiến trình con "spawn" import lại main.py dưới tên __mp_main__
+    code = "import sys, main; print('pygame' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "False"
@@ -0,0 +1,80 @@
+"""Bộ giải tối ưu A*/IDA*: lời giải hợp lệ và có độ dài bằng bảng khoảng cách 3x3"""
+import random
+
+import pytest
+
+from bot import BoardSnapshot, BotSolver
+from distance_table import get_distance, solve_with_table
+from scramble import random_board, random_walk
+
+
+def _solver(tiles, size, **kwargs):
+    solver = BotSolver(BoardSnapshot([tiles[row * size:(row + 1) * size] for row in range(size)]), **kwargs)
+    solver.stats_file = None
+    return solver
+
+
+def _boards_3x3(count, seed):
+    rng = random.Random(seed)
+    return [random_board(3, rng) for _ in range(count)]
+
+
+@pytest.mark.parametrize("method", ["solve_a_star", "solve_ida_star"])
+def test_optimal_search_matches_distance_table(puzzle, method):
+    for tiles in _boards_3x3(15, seed=1):
+        moves = getattr(_solver(tiles, 3), method)()
+        assert puzzle.apply_moves(tiles, 3, moves) == puzzle.goal(3)
+        assert len(moves) == get_distance(tiles)
+
+
+def test_distance_table_plan_is_optimal(puzzle):
+    for tiles in _boards_3x3(50, seed=2):
+        moves = solve_with_table(tiles)
+        assert puzzle.apply_moves(tiles, 3, moves) == puzzle.goal(3)
+        assert len(moves) == get_distance(tiles)
+
+
+@pytest.mark.parametrize("algorithm", ["optimal", "bfs", "hill_climbing", "reduction"])
+def test_solve_returns_valid_plan(puzzle, algorithm):
+    for tiles in _boards_3x3(5, seed=3):
+        solver = _solver(tiles, 3)
+        moves = solver.solve(algorithm)
+        final = puzzle.apply_moves(tiles, 3, moves)
+        # Hill Climbing trả về đường đi dở dang khi kẹt ở cực tiểu địa phương
+        if solver.stats.termination == "solved":
+            assert final == puzzle.goal(3)
+
+
+def test_ida_star_agrees_with_a_star_on_4x4(puzzle):
+    rng = random.Random(4)
+    for _ in range(5):
+        tiles = random_walk(4, 30, rng)
+        ida = _solver(tiles, 4).solve_ida_star()
+        a_star = _solver(tiles, 4).solve_a_star()
+        assert puzzle.apply_moves(tiles, 4, ida) == puzzle.goal(4)
+        assert puzzle.apply_moves(tiles, 4, a_star) == puzzle.goal(4)
+        assert len(ida) == len(a_star) <= 30
+
+
+def test_solved_and_unsolvable_boards():
+    solver = _solver([1, 2, 3, 4, 5, 6, 7, 8, 0], 3)
+    assert solver.solve("optimal") == []
+    assert solver.stats.termination == "solved"
+
+    unsolvable = [2, 1, 3, 4, 5, 6, 7, 8, 0]
+    assert get_distance(unsolvable) is None
+    for method in ("solve_optimal", "solve_a_star"):
+        assert getattr(_solver(unsolvable, 3), method)() == []
+
+
+@pytest.mark.parametrize("method", ["solve_best_first_search", "solve_a_star"])
+def test_parent_pointer_paths_on_4x4(puzzle, method):
+    # Đường đi dựng lại từ bảng nút cha (chỉ lưu vị trí ô trống của nút cha)
+    rng = random.Random(5)
+    for _ in range(5):
+        tiles = random_walk(4, 40, rng)
+        solver = _solver(tiles, 4)
+        moves = getattr(solver, method)()
+        assert solver.stats.termination == "solved"
+        assert puzzle.apply_moves(tiles, 4, moves) == puzzle.goal(4)
+        assert solver.stats.solution_length == len(moves)
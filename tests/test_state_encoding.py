@@ -0,0 +1,23 @@
+"""Mã hóa trạng thái thành số nguyên"""
+import random
+
+import pytest
+
+from bot import pack_state, tile_bits, unpack_state
+from scramble import random_board
+
+
+@pytest.mark.parametrize("size", [2, 3, 4, 5, 6, 8])
+def test_pack_round_trip(size):
+    rng = random.Random(size)
+    bits = tile_bits(size)
+    assert (size * size - 1).bit_length() <= bits
+    for _ in range(20):
+        tiles = random_board(size, rng)
+        state = pack_state(tiles, size)
+        assert unpack_state(state, size) == tiles
+        assert state.bit_length() <= size * size * bits
+
+
+def test_4x4_fits_in_64_bits():
+    assert pack_state(list(range(15, -1, -1)), 4) < 1 << 64
@@ -0,0 +1,25 @@
+"""Các bảng tra cứu tính sẵn: ô kề, nước đi không quay ngược, khoảng cách Manhattan"""
+import pytest
+
+from tables import manhattan_table, move_table, neighbor_table
+
+
+@pytest.mark.parametrize("size", [2, 3, 4, 5])
+def test_move_table_skips_reverse_move(size):
+    neighbors = neighbor_table(size)
+    moves = move_table(size)
+    for blank in range(size * size):
+        row, col = divmod(blank, size)
+        assert sorted(neighbors[blank]) == sorted(
+            cell for cell in range(size * size) if abs(cell // size - row) + abs(cell % size - col) == 1)
+        # Gốc (-1): mọi ô kề; sau một nước đi: mọi ô kề trừ ô trống vừa rời
+        assert moves[blank][-1] == neighbors[blank]
+        for previous in neighbors[blank]:
+            assert sorted(moves[blank][previous]) == sorted(set(neighbors[blank]) - {previous})
+
+
+def test_manhattan_table():
+    table = manhattan_table(4)
+    assert all(distance == 0 for distance in table[0])
+    assert table[1][15] == 6
+    assert all(table[tile][tile - 1] == 0 for tile in range(1, 16))
@@ -0,0 +1,77 @@
+"""Tìm kiếm theo khối bằng NumPy: sinh con, khóa, heuristic theo mảng và beam search"""
+import random
+
+import pytest
+
+import vector_search
+from bot import BoardSnapshot, BotSolver, pack_state
+from heuristics import get_heuristic
+from scramble import random_board, random_walk
+from tables import neighbor_table
+
+needs_numpy = pytest.mark.skipif(not vector_search.is_available(), reason="NumPy is not installed")
+
+
+def _children(tiles, size):
+    blank = tiles.index(0)
+    for cell in neighbor_table(size)[blank]:
+        child = list(tiles)
+        child[blank], child[cell] = child[cell], 0
+        yield tuple(child)
+
+
+@needs_numpy
+@pytest.mark.parametrize("size", [3, 4, 5])
+def test_expand_and_keys(size):
+    rng = random.Random(80 + size)
+    boards = [random_board(size, rng) for _ in range(50)]
+    states = vector_search.encode_states(boards, size)
+    blanks = vector_search.np.array([board.index(0) for board in boards])
+
+    children, moved, parents, old_blanks, tiles = vector_search.expand(states, blanks, size)
+    for parent, board in enumerate(boards):
+        rows = children[parents == parent]
+        assert {tuple(int(tile) for tile in row) for row in rows} == set(_children(board, size))
+
+    keys = vector_search.state_keys(states, size)
+    if size <= 4:
+        assert [int(key) for key in keys] == [pack_state(board, size) for board in boards]
+    assert len(set(keys.tolist())) == len(boards)
+
+
+@needs_numpy
+@pytest.mark.parametrize("size, name", [(3, None), (4, "manhattan"), (4, "pdb"), (5, None)])
+def test_batch_heuristic_matches_scalar(size, name):
+    evaluate = vector_search.BatchHeuristic(name, size)
+    scalar = get_heuristic(evaluate.name, size)
+    rng = random.Random(90 + size)
+    boards = [random_board(size, rng) for _ in range(50)]
+    states = vector_search.encode_states(boards, size)
+    blanks = vector_search.np.array([board.index(0) for board in boards])
+
+    h, keys = evaluate.start(states)
+    assert h.tolist() == [scalar.estimate(board) for board in boards]
+
+    children, moved, parents, old_blanks, tiles = vector_search.expand(states, blanks, size)
+    child_h, _ = evaluate.move(h[parents], None if keys is None else keys[parents], tiles, moved, old_blanks)
+    assert child_h.tolist() == evaluate(children).tolist()
+
+
+@needs_numpy
+@pytest.mark.parametrize("size", [3, 4, 5])
+def test_beam_search_solves(puzzle, size):
+    tiles = random_board(size, random.Random(100 + size)) if size < 5 else random_walk(5, 60, random.Random(105))
+    cells = vector_search.beam_search(tiles, size, width=2000)
+    moves = [(cell // size, cell % size) for cell in cells]
+    assert puzzle.apply_moves(tiles, size, moves) == puzzle.goal(size)
+
+
+def test_beam_mode_without_numpy(puzzle, monkeypatch):
+    monkeypatch.setattr(vector_search, "np", None)
+    tiles = random_board(3, random.Random(110))
+    solver = BotSolver(BoardSnapshot(puzzle.to_board(tiles, 3)))
+    solver.stats_file = None
+    moves = solver.solve("beam")
+    # Không có NumPy thì dùng Best First Search
+    assert solver.stats.algorithm == "best_first"
+    assert puzzle.apply_moves(tiles, 3, moves) == puzzle.goal(3)
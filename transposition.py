@@ -0,0 +1,89 @@
+"""
+Bảng chuyển vị kích thước cố định cho IDA*
+
+Thay cho dict (lớn dần theo số trạng thái gặp trong một lần lặp), bảng dùng
+ba mảng cấp phát một lần theo ngân sách bộ nhớ (memory_limit_mb của bộ giải,
+hoặc IDA_TRANSPOSITION_MB): khóa trạng thái, chi phí g và số thứ tự lần lặp
+ghi mục đó. Mỗi trạng thái chỉ có một ô (theo giá trị băm),
+khi hai trạng thái tranh nhau một ô thì áp dụng chính sách thay thế:
+- Ô trống hoặc ô của lần lặp trước: ghi đè
+- Cùng lần lặp: chỉ ghi đè khi g mới nhỏ hơn hoặc bằng (mục gần gốc cắt được
+  cây con lớn hơn)
+
+Mất một mục chỉ làm IDA* duyệt lại một số nút, không ảnh hưởng tính đúng đắn.
+Bảng luôn so sánh toàn bộ khóa trạng thái (không bao giờ chỉ so giá trị băm),
+nên không có hai trạng thái nào bị nhầm là một: với bàn lớn hơn 4x4 (khóa dài
+hơn 64 bit) các khóa được giữ trong list thay cho mảng 64 bit.
+"""
+import sys
+from array import array
+
+# Byte cho mỗi mục: khóa 8, g 2, lần lặp 2
+ENTRY_BYTES = 12
+
+_MAX_KEY = (1 << 64) - 1
+_MIN_CAPACITY = 1 << 10
+
+
+class BoundedTranspositionTable:
+    """Bảng chuyển vị có số mục cố định (lũy thừa của 2) theo ngân sách bộ nhớ"""
+
+    def __init__(self, memory_bytes, key_bits=64):
+        """
+        Args:
+            memory_bytes: Số byte tối đa dành cho bảng
+            key_bits: Số bit của khóa trạng thái (số ô nhân số bit mỗi ô)
+        """
+        entry_bytes = ENTRY_BYTES
+        if key_bits > 64:
+            # Con trỏ trong list cộng số nguyên Python của khóa
+            entry_bytes += sys.getsizeof(1 << key_bits)
+        capacity = max(_MIN_CAPACITY, 1 << max(0, (memory_bytes // entry_bytes).bit_length() - 1))
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.keys = array('Q', bytes(8 * capacity)) if key_bits <= 64 else [0] * capacity
+        self.depths = array('H', bytes(2 * capacity))
+        self.iterations = array('H', bytes(2 * capacity))
+        self.iteration = 1
+        self.used = 0  # Số ô đã ghi trong lần lặp hiện tại
+
+    def new_iteration(self):
+        """Bắt đầu lần lặp mới: các mục cũ không còn dùng để cắt tỉa (không cần xóa bảng)"""
+        self.iteration += 1
+        self.used = 0
+        if self.iteration > 0xFFFF:
+            # Hết số thứ tự: xóa thẻ cũ để không nhầm với lần lặp mới
+            self.iterations = array('H', bytes(2 * self.capacity))
+            self.iteration = 1
+
+    def probe(self, state, g):
+        """
+        Kiểm tra và ghi nhận trạng thái
+
+        Args:
+            state: Trạng thái đã mã hóa (số nguyên)
+            g: Chi phí từ gốc tới trạng thái
+
+        Returns:
+            bool: True nếu trạng thái đã gặp trong lần lặp này với g nhỏ hơn hoặc
+            bằng (có thể bỏ qua), False nếu cần duyệt tiếp
+        """
+        # Khóa dài hơn 64 bit (bàn lớn hơn 4x4): băm chỉ để chọn ô, vẫn so sánh khóa đầy đủ
+        hashed = state if state <= _MAX_KEY else hash(state) & _MAX_KEY
+        slot = (hashed ^ (hashed >> 23) ^ (hashed >> 41)) & self.mask
+
+        if self.iterations[slot] == self.iteration:
+            stored_g = self.depths[slot]
+            if self.keys[slot] == state:
+                if stored_g <= g:
+                    return True
+            elif stored_g < g:
+                # Giữ mục gần gốc hơn
+                return False
+        else:
+            self.used += 1
+
+        self.keys[slot] = state
+        self.depths[slot] = g
+        self.iterations[slot] = self.iteration
+        return False
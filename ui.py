@@ -1,5 +1,4 @@
 import pygame
-from score import ScoreManager
 from constants import *
 
 
@@ -37,8 +36,9 @@ class UI:
     def __init__(self, screen, game):
         self.screen = screen
         self.game = game
-        self.score_manager = ScoreManager()
+        self.score_manager = self.game.score_manager
         self.level_manager = self.game.level_manager
+        self.custom_size = 5  # Kích thước của nút "New NxN"
 
         # Lấy kích thước màn hình
         self.screen_width = screen.get_width()
@@ -105,6 +105,31 @@ class UI:
                 BUTTON_WIDTH,
                 BUTTON_HEIGHT
             ),
+            # Bàn kích thước tùy chọn (5x5 đến MAX_BOARD_SIZE)
+            'custom_size_down': Button(
+                self.screen,
+                "-",
+                self.control_area_x + 2 * (BUTTON_WIDTH + BUTTON_SPACING),
+                self.control_area_y,
+                BUTTON_HEIGHT,
+                BUTTON_HEIGHT
+            ),
+            'new_game_custom': Button(
+                self.screen,
+                f"New {self.custom_size}x{self.custom_size}",
+                self.control_area_x + 2 * (BUTTON_WIDTH + BUTTON_SPACING) + BUTTON_HEIGHT + BUTTON_SPACING,
+                self.control_area_y,
+                BUTTON_WIDTH,
+                BUTTON_HEIGHT
+            ),
+            'custom_size_up': Button(
+                self.screen,
+                "+",
+                self.control_area_x + 3 * (BUTTON_WIDTH + BUTTON_SPACING) + BUTTON_HEIGHT + BUTTON_SPACING,
+                self.control_area_y,
+                BUTTON_HEIGHT,
+                BUTTON_HEIGHT
+            ),
             'solve_bfs': Button(
                 self.screen,
                 "Solve BFS",
@@ -113,13 +138,38 @@ class UI:
                 BUTTON_WIDTH,
                 BUTTON_HEIGHT
             ),
-            'solve_hill': Button(
+            'solve_local': Button(
                 self.screen,
-                "Hill Climbing",
+                "Local Search",
                 self.board_x + BUTTON_WIDTH + BUTTON_SPACING,
                 self.board_y + self.board_size + 20,
                 BUTTON_WIDTH + 40,
                 BUTTON_HEIGHT
+            ),
+            'solve_optimal': Button(
+                self.screen,
+                "Optimal",
+                self.board_x + 2 * (BUTTON_WIDTH + BUTTON_SPACING) + 40,
+                self.board_y + self.board_size + 20,
+                BUTTON_WIDTH,
+                BUTTON_HEIGHT
+            ),
+            'solve_anytime': Button(
+                self.screen,
+                "Anytime",
+                self.board_x + 3 * (BUTTON_WIDTH + BUTTON_SPACING) + 40,
+                self.board_y + self.board_size + 20,
+                BUTTON_WIDTH,
+                BUTTON_HEIGHT
+            ),
+            # Gợi ý nước đi tiếp theo (đặt bên trái, cùng hàng với các nút giải)
+            'hint': Button(
+                self.screen,
+                "Hint",
+                self.control_area_x,
+                self.board_y + self.board_size + 20,
+                BUTTON_WIDTH,
+                BUTTON_HEIGHT
             )
         }
 
@@ -177,10 +227,23 @@ class UI:
                     elif name == 'new_game_4x4':
                         self.game.new_game(4)
                         self.update_tile_size()
+                    elif name == 'new_game_custom':
+                        self.game.new_game(self.custom_size)
+                        self.update_tile_size()
+                    elif name in ('custom_size_down', 'custom_size_up'):
+                        step = 1 if name == 'custom_size_up' else -1
+                        self.custom_size = min(MAX_BOARD_SIZE, max(5, self.custom_size + step))
+                        self.buttons['new_game_custom'].text = f"New {self.custom_size}x{self.custom_size}"
                     elif name == 'solve_bfs':
                         self.game.start_bot("bfs")
-                    elif name == 'solve_hill':
-                        self.game.start_bot("hill_climbing")
+                    elif name == 'solve_local':
+                        self.game.start_bot("local_search")
+                    elif name == 'solve_optimal':
+                        self.game.start_bot("optimal")
+                    elif name == 'solve_anytime':
+                        self.game.start_bot("anytime")
+                    elif name == 'hint':
+                        self.game.hint()
 
             # Kiểm tra click vào nút map 3x3
             for name, button in self.map_buttons_3x3.items():
@@ -292,8 +355,13 @@ class UI:
                                         self.tile_size - 2 * self.tile_margin,
                                         self.tile_size - 2 * self.tile_margin)
 
-                # Màu ô dựa vào trạng thái giải
-                tile_color = SOLVED_COLOR if self.game.is_solved else TILE_COLOR
+                # Màu ô dựa vào trạng thái giải (ô được gợi ý có màu riêng)
+                if self.game.is_solved:
+                    tile_color = SOLVED_COLOR
+                elif self.game.hint_move == (row, col) and not self.game.is_animating:
+                    tile_color = HINT_COLOR
+                else:
+                    tile_color = TILE_COLOR
 
                 pygame.draw.rect(self.screen, tile_color, tile_rect)
                 pygame.draw.rect(self.screen, TILE_BORDER_COLOR, tile_rect, 2)
@@ -322,6 +390,26 @@ class UI:
         if self.game.bot_total_moves > 0:
             bot_moves_text = self.small_font.render(f"Bot Moves: {self.game.bot_total_moves}", True, (0, 0, 0))
             self.screen.blit(bot_moves_text, (info_x + 300, info_y))
+        elif self.game.game_active and self.game.moves > 0:
+            # Hạng dự kiến nếu giải xong ngay bây giờ (tra heap của bảng điểm cao, O(k))
+            rank = self.game.projected_rank()
+            rank_label = f"Rank: #{rank}" if rank is not None else "Rank: -"
+            rank_text = self.small_font.render(rank_label, True, (0, 0, 0))
+            self.screen.blit(rank_text, (info_x + 300, info_y))
+
+        # Hiển thị tiến độ khi bot đang tìm lời giải
+        progress = self.game.get_solver_progress()
+        if progress is not None:
+            nodes, elapsed = progress
+            # Bộ giải anytime tiếp tục tìm lời giải ngắn hơn trong lúc bot đi
+            status = "Improving" if self.game.bot_active else "Solving"
+            progress_text = self.small_font.render(
+                f"{status}... {nodes:,} nodes - {elapsed:.1f}s", True, (0, 0, 0))
+            self.screen.blit(progress_text, (info_x, info_y + 25))
+        elif self.game.last_solver_stats is not None and not self.game.is_solved:
+            # Thống kê của lượt giải gần nhất
+            stats_text = self.small_font.render(self.game.last_solver_stats.summary(), True, (0, 0, 0))
+            self.screen.blit(stats_text, (info_x, info_y + 25))
 
         # Hiển thị thông báo khi giải xong
         if self.game.is_solved:
@@ -365,7 +453,7 @@ class UI:
                     pygame.draw.rect(self.screen, TILE_BORDER_COLOR, tile_rect, 1)
 
                     # Vẽ số
-                    font_size = 16 if self.game.size == 3 else 12
+                    font_size = 16 if self.game.size == 3 else 12 if self.game.size <= 6 else 8
                     number_font = pygame.font.SysFont('Arial', font_size)
                     text_surface = number_font.render(str(counter), True, TEXT_COLOR)
                     text_rect = text_surface.get_rect(center=tile_rect.center)
@@ -405,6 +493,12 @@ class UI:
                         solver_info = "BFS"
                     elif score["solver"] == "hill_climbing":
                         solver_info = "Hill Climbing"
+                    elif score["solver"] == "local_search":
+                        solver_info = "Local Search"
+                    elif score["solver"] == "optimal":
+                        solver_info = "Optimal"
+                    elif score["solver"] == "anytime":
+                        solver_info = "Anytime"
                     else:
                         solver_info = score["solver"]
 
@@ -6,7 +6,7 @@ def is_solvable(flat_board, size, empty_row):
 
     Args:
         flat_board: Danh sách 1D chứa các số trên bàn cờ
-        size: Kích thước bàn cờ (3 hoặc 4)
+        size: Kích thước bàn cờ (n cho bàn n x n)
         empty_row: Hàng của ô trống (tính từ 0)
 
     Returns:
@@ -26,9 +26,9 @@ def is_solvable(flat_board, size, empty_row):
                 inversions += 1
 
     # Kiểm tra theo quy tắc
-    if size % 2 == 1:  # Bàn cờ 3x3
+    if size % 2 == 1:  # Cạnh lẻ (3x3, 5x5, ...)
         return inversions % 2 == 0
-    else:  # Bàn cờ 4x4
+    else:  # Cạnh chẵn (4x4, 6x6, ...)
         # Nếu hàng ô trống (tính từ dưới lên) là lẻ,
         # số đảo ngược phải chẵn để có thể giải được
         if (size - empty_row) % 2 == 1:
@@ -44,7 +44,7 @@ def get_solution_state(size):
     Tạo trạng thái đã giải của bàn cờ
 
     Args:
-        size: Kích thước bàn cờ (3 hoặc 4)
+        size: Kích thước bàn cờ (n cho bàn n x n)
 
     Returns:
         list: Danh sách 1D chứa các số theo thứ tự đúng
@@ -93,7 +93,25 @@ def format_time(seconds):
     return f"{minutes:02d}:{secs:02d}"
 
 
-def calculate_score(moves, time, size):
+def get_min_moves(size):
+    """
+    Số bước tối thiểu ước lượng của một bàn trộn ngẫu nhiên
+
+    Args:
+        size: Kích thước bàn cờ
+
+    Returns:
+        int: Số bước tối thiểu ước lượng
+    """
+    if size == 3:
+        return MIN_MOVES_3X3
+    if size == 4:
+        return MIN_MOVES_4X4
+    # Tổng khoảng cách Manhattan trung bình: mỗi ô cách đích khoảng 2n/3 bước
+    return (size * size - 1) * 2 * size // 3
+
+
+def calculate_score(moves, time, size, min_moves=None):
     """
     Tính điểm dựa trên số bước và thời gian
 
@@ -101,21 +119,20 @@ def calculate_score(moves, time, size):
         moves: Số bước đi
         time: Thời gian (giây)
         size: Kích thước bàn cờ
+        min_moves: Số bước tối thiểu thật của bàn đã chơi (None nếu chưa biết)
 
     Returns:
         int: Điểm số
     """
-    # Số bước tối thiểu lý thuyết (không thực tế)
-    min_moves = {
-        3: MIN_MOVES_3X3,  # 3x3
-        4: MIN_MOVES_4X4  # 4x4
-    }
+    # Số bước tối thiểu lý thuyết (không thực tế), dùng khi không biết giá trị thật
+    if min_moves is None:
+        min_moves = get_min_moves(size)
 
     # Càng ít bước và thời gian càng tốt
     time_factor = 0.5  # Trọng số của thời gian
 
     base_score = 10000
-    move_penalty = max(0, moves - min_moves[size]) * 10
+    move_penalty = max(0, moves - min_moves) * 10
     time_penalty = time * time_factor
 
     score = base_score - move_penalty - time_penalty
@@ -0,0 +1,405 @@
+"""
+Tìm kiếm theo khối bằng NumPy (phụ thuộc tùy chọn)
+
+Thay vì sinh và đánh giá từng trạng thái trong vòng lặp Python, cả tầng biên
+được giữ trong một ma trận uint8 (mỗi hàng một trạng thái, mỗi cột một vị trí)
+và được xử lý bằng các phép toán trên mảng:
+- expand: sinh mọi trạng thái con bằng phép gather theo bảng ô kề
+- BatchHeuristic: heuristic của cả khối bằng tra bảng (Manhattan hoặc pattern database),
+  cùng giao diện start/move tăng dần như heuristics.py nhưng trên mảng
+- state_keys: khóa số nguyên của cả khối để loại trạng thái trùng
+
+Dùng cho beam search, BFS theo tầng và công cụ giải hàng loạt. Nếu chưa cài
+NumPy (pip install numpy) thì is_available() trả về False và BotSolver dùng
+lại các thuật toán thuần Python.
+
+Đo tốc độ so với vòng lặp từng trạng thái:
+    python vector_search.py
+"""
+import time
+from functools import lru_cache
+from constants import BEAM_WIDTH
+from pattern_db import PatternDatabaseHeuristic, PATTERNS_4X4, load_pattern_database
+from tables import manhattan_table, neighbor_table
+
+try:
+    import numpy as np
+except ImportError:  # NumPy là phụ thuộc tùy chọn
+    np = None
+
+
+def is_available():
+    """NumPy đã được cài đặt chưa"""
+    return np is not None
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("NumPy is required for the batched search backend (pip install numpy)")
+
+
+@lru_cache(maxsize=None)
+def _neighbor_array(size):
+    """Mảng (số ô, 4) các ô kề của mỗi vị trí (theo tables.neighbor_table), -1 ở chỗ trống"""
+    cells = size * size
+    neighbors = np.full((cells, 4), -1, dtype=np.int64)
+    for index, targets in enumerate(neighbor_table(size)):
+        neighbors[index, :len(targets)] = targets
+    return neighbors
+
+
+@lru_cache(maxsize=None)
+def _zobrist_table(size):
+    """Số ngẫu nhiên 64 bit cho từng (vị trí, ô) dùng làm khóa của bàn lớn"""
+    cells = size * size
+    rng = np.random.default_rng(cells)
+    return rng.integers(0, 2 ** 63, size=(cells, cells), dtype=np.uint64)
+
+
+def encode_states(boards, size):
+    """
+    Chuyển danh sách trạng thái thành ma trận uint8
+
+    Args:
+        boards: Danh sách trạng thái (mỗi trạng thái là danh sách 1D hoặc bàn cờ 2D)
+        size: Kích thước bàn cờ
+
+    Returns:
+        numpy.ndarray: Ma trận (số trạng thái, size * size)
+    """
+    _require_numpy()
+    rows = [[tile for row in board for tile in row] if board and isinstance(board[0], list) else board
+            for board in boards]
+    return np.array(rows, dtype=np.uint8).reshape(len(rows), size * size)
+
+
+def state_keys(states, size):
+    """
+    Khóa số nguyên của từng trạng thái
+
+    Bàn đến 4x4 dùng đúng mã hóa của bot.pack_state (4 bit mỗi ô, không trùng);
+    bàn lớn hơn dùng băm Zobrist 64 bit.
+
+    Returns:
+        numpy.ndarray: Mảng uint64 các khóa
+    """
+    cells = size * size
+    if cells <= 16:
+        shifts = (np.arange(cells, dtype=np.uint64) * np.uint64(4))
+        return np.bitwise_or.reduce(states.astype(np.uint64) << shifts, axis=1)
+    table = _zobrist_table(size)
+    return np.bitwise_xor.reduce(table[np.arange(cells), states], axis=1)
+
+
+def expand(states, blanks, size, previous=None):
+    """
+    Sinh mọi trạng thái con của một khối trạng thái
+
+    Args:
+        states: Ma trận trạng thái (B, size * size)
+        blanks: Vị trí ô trống của từng trạng thái (B,)
+        size: Kích thước bàn cờ
+        previous: Vị trí ô trống trước nước vừa đi (B,), để không đi ngược lại; None để sinh đủ
+
+    Returns:
+        tuple: (ma trận trạng thái con, vị trí ô trống mới, chỉ số trạng thái cha,
+        vị trí ô trống cũ, ô số vừa di chuyển)
+    """
+    targets = _neighbor_array(size)[blanks]
+    valid = targets >= 0
+    if previous is not None:
+        valid &= targets != previous[:, None]
+
+    parents, slots = np.nonzero(valid)
+    moved = targets[parents, slots]
+    old_blanks = blanks[parents]
+
+    children = states[parents]
+    rows = np.arange(len(parents))
+    tiles = children[rows, moved]
+    children[rows, old_blanks] = tiles
+    children[rows, moved] = 0
+    return children, moved, parents, old_blanks, tiles
+
+
+class BatchHeuristic:
+    """
+    Heuristic cho cả khối trạng thái (pattern database cho 4x4 khi có file, ngược lại Manhattan)
+
+    Giao diện giống heuristics.py nhưng trên mảng:
+    - start(states): (giá trị, khóa) của cả khối
+    - move(h, keys, tiles, src, dst): giá trị và khóa mới, chỉ tra bảng của ô vừa di chuyển
+    """
+
+    def __init__(self, name, size):
+        _require_numpy()
+        self.size = size
+        self.cells = size * size
+        self.columns = np.arange(self.cells)
+        self.manhattan = np.array(manhattan_table(size), dtype=np.int32)
+        self.table = None
+
+        if name in (None, "pdb") and size == 4:
+            data = load_pattern_database()
+            if data is not None:
+                # Các bảng nhóm nối tiếp nhau: nhóm g bắt đầu ở g * table_size
+                tables = PatternDatabaseHeuristic(data, size).group_tables()
+                self.table = np.concatenate([np.frombuffer(table, dtype=np.uint8) for table in tables])
+                self.table_size = len(tables[0])
+                self.groups = np.zeros(self.cells, dtype=np.int64)
+                self.shifts = np.zeros(self.cells, dtype=np.int64)
+                for g, pattern in enumerate(PATTERNS_4X4):
+                    for i, tile in enumerate(pattern):
+                        self.groups[tile] = g
+                        self.shifts[tile] = 4 * i
+
+        self.name = "pdb" if self.table is not None else "manhattan"
+
+    def start(self, states):
+        """
+        Args:
+            states: Ma trận trạng thái (B, size * size)
+
+        Returns:
+            tuple: (giá trị heuristic (B,) kiểu int32, khóa (B, số nhóm) hoặc None)
+        """
+        if self.table is None:
+            return self.manhattan[states, self.columns].sum(axis=1, dtype=np.int32), None
+
+        # Vị trí của từng ô số: positions[b, tile] = index
+        positions = np.empty(states.shape, dtype=np.int64)
+        positions[np.arange(len(states))[:, None], states] = self.columns
+        keys = np.zeros((len(states), len(PATTERNS_4X4)), dtype=np.int64)
+        for g, pattern in enumerate(PATTERNS_4X4):
+            for i, tile in enumerate(pattern):
+                keys[:, g] |= positions[:, tile] << (4 * i)
+        offsets = np.arange(len(PATTERNS_4X4), dtype=np.int64) * self.table_size
+        h = self.table[keys + offsets].sum(axis=1, dtype=np.int32)
+        return h, keys
+
+    def move(self, h, keys, tiles, src, dst):
+        """
+        Cập nhật heuristic khi ô tiles[i] trượt từ src[i] sang dst[i]
+
+        Args:
+            h, keys: Giá trị và khóa của trạng thái cha (đã lấy theo từng con)
+            tiles, src, dst: Ô số, vị trí cũ và vị trí mới của từng con
+
+        Returns:
+            tuple: (giá trị mới, khóa mới)
+        """
+        tiles = tiles.astype(np.int64)
+        if self.table is None:
+            return h + self.manhattan[tiles, dst] - self.manhattan[tiles, src], None
+
+        groups = self.groups[tiles]
+        rows = np.arange(len(tiles))
+        old_index = keys[rows, groups]
+        new_index = old_index + ((dst - src) << self.shifts[tiles])
+        offsets = groups * self.table_size
+        h = h + self.table[offsets + new_index].astype(np.int32) - self.table[offsets + old_index]
+        keys = keys.copy()
+        keys[rows, groups] = new_index
+        return h, keys
+
+    def __call__(self, states):
+        """Giá trị heuristic (B,) của cả khối"""
+        return self.start(states)[0]
+
+
+def _trace_back(layers, depth_index, row):
+    """Lấy dãy vị trí ô trống từ gốc tới trạng thái row của tầng depth_index"""
+    cells = []
+    for depth in range(depth_index, -1, -1):
+        parents, blanks = layers[depth]
+        cells.append(int(blanks[row]))
+        row = int(parents[row])
+    return cells[::-1]
+
+
+def beam_search(tiles, size, width=BEAM_WIDTH, heuristic=None, max_depth=None, progress=None, stats=None):
+    """
+    Beam search theo khối: mỗi tầng chỉ giữ width trạng thái có heuristic nhỏ nhất
+
+    Args:
+        tiles: Trạng thái ban đầu (danh sách 1D)
+        size: Kích thước bàn cờ
+        width: Số trạng thái giữ lại mỗi tầng
+        heuristic: Tên heuristic ("manhattan", "pdb" hoặc None để tự chọn; heuristic
+            khác chưa có bản theo khối nên dùng Manhattan)
+        max_depth: Số tầng tối đa (mặc định 20 * số ô)
+        progress: Hàm nhận số trạng thái đã đánh giá sau mỗi tầng
+        stats: SolverStats để ghi số nút (tùy chọn)
+
+    Returns:
+        list: Dãy vị trí ô trống của lời giải, hoặc None nếu không tìm được
+    """
+    _require_numpy()
+    evaluate = BatchHeuristic(heuristic, size)
+    if max_depth is None:
+        max_depth = 20 * size * size
+
+    states = encode_states([tiles], size)
+    h, keys = evaluate.start(states)
+    if h[0] == 0:
+        return []
+    blanks = np.array([list(tiles).index(0)], dtype=np.int64)
+    previous = np.array([-1], dtype=np.int64)
+    seen = set(state_keys(states, size).tolist())
+    layers = []  # (chỉ số cha, vị trí ô trống) của các trạng thái giữ lại ở mỗi tầng
+    evaluated = 0
+    expanded = 0
+
+    def record():
+        if stats is not None:
+            stats.nodes_expanded = expanded
+            stats.nodes_generated = evaluated
+            stats.heuristic_calls = evaluated + 1
+            stats.observe(len(states), len(seen))
+
+    for depth in range(max_depth):
+        children, child_blanks, parents, old_blanks, moved_tiles = expand(states, blanks, size, previous)
+        child_h, child_keys = evaluate.move(h[parents], None if keys is None else keys[parents],
+                                            moved_tiles, child_blanks, old_blanks)
+        evaluated += len(children)
+        expanded += len(states)
+
+        goals = np.nonzero(child_h == 0)[0]
+        if len(goals):
+            record()
+            layers.append((parents, child_blanks))
+            return _trace_back(layers, depth, goals[0])
+
+        # Loại trạng thái trùng trong tầng và trạng thái đã gặp ở các tầng trước
+        unique_keys, first = np.unique(state_keys(children, size), return_index=True)
+        fresh = np.fromiter((key not in seen for key in unique_keys.tolist()), dtype=bool, count=len(unique_keys))
+        candidates = first[fresh]
+        if len(candidates) == 0:
+            record()
+            return None
+
+        if len(candidates) > width:
+            chosen = np.argpartition(child_h[candidates], width)[:width]
+            seen.update(unique_keys[fresh][chosen].tolist())
+            candidates = candidates[chosen]
+        else:
+            seen.update(unique_keys[fresh].tolist())
+
+        states = children[candidates]
+        blanks = child_blanks[candidates]
+        previous = old_blanks[candidates]
+        h = child_h[candidates]
+        keys = None if child_keys is None else child_keys[candidates]
+        layers.append((parents[candidates], blanks))
+        record()
+        if progress is not None:
+            progress(evaluated)
+
+    return None
+
+
+def bfs_layers(tiles, size, max_states=5_000_000, progress=None):
+    """
+    BFS theo tầng: mở rộng cả tầng biên một lần, cho lời giải ngắn nhất
+
+    Chỉ phù hợp với bàn nhỏ (3x3 có 181.440 trạng thái).
+
+    Args:
+        tiles: Trạng thái ban đầu (danh sách 1D)
+        size: Kích thước bàn cờ
+        max_states: Số trạng thái đã gặp tối đa trước khi dừng
+        progress: Hàm nhận số trạng thái đã gặp sau mỗi tầng
+
+    Returns:
+        list: Dãy vị trí ô trống của lời giải ngắn nhất, hoặc None nếu không tìm được
+    """
+    _require_numpy()
+    states = encode_states([tiles], size)
+    goal = encode_states([list(range(1, size * size)) + [0]], size)
+    goal_key = int(state_keys(goal, size)[0])
+
+    keys = state_keys(states, size)
+    if int(keys[0]) == goal_key:
+        return []
+    blanks = np.array([list(tiles).index(0)], dtype=np.int64)
+    previous = np.array([-1], dtype=np.int64)
+    seen = set(keys.tolist())
+    layers = []
+
+    depth = 0
+    while len(states) and len(seen) < max_states:
+        children, child_blanks, parents, old_blanks, _ = expand(states, blanks, size, previous)
+        keys, first = np.unique(state_keys(children, size), return_index=True)
+        fresh = np.fromiter((key not in seen for key in keys.tolist()), dtype=bool, count=len(keys))
+        keys, first = keys[fresh], first[fresh]
+        seen.update(keys.tolist())
+
+        states = children[first]
+        blanks = child_blanks[first]
+        previous = old_blanks[first]
+        layers.append((parents[first], blanks))
+
+        goals = np.nonzero(keys == goal_key)[0]
+        if len(goals):
+            return _trace_back(layers, depth, goals[0])
+        depth += 1
+        if progress is not None:
+            progress(len(seen))
+
+    return None
+
+
+def evaluate_boards(boards, size, heuristic=None):
+    """
+    Tính heuristic cho nhiều bàn cờ cùng lúc (cho công cụ giải hàng loạt)
+
+    Returns:
+        list: Giá trị heuristic của từng bàn
+    """
+    return BatchHeuristic(heuristic, size)(encode_states(boards, size)).tolist()
+
+
+def _benchmark(size=4, count=100_000):
+    """So sánh số trạng thái sinh và đánh giá mỗi giây: vòng lặp Python và theo khối"""
+    import random
+    from heuristics import get_heuristic
+
+    random.seed(0)
+    boards = []
+    for _ in range(count // 4):
+        tiles = list(range(size * size))
+        random.shuffle(tiles)
+        boards.append(tiles)
+
+    # Vòng lặp từng trạng thái như trong bot.py
+    heuristic = get_heuristic(None, size)
+    neighbors = neighbor_table(size)
+    start = time.perf_counter()
+    generated = 0
+    for tiles in boards:
+        h, key = heuristic.start(tiles)
+        blank = tiles.index(0)
+        for cell in neighbors[blank]:
+            child = list(tiles)
+            child[blank], child[cell] = child[cell], 0
+            heuristic.move(h, key, tiles[cell], cell, blank)
+            generated += 1
+    loop_rate = generated / (time.perf_counter() - start)
+
+    evaluate = BatchHeuristic(None, size)
+    states = encode_states(boards, size)
+    blanks = np.argmin(states, axis=1)
+    h, keys = evaluate.start(states)
+    start = time.perf_counter()
+    children, child_blanks, parents, old_blanks, tiles = expand(states, blanks, size)
+    evaluate.move(h[parents], None if keys is None else keys[parents], tiles, child_blanks, old_blanks)
+    batch_rate = len(children) / (time.perf_counter() - start)
+
+    print(f"{evaluate.name}, {size}x{size}: per-state loop {loop_rate:,.0f} states/s, "
+          f"batched {batch_rate:,.0f} states/s ({batch_rate / loop_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    _require_numpy()
+    _benchmark(3)
+    _benchmark(4)
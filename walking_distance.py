@@ -0,0 +1,141 @@
+"""
+Heuristic walking distance (WD) cho bàn 3x3 và 4x4
+
+Chỉ xét theo chiều dọc: mỗi hàng được mô tả bằng số ô có hàng đích là hàng 0,
+1, ..., n-1 (không quan tâm thứ tự trong hàng) cùng hàng của ô trống. Mỗi nước
+đi dọc đưa một ô sang hàng của ô trống. Số nước đi dọc tối thiểu để đưa mọi ô
+về hàng đích được tính sẵn bằng BFS trên không gian nhỏ này (24.964 trạng thái
+cho 4x4). Chiều ngang dùng chung bảng (coi cột như hàng, ô trống cũng ở cột
+cuối). WD = số nước dọc + số nước ngang, chấp nhận được và không nhỏ hơn
+khoảng cách Manhattan.
+
+Bảng được tạo trong bộ nhớ ở lần dùng đầu tiên (dưới 1 giây cho 4x4).
+"""
+from collections import deque
+from functools import lru_cache
+
+# Số trạng thái tăng rất nhanh theo kích thước (5x5 có hàng triệu trạng thái)
+MAX_SIZE = 4
+
+
+@lru_cache(maxsize=None)
+def walking_distance_table(size):
+    """
+    Tính bảng walking distance bằng BFS từ trạng thái đích
+
+    Trạng thái là tuple size * size số đếm (counts[row * size + goal_row]) cộng
+    với hàng của ô trống.
+
+    Args:
+        size: Kích thước bàn cờ (tối đa MAX_SIZE)
+
+    Returns:
+        tuple: (ids, distances, transitions)
+            - ids: dict trạng thái -> chỉ số
+            - distances: bytes, số nước đi dọc tối thiểu của mỗi trạng thái
+            - transitions: list phẳng, transitions[(id * 2 + d) * size + goal_row]
+              là trạng thái mới khi một ô có hàng đích goal_row đi vào hàng ô
+              trống từ hàng trên (d = 0) hoặc hàng dưới (d = 1), -1 nếu không có
+    """
+    if size > MAX_SIZE:
+        raise ValueError(f"Walking distance chỉ hỗ trợ bàn tối đa {MAX_SIZE}x{MAX_SIZE}")
+
+    goal = [0] * (size * size)
+    for row in range(size):
+        goal[row * size + row] = size
+    goal[(size - 1) * size + size - 1] = size - 1
+    goal = tuple(goal) + (size - 1,)
+
+    ids = {goal: 0}
+    states = [goal]
+    distances = bytearray([0])
+    queue = deque([0])
+    while queue:
+        state_id = queue.popleft()
+        state = states[state_id]
+        blank = state[-1]
+        for source in (blank - 1, blank + 1):
+            if not 0 <= source < size:
+                continue
+            for goal_row in range(size):
+                if state[source * size + goal_row] == 0:
+                    continue
+                child = list(state)
+                child[source * size + goal_row] -= 1
+                child[blank * size + goal_row] += 1
+                child[-1] = source
+                child = tuple(child)
+                if child not in ids:
+                    ids[child] = len(states)
+                    states.append(child)
+                    distances.append(distances[state_id] + 1)
+                    queue.append(ids[child])
+
+    # Bảng chuyển trạng thái theo nước đi (theo hướng ô đi vào hàng ô trống)
+    transitions = [-1] * (len(states) * 2 * size)
+    for state_id, state in enumerate(states):
+        blank = state[-1]
+        for d, source in enumerate((blank - 1, blank + 1)):
+            if not 0 <= source < size:
+                continue
+            for goal_row in range(size):
+                if state[source * size + goal_row] == 0:
+                    continue
+                child = list(state)
+                child[source * size + goal_row] -= 1
+                child[blank * size + goal_row] += 1
+                child[-1] = source
+                transitions[(state_id * 2 + d) * size + goal_row] = ids[tuple(child)]
+
+    return ids, bytes(distances), transitions
+
+
+class WalkingDistanceHeuristic:
+    """Walking distance: số nước đi dọc tối thiểu + số nước đi ngang tối thiểu"""
+
+    name = "walking_distance"
+
+    def __init__(self, size):
+        self.size = size
+        self.ids, self.distances, self.transitions = walking_distance_table(size)
+        self.count = len(self.distances)
+        self.goal_rows = [0] + [(tile - 1) // size for tile in range(1, size * size)]
+        self.goal_cols = [0] + [(tile - 1) % size for tile in range(1, size * size)]
+
+    def _state_id(self, tiles, by_column):
+        size = self.size
+        counts = [0] * (size * size)
+        blank = 0
+        for index, tile in enumerate(tiles):
+            line = index % size if by_column else index // size
+            if tile == 0:
+                blank = line
+            else:
+                goal_line = self.goal_cols[tile] if by_column else self.goal_rows[tile]
+                counts[line * size + goal_line] += 1
+        return self.ids[tuple(counts) + (blank,)]
+
+    def start(self, tiles):
+        """
+        Returns:
+            tuple: (giá trị heuristic, khóa = chỉ số trạng thái dọc * số trạng thái + chỉ số trạng thái ngang)
+        """
+        vertical = self._state_id(tiles, False)
+        horizontal = self._state_id(tiles, True)
+        return self.distances[vertical] + self.distances[horizontal], vertical * self.count + horizontal
+
+    def estimate(self, tiles):
+        """Tính giá trị heuristic của một trạng thái"""
+        return self.start(tiles)[0]
+
+    def move(self, h, key, tile, src, dst):
+        """Cập nhật heuristic khi ô tile trượt từ src sang dst (chỉ đổi trạng thái theo một chiều)"""
+        size = self.size
+        vertical, horizontal = divmod(key, self.count)
+        # Ô đi từ src sang ô trống ở dst: d = 0 nếu ô đến từ phía trên/bên trái
+        d = 0 if src < dst else 1
+        if src - dst == size or dst - src == size:
+            vertical = self.transitions[(vertical * 2 + d) * size + self.goal_rows[tile]]
+        else:
+            horizontal = self.transitions[(horizontal * 2 + d) * size + self.goal_cols[tile]]
+        return self.distances[vertical] + self.distances[horizontal], vertical * self.count + horizontal